@@ -5,6 +5,9 @@ from time import sleep
 from httpx import RequestError, get
 
 from src.config import Parameter, Settings
+from src.downloader import Downloader
+from src.extract import Extractor
+from src.interface import API
 from src.custom import (
     COOKIE_UPDATE_INTERVAL,
     DISCLAIMER_TEXT,
@@ -98,6 +101,8 @@ class TikTokDownloader:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.parameter:
+            await self.parameter.ffmpeg.close()
         await self.database.__aexit__(exc_type, exc_val, exc_tb)
         if self.parameter:
             await self.parameter.close_client()
@@ -391,6 +396,8 @@ class TikTokDownloader:
     async def check_settings(self, restart=True):
         if restart:
             await self.parameter.close_client()
+        previous = self.parameter
+        await self.recorder.load()
         self.parameter = Parameter(
             self.settings,
             self.cookie,
@@ -399,6 +406,9 @@ class TikTokDownloader:
             **self.settings.read(),
             recorder=self.recorder,
         )
+        if previous and previous.ffmpeg.active:
+            # 保留正在后台录制直播的 FFMPEG 对象，修改设置不会中断录制
+            self.parameter.ffmpeg = previous.ffmpeg
         MigrateFolder(self.parameter).compatible()
         self.parameter.set_headers_cookie()
         self.restart_cycle_task(
@@ -417,6 +427,18 @@ class TikTokDownloader:
         )
         if await self.disclaimer():
             await self.main_menu(safe_pop(self.run_command))
+            await self.wait_live()
+
+    async def wait_live(self):
+        """退出程序前由用户选择是否等待后台直播录制结束，否则结束录制"""
+        if not (count := self.parameter.ffmpeg.active):
+            return
+        if self.console.input(
+            _(
+                "当前有 {count} 个直播正在后台录制，是否等待录制结束后再退出程序(YES/NO): "
+            ).format(count=count)
+        ).upper() in ("Y", "YES"):
+            await Downloader(self.parameter).wait_live()
 
     def periodic_update_params(self):
         async def inner():
@@ -446,6 +468,8 @@ class TikTokDownloader:
         if self.parameter.folder_mode:
             remove_empty_directories(self.parameter.ROOT)
             remove_empty_directories(self.parameter.root)
+        Extractor.shutdown_pool()
+        API.signer.shutdown()
         self.parameter.logger.info(_("正在关闭程序"))
 
     async def browser_cookie(
@@ -1,18 +1,25 @@
+from asyncio import Lock, wait_for
+from contextlib import suppress
+from hashlib import md5
 from textwrap import dedent
 from time import time
 from types import SimpleNamespace
 from typing import TYPE_CHECKING
+from weakref import WeakValueDictionary
 
 from fastapi import Depends, FastAPI, Form, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from uvicorn import Config, Server
 from pathlib import Path
 
+from aiofiles import open as async_open
+
 from ..custom import (
     __VERSION__,
+    JOB_MAX_WORKERS,
     REPOSITORY,
     SERVER_HOST,
     SERVER_PORT,
@@ -21,11 +28,14 @@ from ..custom import (
 )
 from ..models import (
     Account,
+    AccountJob,
     AccountTiktok,
     Comment,
     DataResponse,
     Detail,
+    DetailJob,
     DetailTikTok,
+    FileJob,
     GeneralSearch,
     Live,
     LiveSearch,
@@ -39,12 +49,18 @@ from ..models import (
     UserSearch,
     VideoSearch,
 )
+from ..interface import API
+from ..manager import JobManager, current_job
+from ..tools import DownloaderError, FakeProgress, create_client
 from ..translation import _
 from .main_terminal import TikTok
 
 if TYPE_CHECKING:
+    from httpx import AsyncClient
+
     from ..config import Parameter
     from ..manager import Database
+    from ..module import Recording
 
 __all__ = ["APIServer"]
 
@@ -70,6 +86,160 @@ class APIServer(TikTok):
             server_mode,
         )
         self.server = None
+        self.download_client: "AsyncClient | None" = None
+        # 同一链接的下载请求共用临时文件，按链接串行写入
+        self.download_locks: WeakValueDictionary[str, Lock] = WeakValueDictionary()
+        self.jobs = JobManager(JOB_MAX_WORKERS)
+
+    def get_download_client(self) -> "AsyncClient":
+        """下载文件到服务器时共用的连接池客户端"""
+        if not self.download_client or self.download_client.is_closed:
+            self.download_client = create_client(timeout=30)
+        return self.download_client
+
+    async def stream_download(
+        self,
+        url: str,
+        headers: dict,
+        file_path: Path,
+    ) -> int:
+        """流式写入同目录临时文件，支持断点续传，下载完成后原子重命名为目标文件"""
+        async with self.download_locks.setdefault(url, Lock()):
+            return await self.__stream_download(
+                url,
+                headers,
+                file_path,
+                file_path.with_name(f".{md5(url.encode()).hexdigest()}.part"),
+            )
+
+    async def __stream_download(
+        self,
+        url: str,
+        headers: dict,
+        file_path: Path,
+        temp: Path,
+    ) -> int:
+        # 临时文件对应的 ETag 或 Last-Modified，续传时通过 If-Range 确认文件未变化
+        validator = temp.with_name(f"{temp.name}.validator")
+        position = temp.stat().st_size if temp.is_file() else 0
+        async with self.get_download_client().stream(
+            "GET",
+            url,
+            headers=headers
+            | {
+                "Range": f"bytes={position}-",
+                "If-Range": validator.read_text(),
+            }
+            if position and validator.is_file()
+            else headers,
+        ) as response:
+            if response.status_code == 416:
+                temp.unlink(missing_ok=True)
+                validator.unlink(missing_ok=True)
+                return await self.__stream_download(url, headers, file_path, temp)
+            if response.status_code not in (200, 206):
+                return response.status_code
+            if response.status_code == 200:
+                if value := self.__get_validator(response.headers):
+                    validator.write_text(value)
+                else:
+                    validator.unlink(missing_ok=True)
+            progress = current_job.get() or FakeProgress()
+            task_id = progress.add_task(
+                file_path.name,
+                total=int(response.headers.get("Content-Length", 0)) or None,
+            )
+            async with async_open(
+                temp, "ab" if response.status_code == 206 else "wb"
+            ) as f:
+                async for chunk in response.aiter_bytes(self.parameter.chunk):
+                    await f.write(chunk)
+                    progress.update(task_id, advance=len(chunk))
+            progress.remove_task(task_id)
+        temp.replace(file_path)
+        validator.unlink(missing_ok=True)
+        return response.status_code
+
+    @staticmethod
+    def __get_validator(headers) -> str:
+        """弱 ETag 不能用于 If-Range，此时使用 Last-Modified"""
+        if (etag := headers.get("ETag", "")) and not etag.startswith("W/"):
+            return etag
+        return headers.get("Last-Modified", "")
+
+    @staticmethod
+    def parse_cursor(cursor: str) -> tuple[str, int]:
+        """解析下载历史分页游标，格式为 下载时间|记录 ID"""
+        download_time, __, id_ = cursor.rpartition("|")
+        if not (download_time and id_.isdecimal()):
+            raise HTTPException(status_code=400, detail=_("分页游标无效！"))
+        return download_time, int(id_)
+
+    async def download_to_server(
+        self,
+        url: str,
+        filename: str = None,
+        platform: str = "douyin",
+        title: str = None,
+        author: str = None,
+    ) -> dict:
+        """下载文件到服务器的 Download 目录"""
+        try:
+            # 设置下载路径
+            download_root = self.parameter.root / "Download" / platform
+            download_root.mkdir(parents=True, exist_ok=True)
+            
+            # 生成文件名
+            if not filename:
+                if title and author:
+                    # 清理文件名中的非法字符
+                    clean_title = self.parameter.CLEANER.filter_name(title)[:50]
+                    clean_author = self.parameter.CLEANER.filter_name(author)[:20]
+                    timestamp = str(int(time()))
+                    filename = f"{clean_author}_{clean_title}_{timestamp}"
+                else:
+                    filename = f"download_{int(time())}"
+            
+            # 确定文件扩展名
+            if "mp4" in url.lower() or "video" in url.lower():
+                file_extension = ".mp4"
+            elif "jpg" in url.lower() or "jpeg" in url.lower():
+                file_extension = ".jpg"
+            elif "png" in url.lower():
+                file_extension = ".png"
+            else:
+                file_extension = ".mp4"  # 默认视频格式
+            
+            file_path = download_root / f"{filename}{file_extension}"
+            
+            # 流式下载文件，添加必要的请求头
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Referer': 'https://www.douyin.com/',
+                'Accept': '*/*',
+            }
+            status_code = await self.stream_download(url, headers, file_path)
+            if status_code in (200, 206):
+                return {
+                    "message": "文件下载成功！",
+                    "success": True,
+                    "file_path": str(file_path),
+                    "download_path": str(download_root),
+                    "filename": f"{filename}{file_extension}"
+                }
+            else:
+                return {
+                    "message": f"下载失败，HTTP状态码: {status_code}",
+                    "success": False,
+                    "error": f"HTTP {status_code}"
+                }
+                
+        except Exception as e:
+            return {
+                "message": f"下载过程中出错: {str(e)}",
+                "success": False,
+                "error": str(e)
+            }
 
     async def handle_redirect(self, text: str, proxy: str = None) -> str:
         return await self.links.run(
@@ -115,7 +285,27 @@ class APIServer(TikTok):
             log_level=log_level,
         )
         server = Server(config)
-        await server.serve()
+        self.jobs.start()
+        await self.restore_recordings()
+        try:
+            await server.serve()
+        finally:
+            await self.jobs.stop()
+            if self.download_client:
+                await self.download_client.aclose()
+
+    async def restore_recordings(self) -> None:
+        """从数据库恢复录制记录，之后录制状态变化时同步写入数据库"""
+        self.parameter.ffmpeg.callbacks.append(self.save_recording)
+        await self.parameter.ffmpeg.restore(
+            await self.database.read_live_recording_data()
+        )
+
+    async def save_recording(self, recording: "Recording") -> None:
+        try:
+            await self.database.update_live_recording_data(recording.info())
+        except Exception as e:
+            self.logger.error(f"保存录制记录失败: {e}")
 
     def setup_routes(self):
         @self.server.get(
@@ -149,6 +339,16 @@ class APIServer(TikTok):
         async def health():
             return {"status": "healthy", "service": "DouK-Downloader"}
 
+        @self.server.get(
+            "/limits",
+            summary=_("获取请求速率"),
+            description=_("获取各域名与 Cookie 当前的自适应请求速率，单位：次/秒"),
+            tags=[_("系统")],
+            response_model=dict[str, float],
+        )
+        async def limits(token: str = Depends(token_dependency)):
+            return API.limiter.rates()
+
         @self.server.get(
             "/token",
             summary=_("测试令牌有效性"),
@@ -726,6 +926,142 @@ class APIServer(TikTok):
             return self.failed_response(extract)
 
         # 添加实际下载文件的API端点
+        @self.server.post(
+            "/jobs/detail",
+            summary=_("提交批量下载作品任务"),
+            description=_(
+                dedent("""
+                提交后台任务，获取作品数据并下载文件，立即返回任务信息
+                
+                **参数**:
+                
+                - **cookie**: Cookie；可选参数
+                - **proxy**: 代理；可选参数
+                - **detail_ids**: 作品 ID 列表；必需参数
+                - **tiktok**: 是否为 TikTok 作品；可选参数，默认值：False
+                """)
+            ),
+            tags=[_("任务")],
+            response_model=dict,
+        )
+        async def submit_detail_job(
+            extract: DetailJob, token: str = Depends(token_dependency)
+        ):
+            return self.jobs.submit(
+                "detail",
+                lambda: self.run_detail_job(extract),
+            ).info()
+
+        @self.server.post(
+            "/jobs/account",
+            summary=_("提交下载账号作品任务"),
+            description=_(
+                dedent("""
+                提交后台任务，获取账号作品数据并下载文件，立即返回任务信息
+                
+                **参数**:
+                
+                - **cookie**: Cookie；可选参数
+                - **proxy**: 代理；可选参数
+                - **sec_user_id**: 账号 sec_uid；必需参数
+                - **tab**: 账号页面类型；可选参数，默认值：`post`
+                - **earliest**: 作品最早发布日期；可选参数
+                - **latest**: 作品最晚发布日期；可选参数
+                - **pages**: 最大请求次数，仅对请求账号喜欢页数据有效；可选参数
+                - **tiktok**: 是否为 TikTok 账号；可选参数，默认值：False
+                """)
+            ),
+            tags=[_("任务")],
+            response_model=dict,
+        )
+        async def submit_account_job(
+            extract: AccountJob, token: str = Depends(token_dependency)
+        ):
+            return self.jobs.submit(
+                "account",
+                lambda: self.run_account_job(extract),
+            ).info()
+
+        @self.server.post(
+            "/jobs/file",
+            summary=_("提交下载文件到服务器任务"),
+            description=_(
+                dedent("""
+                提交后台任务，下载文件到服务器的Volume/Download/目录，立即返回任务信息
+                
+                **参数说明:**
+                - **url**: 文件下载链接；必需参数
+                - **filename**: 文件名；可选参数，默认从URL提取
+                - **platform**: 平台类型（douyin/tiktok）；可选参数，用于分类存储
+                - **title**: 作品标题；可选参数，用于文件命名
+                - **author**: 作者名；可选参数，用于文件命名
+                """)
+            ),
+            tags=[_("任务")],
+            response_model=dict,
+        )
+        async def submit_file_job(
+            extract: FileJob, token: str = Depends(token_dependency)
+        ):
+            return self.jobs.submit(
+                "file",
+                lambda: self.download_to_server(
+                    extract.url,
+                    extract.filename,
+                    extract.platform,
+                    extract.title,
+                    extract.author,
+                ),
+            ).info()
+
+        @self.server.get(
+            "/jobs",
+            summary=_("获取全部任务"),
+            description=_("获取全部后台任务的状态与下载进度"),
+            tags=[_("任务")],
+            response_model=list[dict],
+        )
+        async def list_jobs(token: str = Depends(token_dependency)):
+            return self.jobs.list_jobs()
+
+        @self.server.get(
+            "/jobs/{job_id}",
+            summary=_("获取任务状态"),
+            description=_("获取指定后台任务的状态与下载进度"),
+            tags=[_("任务")],
+            response_model=dict,
+        )
+        async def get_job(job_id: str, token: str = Depends(token_dependency)):
+            if job := self.jobs.get(job_id):
+                return job.info()
+            raise HTTPException(status_code=404, detail=_("任务不存在！"))
+
+        @self.server.post(
+            "/jobs/{job_id}/cancel",
+            summary=_("取消任务"),
+            description=_("取消等待中或运行中的后台任务"),
+            tags=[_("任务")],
+            response_model=dict,
+        )
+        async def cancel_job(job_id: str, token: str = Depends(token_dependency)):
+            if not self.jobs.get(job_id):
+                raise HTTPException(status_code=404, detail=_("任务不存在！"))
+            return {"success": self.jobs.cancel(job_id)}
+
+        @self.server.get(
+            "/jobs/{job_id}/events",
+            summary=_("订阅任务进度"),
+            description=_("以 Server-Sent Events 格式推送任务状态，任务结束后断开连接"),
+            tags=[_("任务")],
+        )
+        async def job_events(job_id: str, token: str = Depends(token_dependency)):
+            if not self.jobs.get(job_id):
+                raise HTTPException(status_code=404, detail=_("任务不存在！"))
+            return StreamingResponse(
+                self.jobs.events(job_id),
+                media_type="text/event-stream",
+            )
+
         @self.server.post(
             "/download/file",
             summary=_("下载文件到服务器"),
@@ -752,72 +1088,13 @@ class APIServer(TikTok):
             author: str = Form(None),
             token: str = Depends(token_dependency)
         ):
-            try:
-                import asyncio
-                import aiofiles
-                from pathlib import Path
-                
-                # 设置下载路径
-                download_root = self.parameter.root / "Download" / platform
-                download_root.mkdir(parents=True, exist_ok=True)
-                
-                # 生成文件名
-                if not filename:
-                    if title and author:
-                        # 清理文件名中的非法字符
-                        clean_title = self.parameter.CLEANER.filter_name(title)[:50]
-                        clean_author = self.parameter.CLEANER.filter_name(author)[:20]
-                        timestamp = str(int(time()))
-                        filename = f"{clean_author}_{clean_title}_{timestamp}"
-                    else:
-                        filename = f"download_{int(time())}"
-                
-                # 确定文件扩展名
-                if "mp4" in url.lower() or "video" in url.lower():
-                    file_extension = ".mp4"
-                elif "jpg" in url.lower() or "jpeg" in url.lower():
-                    file_extension = ".jpg"
-                elif "png" in url.lower():
-                    file_extension = ".png"
-                else:
-                    file_extension = ".mp4"  # 默认视频格式
-                
-                file_path = download_root / f"{filename}{file_extension}"
-                
-                # 使用httpx下载文件，添加必要的请求头
-                import httpx
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Referer': 'https://www.douyin.com/',
-                    'Accept': '*/*',
-                }
-                async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
-                    response = await client.get(url, headers=headers)
-                if response.status_code == 200:
-                    async with aiofiles.open(file_path, 'wb') as f:
-                        async for chunk in response.aiter_bytes(chunk_size=8192):
-                            await f.write(chunk)
-                    
-                    return {
-                        "message": "文件下载成功！",
-                        "success": True,
-                        "file_path": str(file_path),
-                        "download_path": str(download_root),
-                        "filename": f"{filename}{file_extension}"
-                    }
-                else:
-                    return {
-                        "message": f"下载失败，HTTP状态码: {response.status_code}",
-                        "success": False,
-                        "error": f"HTTP {response.status_code}"
-                    }
-                    
-            except Exception as e:
-                return {
-                    "message": f"下载过程中出错: {str(e)}",
-                    "success": False,
-                    "error": str(e)
-                }
+            return await self.download_to_server(
+                url,
+                filename,
+                platform,
+                title,
+                author,
+            )
 
         # 添加检查文件是否已下载的API端点
         @self.server.post(
@@ -942,14 +1219,8 @@ class APIServer(TikTok):
             token: str = Depends(token_dependency)
         ):
             try:
-                import subprocess
-                import asyncio
-                import os
-                import json
-                import psutil
-                from pathlib import Path
-                from time import time
-                
+                ffmpeg = self.parameter.ffmpeg
+
                 # 设置录制路径
                 record_root = self.parameter.root / "Download" / platform / "live_records"
                 record_root.mkdir(parents=True, exist_ok=True)
@@ -961,76 +1232,47 @@ class APIServer(TikTok):
                 file_path = record_root / filename
                 
                 # 检查FFmpeg是否可用
-                try:
-                    subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-                except (subprocess.CalledProcessError, FileNotFoundError):
+                if not ffmpeg.state:
                     return {
                         "success": False,
                         "message": "FFmpeg未安装或不可用",
                         "error": "FFmpeg not found"
                     }
                 
-                # 根据质量参数构建FFmpeg命令
-                base_cmd = ['ffmpeg', '-i', stream_url]
-                
-                # 智能录制：不设置时长限制，直到流结束
-                if duration == 0:
-                    # 智能录制模式：添加重连和错误处理
-                    base_cmd.extend([
-                        '-reconnect', '1',
-                        '-reconnect_at_eof', '1',
-                        '-reconnect_streamed', '1',
-                        '-reconnect_delay_max', '10'
-                    ])
-                else:
-                    # 手动设置时长
-                    base_cmd.extend(['-t', str(duration * 60)])
+                # 智能录制：不设置时长限制，由录制进程自动重连直到流结束
+                output = ['-t', str(duration * 60)] if duration else []
                 
                 if quality == "copy":
                     # 流复制模式（默认，最快，无损）
-                    ffmpeg_cmd = base_cmd + [
-                        '-c', 'copy',
-                        '-avoid_negative_ts', 'make_zero',
-                        '-movflags', '+faststart',  # 优化MP4结构
-                        '-f', 'mp4',
-                        str(file_path)
-                    ]
+                    output += ['-c', 'copy']
                 elif quality == "high":
                     # 高质量转码
-                    ffmpeg_cmd = base_cmd + [
+                    output += [
                         '-c:v', 'libx264', '-preset', 'medium', '-crf', '18',
                         '-c:a', 'aac', '-b:a', '128k',
-                        '-avoid_negative_ts', 'make_zero',
-                        '-movflags', '+faststart',
-                        '-f', 'mp4',
-                        str(file_path)
                     ]
                 elif quality == "medium":
                     # 中等质量转码
-                    ffmpeg_cmd = base_cmd + [
+                    output += [
                         '-c:v', 'libx264', '-preset', 'fast', '-crf', '23',
                         '-c:a', 'aac', '-b:a', '96k',
-                        '-avoid_negative_ts', 'make_zero',
-                        '-movflags', '+faststart',
-                        '-f', 'mp4',
-                        str(file_path)
                     ]
                 else:  # low
                     # 低质量转码（节省空间）
-                    ffmpeg_cmd = base_cmd + [
+                    output += [
                         '-c:v', 'libx264', '-preset', 'fast', '-crf', '28',
                         '-c:a', 'aac', '-b:a', '64k',
                         '-s', '854x480',  # 降低分辨率
-                        '-avoid_negative_ts', 'make_zero',
-                        '-movflags', '+faststart',
-                        '-f', 'mp4',
-                        str(file_path)
                     ]
+                output += [
+                    '-avoid_negative_ts', 'make_zero',
+                    '-movflags', '+faststart',  # 优化MP4结构
+                    '-f', 'mp4',
+                ]
                 
                 # 检查并发录制限制
-                max_concurrent_recordings = 5  # 最大同时录制数
-                current_recordings = len([proc for proc in psutil.process_iter(['pid', 'name', 'cmdline']) 
-                                        if proc.info['name'] == 'ffmpeg' and 'live_records' in ' '.join(proc.info['cmdline'])])
+                max_concurrent_recordings = ffmpeg.max_workers  # 最大同时录制数
+                current_recordings = ffmpeg.active
                 
                 if current_recordings >= max_concurrent_recordings:
                     return {
@@ -1039,48 +1281,40 @@ class APIServer(TikTok):
                         "error": "concurrent_limit_reached"
                     }
                 
-                # 在后台启动录制进程，添加更多元数据
-                env = os.environ.copy()
-                env['RECORDING_STREAMER'] = clean_streamer
-                env['RECORDING_PLATFORM'] = platform
-                env['RECORDING_START_TIME'] = str(int(time()))
-                
-                process = subprocess.Popen(
-                    ffmpeg_cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    cwd=str(record_root),
-                    env=env
+                # 在后台启动录制进程，录制信息登记在录制任务中
+                recording = ffmpeg.record(
+                    stream_url,
+                    str(file_path),
+                    output=output,
+                    metadata={
+                        "streamer_name": clean_streamer,
+                        "platform": platform,
+                        "start_time": int(time()),
+                        "stream_url": stream_url,
+                        "quality": quality,
+                        "duration": duration,
+                    },
                 )
-                
-                # 创建录制任务元数据文件
-                metadata_file = record_root / f".{filename}.metadata"
-                metadata = {
-                    "streamer_name": clean_streamer,
-                    "platform": platform,
-                    "start_time": int(time()),
-                    "process_id": process.pid,
-                    "stream_url": stream_url,
-                    "quality": quality,
-                    "duration": duration,
-                    "status": "recording"
-                }
-                
-                import json
-                with open(metadata_file, 'w', encoding='utf-8') as f:
-                    json.dump(metadata, f, ensure_ascii=False, indent=2)
+                with suppress(TimeoutError):
+                    await wait_for(recording.running.wait(), 10)
+                if recording.status == recording.FAILED:
+                    return {
+                        "success": False,
+                        "message": f"录制启动失败: {recording.info()['error']}",
+                        "error": recording.info()["error"],
+                    }
                 
                 return {
                     "success": True,
                     "message": f"开始录制直播 ({current_recordings + 1}/{max_concurrent_recordings})",
+                    "id": recording.id,
                     "file_path": str(file_path),
                     "record_path": str(record_root),
                     "filename": filename,
                     "duration": duration,
-                    "process_id": process.pid,
+                    "process_id": recording.pid,
                     "concurrent_count": current_recordings + 1,
                     "max_concurrent": max_concurrent_recordings,
-                    "metadata_file": str(metadata_file)
                 }
                     
             except Exception as e:
@@ -1110,8 +1344,7 @@ class APIServer(TikTok):
             token: str = Depends(token_dependency)
         ):
             try:
-                import psutil
-                from pathlib import Path
+                ffmpeg = self.parameter.ffmpeg
                 
                 # 获取录制目录
                 douyin_records = self.parameter.root / "Download" / "douyin" / "live_records"
@@ -1120,70 +1353,49 @@ class APIServer(TikTok):
                 recording_tasks = []
                 completed_files = []
                 
-                # 检查正在运行的FFmpeg进程并读取元数据
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'create_time']):
-                    try:
-                        if proc.info['name'] == 'ffmpeg' and proc.info['cmdline']:
-                            cmdline = ' '.join(proc.info['cmdline'])
-                            if 'live_records' in cmdline:
-                                # 解析命令行获取信息
-                                cmd_parts = proc.info['cmdline']
-                                
-                                # 查找输出文件路径
-                                output_file = None
-                                duration = 0
-                                for i, part in enumerate(cmd_parts):
-                                    if part == '-t' and i + 1 < len(cmd_parts):
-                                        duration = int(cmd_parts[i + 1]) // 60  # 转换为分钟
-                                    elif part.endswith('.mp4') and 'live_records' in part:
-                                        output_file = part
-                                
-                                if output_file:
-                                    file_path = Path(output_file)
-                                    elapsed_time = time() - proc.info['create_time']
-                                    
-                                    # 尝试读取元数据文件获取更多信息
-                                    metadata_file = file_path.parent / f".{file_path.name}.metadata"
-                                    metadata = {}
-                                    if metadata_file.exists():
-                                        try:
-                                            with open(metadata_file, 'r', encoding='utf-8') as f:
-                                                metadata = json.load(f)
-                                        except:
-                                            pass
-                                    
-                                    # 智能录制（duration=0）的进度计算
-                                    if duration == 0:
-                                        # 智能模式：显示已录制时间，无剩余时间
-                                        remaining_time = 0
-                                        progress = 0  # 智能模式无法计算进度百分比
-                                        status_text = "智能录制中"
-                                    else:
-                                        remaining_time = max(0, (duration * 60) - elapsed_time)
-                                        progress = min(100, (elapsed_time / (duration * 60)) * 100)
-                                        status_text = "定时录制中"
-                                    
-                                    recording_tasks.append({
-                                        'pid': proc.info['pid'],
-                                        'filename': file_path.name,
-                                        'file_path': str(file_path),
-                                        'duration': duration,
-                                        'elapsed_minutes': int(elapsed_time // 60),
-                                        'elapsed_seconds': int(elapsed_time % 60),
-                                        'remaining_minutes': int(remaining_time // 60),
-                                        'remaining_seconds': int(remaining_time % 60),
-                                        'progress': progress,
-                                        'status': 'recording',
-                                        'status_text': status_text,
-                                        'streamer_name': metadata.get('streamer_name', '未知'),
-                                        'platform': metadata.get('platform', '未知'),
-                                        'quality': metadata.get('quality', 'copy'),
-                                        'start_time': metadata.get('start_time', proc.info['create_time']),
-                                        'stream_url': metadata.get('stream_url', ''),
-                                        'is_smart_recording': duration == 0
-                                    })
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, IndexError, json.JSONDecodeError):
-                        continue
+                # 从录制任务登记表读取正在进行的录制
+                for recording in ffmpeg.list_recordings(active=True):
+                    metadata = recording.metadata
+                    file_path = Path(recording.files[-1] if recording.files else recording.file)
+                    duration = metadata.get('duration', 0)
+                    elapsed_time = time() - (recording.started or recording.created)
+                    
+                    # 智能录制（duration=0）的进度计算
+                    if duration == 0:
+                        # 智能模式：显示已录制时间，无剩余时间
+                        remaining_time = 0
+                        progress = 0  # 智能模式无法计算进度百分比
+                        status_text = "智能录制中"
+                    else:
+                        remaining_time = max(0, (duration * 60) - elapsed_time)
+                        progress = min(100, (elapsed_time / (duration * 60)) * 100)
+                        status_text = "定时录制中"
+                    
+                    recording_tasks.append({
+                        'id': recording.id,
+                        'pid': recording.pid,
+                        'filename': file_path.name,
+                        'file_path': str(file_path),
+                        'duration': duration,
+                        'elapsed_minutes': int(elapsed_time // 60),
+                        'elapsed_seconds': int(elapsed_time % 60),
+                        'remaining_minutes': int(remaining_time // 60),
+                        'remaining_seconds': int(remaining_time % 60),
+                        'progress': progress,
+                        'status': 'recording',
+                        'record_status': recording.status,
+                        'status_text': status_text,
+                        'streamer_name': metadata.get('streamer_name', '未知'),
+                        'platform': metadata.get('platform', '未知'),
+                        'quality': metadata.get('quality', 'copy'),
+                        'start_time': metadata.get('start_time', recording.created),
+                        'stream_url': metadata.get('stream_url', recording.url),
+                        'is_smart_recording': duration == 0,
+                        'bitrate': recording.bitrate,
+                        'recorded_seconds': int(recording.total_duration),
+                        'recorded_size': recording.total_size,
+                        'restarts': recording.restarts,
+                    })
                 
                 # 获取已完成的录制文件
                 for record_dir in [douyin_records, tiktok_records]:
@@ -1191,19 +1403,14 @@ class APIServer(TikTok):
                         platform = record_dir.parent.name
                         for file_path in record_dir.glob("*.mp4"):
                             if file_path.is_file():
+                                # 录制任务登记表中记录了主播名等信息
+                                recording = ffmpeg.get_by_file(str(file_path))
+                                if recording and not recording.done:
+                                    continue
+                                metadata = recording.metadata if recording else {}
                                 stat = file_path.stat()
                                 
-                                # 尝试读取对应的metadata文件获取主播名等信息
-                                metadata_file = file_path.parent / f".{file_path.name}.metadata"
-                                metadata = {}
-                                if metadata_file.exists():
-                                    try:
-                                        with open(metadata_file, 'r', encoding='utf-8') as f:
-                                            metadata = json.load(f)
-                                    except:
-                                        pass
-                                
-                                # 如果metadata中没有主播名，则从文件名提取
+                                # 如果登记表中没有主播名，则从文件名提取
                                 streamer_name = metadata.get('streamer_name')
                                 if not streamer_name:
                                     # 从文件名中提取主播名（去掉_live_和时间戳部分）
@@ -1398,6 +1605,10 @@ class APIServer(TikTok):
                         "error": f"删除文件失败: {str(e)}"
                     }
                 
+                # 移出录制任务登记表
+                if recording := self.parameter.ffmpeg.remove_file(str(file_path)):
+                    await self.database.delete_live_recording_data(recording.id)
+                
                 # 删除元数据文件（如果存在）
                 if metadata_file.exists():
                     try:
@@ -1427,7 +1638,8 @@ class APIServer(TikTok):
                 精确停止指定的录制任务，不影响其他录制
                 
                 **参数说明:**
-                - **process_id**: 进程ID；必需参数
+                - **process_id**: 进程ID；与 id 二选一
+                - **id**: 录制任务ID；与 process_id 二选一
                 - **streamer_name**: 主播名称；可选参数，用于验证
                 """)
             ),
@@ -1435,93 +1647,35 @@ class APIServer(TikTok):
             response_model=dict,
         )
         async def stop_recording(
-            process_id: int = Form(...),
+            process_id: int = Form(None),
+            id: str = Form(None),
             streamer_name: str = Form(None),
             token: str = Depends(token_dependency)
         ):
             try:
-                import psutil
-                import signal
-                from pathlib import Path
+                ffmpeg = self.parameter.ffmpeg
                 
-                # 查找并验证进程
-                target_process = None
-                try:
-                    target_process = psutil.Process(process_id)
-                    
-                    # 验证是否为FFmpeg录制进程
-                    if target_process.name() != 'ffmpeg':
-                        return {
-                            "success": False,
-                            "message": f"进程 {process_id} 不是FFmpeg进程",
-                            "error": "invalid_process"
-                        }
-                    
-                    cmdline = ' '.join(target_process.cmdline())
-                    if 'live_records' not in cmdline:
-                        return {
-                            "success": False,
-                            "message": f"进程 {process_id} 不是直播录制进程",
-                            "error": "not_recording_process"
-                        }
-                    
-                    # 获取输出文件路径用于清理元数据
-                    output_file = None
-                    for part in target_process.cmdline():
-                        if part.endswith('.mp4') and 'live_records' in part:
-                            output_file = Path(part)
-                            break
-                    
-                except psutil.NoSuchProcess:
+                # 从录制任务登记表查找录制任务
+                recording = ffmpeg.get(id) if id else ffmpeg.get_by_pid(process_id)
+                if not recording or recording.done:
                     return {
                         "success": False,
-                        "message": f"进程 {process_id} 不存在，可能已经停止",
+                        "message": f"进程 {process_id or id} 不存在，可能已经停止",
                         "error": "process_not_found"
                     }
+                process_id = recording.pid
                 
-                # 优雅停止进程
-                try:
-                    target_process.send_signal(signal.SIGTERM)
-                    
-                    # 等待进程优雅退出
-                    try:
-                        target_process.wait(timeout=10)
-                        stop_method = "优雅停止"
-                    except psutil.TimeoutExpired:
-                        # 如果10秒后还没退出，强制终止
-                        target_process.kill()
-                        target_process.wait(timeout=5)
-                        stop_method = "强制停止"
-                        
-                except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                    return {
-                        "success": False,
-                        "message": f"停止进程失败: {str(e)}",
-                        "error": "stop_failed"
-                    }
-                
-                # 清理元数据文件
-                if output_file:
-                    metadata_file = output_file.parent / f".{output_file.name}.metadata"
-                    if metadata_file.exists():
-                        try:
-                            # 更新元数据状态为已停止
-                            with open(metadata_file, 'r', encoding='utf-8') as f:
-                                metadata = json.load(f)
-                            metadata['status'] = 'stopped'
-                            metadata['stop_time'] = int(time())
-                            metadata['stop_method'] = stop_method
-                            with open(metadata_file, 'w', encoding='utf-8') as f:
-                                json.dump(metadata, f, ensure_ascii=False, indent=2)
-                        except:
-                            pass
+                # 优雅停止进程，10秒后还没退出则强制终止
+                await ffmpeg.stop(recording.id)
+                stop_method = "强制停止" if recording.returncode == -9 else "优雅停止"
                 
                 return {
                     "success": True,
                     "message": f"录制任务已停止 (PID: {process_id})",
+                    "id": recording.id,
                     "process_id": process_id,
                     "stop_method": stop_method,
-                    "output_file": str(output_file) if output_file else None
+                    "output_file": recording.files[-1] if recording.files else recording.file
                 }
                     
             except Exception as e:
@@ -1943,27 +2097,17 @@ class APIServer(TikTok):
             token: str = Depends(token_dependency)
         ):
             try:
-                import sqlite3
-                import json
-                from pathlib import Path
-                
-                db_path = self.parameter.root / "DouK-Downloader.db"
-                
-                with sqlite3.connect(str(db_path)) as conn:
-                    cursor = conn.cursor()
-                    
-                    cursor.execute("""
-                        INSERT INTO download_history 
-                        (title, author, platform, download_urls, download_type, work_id, 
-                         thumbnail_url, duration, tags)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        title, author, platform, download_urls, download_type,
-                        work_id, thumbnail_url, duration, tags
-                    ))
-                    
-                    record_id = cursor.lastrowid
-                    conn.commit()
+                record_id = await self.database.write_download_history(
+                    title,
+                    author,
+                    platform,
+                    download_urls,
+                    download_type,
+                    work_id,
+                    thumbnail_url,
+                    duration,
+                    tags,
+                )
                 
                 return {
                     "success": True,
@@ -1987,7 +2131,8 @@ class APIServer(TikTok):
                 
                 **参数说明:**
                 - **limit**: 返回记录数量限制
-                - **offset**: 偏移量（分页）
+                - **cursor**: 分页游标，传入上一页返回的 next_cursor 获取下一页
+                - **offset**: 偏移量（分页）；未传入 cursor 时有效，建议使用 cursor 分页
                 - **platform**: 平台过滤
                 """)
             ),
@@ -1998,64 +2143,47 @@ class APIServer(TikTok):
             limit: int = 50,
             offset: int = 0,
             platform: str = None,
+            cursor: str = None,
             token: str = Depends(token_dependency)
         ):
+            after = self.parse_cursor(cursor) if cursor else None
             try:
-                import sqlite3
                 import json
-                from pathlib import Path
                 
-                db_path = self.parameter.root / "DouK-Downloader.db"
+                records = await self.database.read_download_history(
+                    limit,
+                    platform,
+                    after,
+                    offset,
+                )
+                total = await self.database.count_download_history(platform)
                 
-                with sqlite3.connect(str(db_path)) as conn:
-                    conn.row_factory = sqlite3.Row  # 使结果可以按列名访问
-                    cursor = conn.cursor()
-                    
-                    # 构建查询条件
-                    where_clause = ""
-                    params = []
-                    
-                    if platform:
-                        where_clause = "WHERE platform = ?"
-                        params.append(platform)
-                    
-                    query = f"""
-                        SELECT * FROM download_history 
-                        {where_clause}
-                        ORDER BY download_time DESC 
-                        LIMIT ? OFFSET ?
-                    """
-                    params.extend([limit, offset])
-                    
-                    cursor.execute(query, params)
-                    records = cursor.fetchall()
-                    
-                    # 获取总数
-                    count_query = f"SELECT COUNT(*) as total FROM download_history {where_clause}"
-                    cursor.execute(count_query, params[:-2] if platform else [])
-                    total = cursor.fetchone()['total']
-                    
-                    # 转换为字典列表
-                    history = []
-                    for row in records:
-                        record = dict(row)
-                        # 解析JSON字段
-                        try:
-                            record['download_urls'] = json.loads(record['download_urls'])
-                        except:
-                            record['download_urls'] = []
-                        try:
-                            record['tags'] = json.loads(record['tags']) if record['tags'] else []
-                        except:
-                            record['tags'] = []
-                        history.append(record)
+                # 转换为字典列表
+                history = []
+                for row in records:
+                    record = dict(row)
+                    # 解析JSON字段
+                    try:
+                        record['download_urls'] = json.loads(record['download_urls'])
+                    except:
+                        record['download_urls'] = []
+                    try:
+                        record['tags'] = json.loads(record['tags']) if record['tags'] else []
+                    except:
+                        record['tags'] = []
+                    history.append(record)
+                
+                next_cursor = None
+                if len(records) == limit:
+                    next_cursor = f"{records[-1]['download_time']}|{records[-1]['id']}"
                 
                 return {
                     "success": True,
                     "data": history,
                     "total": total,
                     "limit": limit,
-                    "offset": offset
+                    "offset": offset,
+                    "next_cursor": next_cursor
                 }
                     
             except Exception as e:
@@ -2244,6 +2372,37 @@ class APIServer(TikTok):
             return self.success_response(extract, data)
         return self.failed_response(extract)
 
+    async def run_detail_job(self, extract: DetailJob) -> dict:
+        root, params, logger = self.record.run(self.parameter)
+        async with logger(root, console=self.console, **params) as record:
+            data = await self._handle_detail(
+                extract.detail_ids,
+                extract.tiktok,
+                record,
+                api=True,
+                cookie=extract.cookie,
+                proxy=extract.proxy,
+            )
+            if not (data := [i for i in data or () if i]):
+                raise DownloaderError(_("获取作品数据失败"))
+            await self.downloader.run(data, "detail", tiktok=extract.tiktok)
+        return {"count": len(data), "total": len(extract.detail_ids)}
+
+    async def run_account_job(self, extract: AccountJob) -> dict:
+        if not await self.deal_account_detail(
+            0,
+            extract.sec_user_id,
+            tab=extract.tab,
+            earliest=extract.earliest,
+            latest=extract.latest,
+            pages=extract.pages,
+            cookie=extract.cookie,
+            proxy=extract.proxy,
+            tiktok=extract.tiktok,
+        ):
+            raise DownloaderError(_("获取账号作品数据失败"))
+        return {"sec_user_id": extract.sec_user_id}
+
     @staticmethod
     def success_response(
         extract,
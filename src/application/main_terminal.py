@@ -1,14 +1,30 @@
+from asyncio import (
+    CancelledError,
+    Lock,
+    Queue,
+    QueueEmpty,
+    Semaphore,
+    create_task,
+    current_task,
+    gather,
+)
+from contextlib import contextmanager, suppress
 from datetime import date, datetime
 from pathlib import Path
 from platform import system
 from time import time
 from types import SimpleNamespace
-from typing import TYPE_CHECKING, Any, Callable, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Union
 
 from pydantic import ValidationError
 
 # from ..custom import failure_handling
-from ..custom import suspend
+from ..custom import (
+    ACCOUNT_MAX_WORKERS,
+    DETAIL_MAX_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+    suspend,
+)
 from ..downloader import Downloader
 from ..extract import Extractor
 from ..interface import (
@@ -48,7 +64,12 @@ from ..models import (
 )
 from ..module import DetailTikTokExtractor, DetailTikTokUnofficial
 from ..storage import RecordManager
-from ..tools import DownloaderError, choose, safe_pop
+from ..tools import (
+    DownloaderError,
+    choose,
+    current_progress,
+    safe_pop,
+)
 from ..translation import _
 
 if TYPE_CHECKING:
@@ -99,6 +120,7 @@ def check_cookie_state(tiktok=False):
 
 class TikTok:
     ENCODE = "UTF-8-SIG" if system() == "Windows" else "UTF-8"
+    detail_semaphore = Semaphore(DETAIL_MAX_WORKERS)
 
     def __init__(
         self,
@@ -114,8 +136,8 @@ class TikTok:
         API.init_progress_object(
             server_mode,
         )
-        self.links = LinkExtractor(parameter)
-        self.links_tiktok = ExtractorTikTok(parameter)
+        self.links = LinkExtractor(parameter, database=database)
+        self.links_tiktok = ExtractorTikTok(parameter, database)
         self.downloader = Downloader(
             parameter,
             server_mode,
@@ -381,38 +403,112 @@ class TikTok:
         self.logger.info(
             _("共有 {count} 个账号的作品等待下载").format(count=len(accounts))
         )
-        for index, data in enumerate(accounts, start=1):
-            if not (
-                sec_user_id := await self.check_sec_user_id(
-                    data.url,
+        queue = Queue()
+        for item in enumerate(accounts, start=1):
+            queue.put_nowait(item)
+        pause = Lock()
+        with self.shared_progress():
+            await gather(
+                *(
+                    self.__account_detail_worker(
+                        queue,
+                        pause,
+                        count,
+                        len(accounts),
+                        params_name,
+                        tiktok,
+                    )
+                    for __ in range(min(ACCOUNT_MAX_WORKERS, len(accounts)))
+                )
+            )
+        self.__summarize_results(
+            count,
+            _("账号"),
+        )
+
+    @contextmanager
+    def shared_progress(self):
+        """多个协程同时采集与下载时共用一个进度条，避免多个实时显示交错输出"""
+        if self.downloader.server_mode or current_progress.get():
+            yield
+            return
+        with self.downloader.general_progress_object() as progress:
+            token = current_progress.set(progress)
+            try:
+                yield
+            finally:
+                current_progress.reset(token)
+
+    async def __account_detail_worker(
+        self,
+        queue: Queue,
+        pause: Lock,
+        count: SimpleNamespace,
+        total: int,
+        params_name: str,
+        tiktok: bool,
+    ) -> None:
+        """账号采集工作协程，每个协程独立处理账号，边获取数据边下载作品文件"""
+        while True:
+            try:
+                index, data = queue.get_nowait()
+            except QueueEmpty:
+                return
+            async with pause:
+                pass
+            try:
+                success = await self.__account_detail_batch_single(
+                    index,
+                    data,
+                    params_name,
                     tiktok,
                 )
-            ):
-                self.logger.warning(
-                    _(
-                        "配置文件 {name} 参数的 url {url} 提取 sec_user_id 失败，错误配置：{data}"
-                    ).format(
-                        name=params_name,
-                        url=data.url,
-                        data=vars(data),
+            except Exception as e:
+                # 单个账号处理异常时记为失败，工作协程继续处理其余账号
+                self.logger.error(
+                    _("处理第 {index} 个账号时发生错误：{error}").format(
+                        index=index, error=repr(e)
                     )
                 )
+                success = False
+            if success:
+                count.success += 1
+            else:
                 count.failed += 1
-                continue
-            if not await self.deal_account_detail(
+            # break  # 调试代码
+            if (processed := count.success + count.failed) != total:
+                async with pause:
+                    await suspend(processed, self.console)
+
+    async def __account_detail_batch_single(
+        self,
+        index: int,
+        data: SimpleNamespace,
+        params_name: str,
+        tiktok: bool,
+    ) -> bool:
+        if not (
+            sec_user_id := await self.check_sec_user_id(
+                data.url,
+                tiktok,
+            )
+        ):
+            self.logger.warning(
+                _(
+                    "配置文件 {name} 参数的 url {url} 提取 sec_user_id 失败，错误配置：{data}"
+                ).format(
+                    name=params_name,
+                    url=data.url,
+                    data=vars(data),
+                )
+            )
+            return False
+        return bool(
+            await self.deal_account_detail(
                 index,
                 **vars(data) | {"sec_user_id": sec_user_id},
                 tiktok=tiktok,
-            ):
-                count.failed += 1
-                continue
-            # break  # 调试代码
-            count.success += 1
-            if index != len(accounts):
-                await suspend(index, self.console)
-        self.__summarize_results(
-            count,
-            _("账号"),
+            )
         )
 
     async def check_sec_user_id(
@@ -582,51 +678,7 @@ class TikTok:
                     "如果账号发布作品均为共创作品且该账号均不是作品作者时，请配置已登录的 Cookie 后重新运行程序，其余情况请无视该提示！"
                 )
             )
-        acquirer = self._get_account_data_tiktok if tiktok else self._get_account_data
-        account_data, earliest, latest = await acquirer(
-            cookie=cookie,
-            proxy=proxy,
-            sec_user_id=sec_user_id,
-            tab=tab,
-            earliest=earliest,
-            latest=latest,
-            pages=pages,
-            **kwargs,
-        )
-        if not any(account_data):
-            return None
-        if source:
-            return self.extractor.source_date_filter(
-                account_data,
-                earliest,
-                latest,
-                tiktok,
-            )
-        return await self._batch_process_detail(
-            account_data,
-            user_id=sec_user_id,
-            mark=mark,
-            api=api,
-            earliest=earliest,
-            latest=latest,
-            tiktok=tiktok,
-            mode=tab,
-            info=info,
-        )
-
-    async def _get_account_data(
-        self,
-        cookie: str = None,
-        proxy: str = None,
-        sec_user_id: Union[str] = ...,
-        tab: str = "post",
-        earliest: str = "",
-        latest: str = "",
-        pages: int = None,
-        *args,
-        **kwargs,
-    ):
-        return await Account(
+        account = (AccountTikTok if tiktok else Account)(
             self.parameter,
             cookie,
             proxy,
@@ -635,30 +687,84 @@ class TikTok:
             earliest,
             latest,
             pages,
-        ).run()
+            watermark=await self.__read_watermark(sec_user_id, tab)
+            if self.parameter.incremental_sync and not api
+            else None,
+        )
+        if api or source:
+            account_data, earliest, latest = await account.run()
+            if not any(account_data):
+                return None
+            if source:
+                return self.extractor.source_date_filter(
+                    account_data,
+                    earliest,
+                    latest,
+                    tiktok,
+                )
+            return await self._batch_process_detail(
+                account_data,
+                user_id=sec_user_id,
+                mark=mark,
+                api=api,
+                earliest=earliest,
+                latest=latest,
+                tiktok=tiktok,
+                mode=tab,
+                info=info,
+            )
+        positions = []  # 每页数据的最新作品位置，用于生成本次同步位置
+        downloaded = []  # 每页作品文件是否全部下载成功
+
+        def on_page(page: list[dict], success: bool):
+            positions.append(Account.generate_watermark(page, tab))
+            downloaded.append(success)
+
+        # 后台获取数据与下载作品文件共用一个进度条
+        with self.shared_progress():
+            pages = self._iter_pages(account)
+            if not (first := await anext(pages, None)):
+                return None
+            result = await self._stream_process_detail(
+                first,
+                pages,
+                user_id=sec_user_id,
+                mark=mark,
+                earliest=account.earliest,
+                latest=account.latest,
+                tiktok=tiktok,
+                mode=tab,
+                info=info,
+                on_page=on_page,
+            )
+        # 数据获取提前结束或存在下载失败的作品时保留上次同步位置，避免遗漏未处理的作品
+        if result and account.complete and all(downloaded):
+            await self.__update_watermark(sec_user_id, tab, positions)
+        return result
+
+    async def __read_watermark(self, sec_user_id: str, tab: str) -> dict | None:
+        if data := await self.database.read_sync_data(sec_user_id, tab):
+            return {
+                "aweme_id": data["AWEME_ID"],
+                "create_time": data["CREATE_TIME"],
+                "max_cursor": data["MAX_CURSOR"],
+            }
+        return None
 
-    async def _get_account_data_tiktok(
+    async def __update_watermark(
         self,
-        cookie: str = None,
-        proxy: str = None,
-        sec_user_id: Union[str] = ...,
-        tab: str = "post",
-        earliest: str = "",
-        latest: str = "",
-        pages: int = None,
-        *args,
-        **kwargs,
-    ):
-        return await AccountTikTok(
-            self.parameter,
-            cookie,
-            proxy,
+        sec_user_id: str,
+        tab: str,
+        data: list[dict],
+    ) -> None:
+        """记录本次同步获取到的最新作品位置，供下次增量同步使用"""
+        if not (watermark := Account.generate_watermark(data, tab)):
+            return
+        await self.database.update_sync_data(
             sec_user_id,
             tab,
-            earliest,
-            latest,
-            pages,
-        ).run()
+            **watermark,
+        )
 
     async def get_user_info_data(
         self,
@@ -802,6 +908,127 @@ class TikTok:
         )
         return True
 
+    @staticmethod
+    async def _iter_pages(producer: API) -> AsyncIterator[list[dict]]:
+        """后台分页获取数据并逐页返回，未处理的数据达到上限时暂停获取"""
+        queue = Queue(PIPELINE_QUEUE_SIZE)
+
+        async def produce():
+            try:
+                await producer.stream(queue).run()
+            finally:
+                if not current_task().cancelling():
+                    await queue.put(None)
+
+        task = create_task(produce())
+        try:
+            while page := await queue.get():
+                yield page
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                with suppress(CancelledError):
+                    await task
+
+    async def _stream_process_detail(
+        self,
+        first: list[dict],
+        pages: AsyncIterator[list[dict]],
+        earliest: date = None,
+        latest: date = None,
+        tiktok: bool = False,
+        info: dict = None,
+        mode: str = "",
+        mark: str = "",
+        user_id: str = "",
+        mix_id: str = "",
+        mix_title: str = "",
+        collect_id: str = "",
+        collect_name: str = "",
+        on_page: Callable[[list[dict], bool], Any] = None,
+    ):
+        """逐页提取作品数据并下载作品文件，下载期间继续在后台获取下一页数据"""
+        try:
+            self.logger.info(_("开始提取作品数据"))
+            id_, name, mark = self.extractor.preprocessing_data(
+                info or first,
+                tiktok,
+                mode,
+                mark,
+                user_id,
+                mix_id,
+                mix_title,
+                collect_id,
+                collect_name,
+            )
+            if not all((id_, name, mark)):
+                self.logger.error(_("提取账号或合集信息发生错误！"))
+                return False
+            self.__display_extracted_information(
+                id_,
+                name,
+                mark,
+            )
+            prefix = self._generate_prefix(mode)
+            suffix = self._generate_suffix(mode)
+            old_mark = (
+                f"{m['MARK']}_{suffix}"
+                if (m := await self.cache.has_cache(id_))
+                else None
+            )
+            root, params, logger = self.record.run(self.parameter)
+            async with logger(
+                root,
+                name=f"{prefix}{id_}_{mark}_{suffix}",
+                old=old_mark,
+                console=self.console,
+                **params,
+            ) as recorder:
+                await self.cache.update_cache(
+                    self.parameter.folder_mode,
+                    prefix,
+                    suffix,
+                    id_,
+                    name,
+                    mark,
+                )
+                page = first
+                while page:
+                    data = await self.extractor.run(
+                        page,
+                        recorder,
+                        type_="batch",
+                        tiktok=tiktok,
+                        name=name,
+                        mark=mark,
+                        earliest=earliest or date(2016, 9, 20),
+                        latest=latest or date.today(),
+                        same=mode
+                        in {
+                            "post",
+                            "mix",
+                        },
+                    )
+                    success = await self.download_detail_batch(
+                        data,
+                        tiktok=tiktok,
+                        mode=mode,
+                        mark=mark,
+                        user_id=id_,
+                        user_name=name,
+                        mix_id=mix_id,
+                        mix_title=mix_title,
+                        collect_id=collect_id,
+                        collect_name=collect_name,
+                    )
+                    if on_page:
+                        on_page(page, success is not False)
+                    page = await anext(pages, None)
+            return True
+        finally:
+            await pages.aclose()
+
     @staticmethod
     def _generate_prefix(
         mode: str,
@@ -861,8 +1088,8 @@ class TikTok:
         mix_title: str = "",
         collect_id: str = "",
         collect_name: str = "",
-    ):
-        await self.downloader.run(
+    ) -> bool | None:
+        return await self.downloader.run(
             data,
             type_,
             tiktok,
@@ -1068,6 +1295,22 @@ class TikTok:
             self.logger.error(f"💥 作品详情获取异常: {detail_id} - {str(e)}")
             return None
 
+    async def handle_detail_limited(
+        self,
+        processor: Callable,
+        cookie: str,
+        proxy: str,
+        detail_id: str,
+    ):
+        """限制并发数量获取作品详细数据，请求速率由 API 的自适应限速器控制"""
+        async with self.detail_semaphore:
+            return await self.handle_detail_single(
+                processor,
+                cookie,
+                proxy,
+                detail_id,
+            )
+
     async def __handle_detail(
         self,
         tiktok: bool,
@@ -1082,15 +1325,17 @@ class TikTok:
         self.logger.info(f"🚀 开始批量处理作品: {len(ids)}个")
         self.logger.info(f"📝 作品ID列表: {ids}")
         
-        detail_data = [
-            await self.handle_detail_single(
-                processor,
-                cookie,
-                proxy,
-                i,
+        detail_data = await gather(
+            *(
+                self.handle_detail_limited(
+                    processor,
+                    cookie,
+                    proxy,
+                    i,
+                )
+                for i in ids
             )
-            for i in ids
-        ]
+        )
         
         valid_data = [d for d in detail_data if d]
         self.logger.info(f"📊 处理结果: {len(valid_data)}/{len(detail_data)} 个作品获取成功")
@@ -1709,19 +1954,31 @@ class TikTok:
                 **mix_params,
                 **kwargs,
             )
-        if any(mix_data := await mix_obj.run()):
-            return (
-                mix_data
-                if source
-                else await self._batch_process_detail(
-                    mix_data,
-                    mode="mix",
-                    mix_id=mix_obj.mix_id,
-                    mark=mark,
-                    api=api,
-                    tiktok=tiktok,
+        if api or source:
+            if any(mix_data := await mix_obj.run()):
+                return (
+                    mix_data
+                    if source
+                    else await self._batch_process_detail(
+                        mix_data,
+                        mode="mix",
+                        mix_id=mix_obj.mix_id,
+                        mark=mark,
+                        api=api,
+                        tiktok=tiktok,
+                    )
                 )
-            )
+        else:
+            with self.shared_progress():
+                if first := await anext(pages := self._iter_pages(mix_obj), None):
+                    return await self._stream_process_detail(
+                        first,
+                        pages,
+                        mode="mix",
+                        mix_id=mix_obj.mix_id,
+                        mark=mark,
+                        tiktok=tiktok,
+                    )
         self.logger.warning(_("采集合集作品数据失败"))
 
     async def _check_mix_id(
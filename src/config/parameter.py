@@ -25,7 +25,13 @@ from ..interface import API, APITikTok
 from ..module import FFMPEG
 from ..record import BaseLogger, LoggerManager
 from ..storage import RecordManager
-from ..tools import Cleaner, DownloaderError, cookie_dict_to_str, create_client
+from ..tools import (
+    Cleaner,
+    DownloaderError,
+    close_proxy_clients,
+    cookie_dict_to_str,
+    create_client,
+)
 from ..translation import _
 
 if TYPE_CHECKING:
@@ -98,6 +104,9 @@ class Parameter:
         timeout=10,
         douyin_platform=True,
         tiktok_platform=True,
+        segment_threshold: int = 1024 * 1024 * 32,
+        segment_count: int = 4,
+        incremental_sync: bool = False,
         **kwargs,
     ):
         self.settings = settings
@@ -161,9 +170,12 @@ class Parameter:
         self.download = self.check_bool_true(download)
         self.max_size = self.__check_max_size(max_size)
         self.chunk = self.__check_chunk(chunk)
+        self.segment_threshold = self.__check_segment_threshold(segment_threshold)
+        self.segment_count = self.__check_segment_count(segment_count)
         self.timeout = self.__check_timeout(timeout)
         self.max_retry = self.__check_max_retry(max_retry)
         self.max_pages = self.__check_max_pages(max_pages)
+        self.incremental_sync = self.check_bool_false(incremental_sync)
         self.run_command = self.__check_run_command(run_command)
         self.ffmpeg = self.__generate_ffmpeg_object(ffmpeg)
         self.live_qualities = self.__check_live_qualities(live_qualities)
@@ -228,9 +240,12 @@ class Parameter:
             "download": self.check_bool_true,
             "max_size": self.__check_max_size,
             "chunk": self.__check_chunk,
+            "segment_threshold": self.__check_segment_threshold,
+            "segment_count": self.__check_segment_count,
             "timeout": self.__check_timeout,
             "max_retry": self.__check_max_retry,
             "max_pages": self.__check_max_pages,
+            "incremental_sync": self.check_bool_false,
             "run_command": self.__check_run_command,
             "ffmpeg": self.__generate_ffmpeg_object,
             "live_qualities": self.__check_live_qualities,
@@ -501,6 +516,19 @@ class Parameter:
             1024 * 1024 * 2,
         )
 
+    def __check_segment_threshold(self, segment_threshold: int) -> int:
+        segment_threshold = max(segment_threshold, 0)
+        self.logger.info(f"segment_threshold 参数已设置为 {segment_threshold}", False)
+        return segment_threshold
+
+    def __check_segment_count(self, segment_count: int) -> int:
+        return self.__check_number_value(
+            segment_count,
+            "segment_count",
+            1,
+            4,
+        )
+
     def __check_max_retry(self, max_retry: int) -> int:
         return self.__check_number_value(
             max_retry,
@@ -837,8 +865,11 @@ class Parameter:
             "download": self.download,
             "max_size": self.max_size,
             "chunk": self.chunk,
+            "segment_threshold": self.segment_threshold,
+            "segment_count": self.segment_count,
             "max_retry": self.max_retry,
             "max_pages": self.max_pages,
+            "incremental_sync": self.incremental_sync,
             "run_command": " ".join(self.run_command[::-1]),
             "ffmpeg": self.ffmpeg.path or "",
         }
@@ -999,6 +1030,7 @@ class Parameter:
     async def close_client(self) -> None:
         await self.client.aclose()
         await self.client_tiktok.aclose()
+        await close_proxy_clients()
 
     def __generate_folders(self):
         self.compatible()
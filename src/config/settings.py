@@ -82,9 +82,12 @@ class Settings:
         "download": True,
         "max_size": 0,
         "chunk": 1024 * 1024 * 2,  # 每次从服务器接收的数据块大小
+        "segment_threshold": 1024 * 1024 * 32,  # 分段下载的文件大小阈值
+        "segment_count": 4,  # 分段下载的分段数量
         "timeout": 10,
         "max_retry": 5,  # 重试最大次数
         "max_pages": 0,
+        "incremental_sync": False,  # 批量下载账号作品时，获取到上次同步的位置后停止请求数据
         "run_command": "",
         "ffmpeg": "",
         "live_qualities": "",
@@ -55,7 +55,30 @@ from .internal import (
 )
 from .static import (
     MAX_WORKERS,
+    ACCOUNT_MAX_WORKERS,
+    REQUEST_RATE_LIMIT,
+    REQUEST_RATE_INITIAL,
+    REQUEST_RATE_MINIMUM,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_DEADLINE,
+    CIRCUIT_BREAKER_THRESHOLD,
+    CIRCUIT_BREAKER_COOLDOWN,
+    CIRCUIT_BREAKER_CAPACITY,
+    DETAIL_MAX_WORKERS,
+    JOB_MAX_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+    LINK_RESOLVE_CONCURRENCY,
+    SHORT_URL_CACHE_TTL,
+    LIVE_RECORD_MAX_WORKERS,
+    LIVE_RECORD_MAX_RESTARTS,
+    LIVE_RECORD_RESTART_DELAY,
+    LIVE_RECORD_RETENTION,
+    EXTRACT_PROCESS_THRESHOLD,
+    EXTRACT_PROCESS_WORKERS,
     TEXT_REPLACEMENT,
+    SQLITE_BATCH_SIZE,
+    SQLITE_SYNCHRONOUS,
     SERVER_HOST,
     SERVER_PORT,
     MASTER,
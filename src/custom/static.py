@@ -1,11 +1,74 @@
 # 同时下载作品文件的最大任务数，对直播无效
 MAX_WORKERS = 4
 
+# 同时获取作品详细数据的最大任务数，设置为 1 代表逐个获取
+DETAIL_MAX_WORKERS = 4
+
+# 批量下载账号作品模式同时处理的最大账号数量，设置为 1 代表逐个处理
+ACCOUNT_MAX_WORKERS = 2
+
+# 获取数据请求速率上限，按域名与 Cookie 分别计算，所有接口共享，单位：次/秒，设置为 0 代表不限制
+REQUEST_RATE_LIMIT = 3
+
+# 请求失败时的重试间隔，按指数退避并添加随机抖动，单位：秒
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 10
+
+# 单次请求包括重试在内的最长耗时，单位：秒
+RETRY_DEADLINE = 120
+
+# 同一接口连续请求失败达到该次数后，暂停请求该接口，设置为 0 代表关闭熔断
+CIRCUIT_BREAKER_THRESHOLD = 5
+
+# 接口暂停请求的冷却时间，单位：秒
+CIRCUIT_BREAKER_COOLDOWN = 60
+
+# 熔断器最多记录的接口数量，超出时移除最早记录的接口
+CIRCUIT_BREAKER_CAPACITY = 256
+
+# 获取数据请求的初始速率与最低速率，响应正常时逐步提速，触发风控时降速，单位：次/秒
+REQUEST_RATE_INITIAL = 1
+REQUEST_RATE_MINIMUM = 0.2
+
+# Web API 模式同时执行的最大后台任务数量
+JOB_MAX_WORKERS = 2
+
+# 批量下载账号或合集作品时，已获取但尚未处理的最大数据页数
+PIPELINE_QUEUE_SIZE = 2
+
+# 解析分享链接的最大并发数量
+LINK_RESOLVE_CONCURRENCY = 8
+
+# 分享链接解析结果的缓存有效期，单位：秒
+SHORT_URL_CACHE_TTL = 7 * 24 * 60 * 60
+
+# 同时录制直播的最大数量，超出的录制任务将会等待
+LIVE_RECORD_MAX_WORKERS = 5
+
+# 直播录制进程异常退出后自动重新录制的最大次数，以及重新录制前的等待时间，单位：秒
+LIVE_RECORD_MAX_RESTARTS = 3
+LIVE_RECORD_RESTART_DELAY = 10
+
+# 已结束的直播录制记录保留时间，单位：秒
+LIVE_RECORD_RETENTION = 30 * 24 * 60 * 60
+
+# 单次提取作品数据数量达到该值时，使用多进程提取数据，设置为 0 代表关闭多进程提取
+EXTRACT_PROCESS_THRESHOLD = 5000
+
+# 多进程提取作品数据使用的最大进程数量
+EXTRACT_PROCESS_WORKERS = 4
+
 # 非法字符替换规则，key 为替换前的文本，value 为替换后的文本
 TEXT_REPLACEMENT = {
     " ": " ",
 }
 
+# storage_format 为 sql 时，单次事务批量写入的最大数据量，退出时写入剩余数据
+SQLITE_BATCH_SIZE = 500
+
+# storage_format 为 sql 时，数据库 synchronous 模式，可选值：OFF、NORMAL、FULL、EXTRA
+SQLITE_SYNCHRONOUS = "NORMAL"
+
 # 服务器模式主机，对 Web API 接口模式、Web UI 交互模式 生效，设置为 "127.0.0.1" 代表仅本地可用
 SERVER_HOST = "0.0.0.0"
 
@@ -1,4 +1,4 @@
-from asyncio import Semaphore, gather
+from asyncio import Semaphore, gather, sleep
 from datetime import datetime
 from pathlib import Path
 from shutil import move
@@ -28,9 +28,13 @@ from ..tools import (
     DownloaderError,
     FakeProgress,
     Retry,
+    SharedProgress,
     beautify_string,
+    current_progress,
     format_size,
+    last_error,
 )
+from ..manager import current_job
 from ..translation import _
 
 if TYPE_CHECKING:
@@ -83,12 +87,15 @@ class Downloader:
         self.download = params.download
         self.max_size = params.max_size
         self.chunk = params.chunk
+        self.segment_threshold = params.segment_threshold
+        self.segment_count = params.segment_count
         self.max_retry = params.max_retry
         self.recorder = params.recorder
         self.timeout = params.timeout
         self.ffmpeg = params.ffmpeg
         self.cache = params.cache
         self.truncate = params.truncate
+        self.server_mode = server_mode
         self.general_progress_object: Callable = self.init_general_progress(
             server_mode,
         )
@@ -106,10 +113,12 @@ class Downloader:
         *args,
         **kwargs,
     ):
-        return FakeProgress()
+        return current_job.get() or FakeProgress()
 
     def __general_progress_object(self):
         """文件下载进度条"""
+        if progress := current_progress.get():
+            return SharedProgress(progress)
         return Progress(
             TextColumn(
                 "[progress.description]{task.description}",
@@ -153,13 +162,13 @@ class Downloader:
         type_: str,
         tiktok=False,
         **kwargs,
-    ) -> None:
+    ) -> bool | None:
         if not self.download or not data:
             return
         self.log.info(_("开始下载作品文件"))
         match type_:
             case "batch":
-                await self.run_batch(data, tiktok, **kwargs)
+                return await self.run_batch(data, tiktok, **kwargs)
             case "detail":
                 await self.run_general(data, tiktok, **kwargs)
             case "music":
@@ -181,7 +190,7 @@ class Downloader:
         mix_title: str = "",
         collect_id: str = "",
         collect_name: str = "",
-    ):
+    ) -> bool:
         root = self.storage_folder(
             mode,
             *self.data_classification(
@@ -195,7 +204,7 @@ class Downloader:
                 collect_name,
             ),
         )
-        await self.batch_processing(
+        return await self.batch_processing(
             data,
             root,
             tiktok=tiktok,
@@ -251,10 +260,7 @@ class Downloader:
             data,
             download_command,
         )
-        self.console.info(
-            _("程序将会调用 ffmpeg 下载直播，关闭 DouK-Downloader 不会中断下载！"),
-        )
-        self.__download_live(download_command, tiktok)
+        await self.__download_live(download_command, tiktok)
 
     def generate_live_commands(
         self,
@@ -277,18 +283,63 @@ class Downloader:
                 )
             )
 
-    def __download_live(
+    async def __download_live(
         self,
         commands: list,
         tiktok: bool,
     ):
-        self.ffmpeg.download(
+        recordings = self.ffmpeg.download(
             commands,
             self.proxy_tiktok if tiktok else self.proxy,
             self.headers["User-Agent"],
         )
+        self.log.info(
+            _("已在后台开始录制直播，共 {count} 个").format(count=len(recordings))
+        )
+        if not self.server_mode:
+            self.console.info(
+                _("程序将会调用 ffmpeg 下载直播，关闭 DouK-Downloader 会中断下载！"),
+            )
+
+    async def wait_live(self) -> None:
+        """显示直播录制进度并等待录制结束"""
+        if not (recordings := self.ffmpeg.list_recordings(True)):
+            return
+        with self.__live_progress_object() as progress:
+            tasks = [
+                progress.add_task(Path(i.file).name, total=None) for i in recordings
+            ]
+            while not all(i.done for i in recordings):
+                for task, recording in zip(tasks, recordings):
+                    progress.update(
+                        task,
+                        completed=recording.total_size,
+                        description=f"{Path(recording.file).name} "
+                        f"{recording.bitrate:.0f}kbit/s "
+                        f"{_('状态')}: {recording.status}",
+                    )
+                await sleep(1)
+        for recording in recordings:
+            if recording.status == recording.FAILED:
+                self.log.warning(
+                    _("直播录制失败：{file}，{error}").format(
+                        file=recording.file,
+                        error=recording.error[-1] if recording.error else "",
+                    )
+                )
+            else:
+                self.log.info(
+                    _(
+                        "直播录制结束：{file}，时长 {duration} 秒，文件大小 {size}"
+                    ).format(
+                        file=recording.file,
+                        duration=int(recording.total_duration),
+                        size=format_size(recording.total_size),
+                    )
+                )
 
-    async def batch_processing(self, data: list[dict], root: Path, **kwargs):
+    async def batch_processing(self, data: list[dict], root: Path, **kwargs) -> bool:
+        """下载作品文件，全部文件下载成功或跳过时返回 True"""
         count = SimpleNamespace(
             downloaded_image=set(),
             skipped_image=set(),
@@ -298,6 +349,8 @@ class Downloader:
             skipped_live=set(),
         )
         tasks = []
+        # 一次查询整页作品的下载记录，避免逐个作品查询
+        downloaded = await self.recorder.has_ids([i["id"] for i in data])
         for item in data:
             item["desc"] = beautify_string(
                 item["desc"],
@@ -322,12 +375,14 @@ class Downloader:
                     **params,
                     type_=_("图集"),
                     skipped=count.skipped_image,
+                    downloaded=item["id"] in downloaded,
                 )
             elif t == _("视频"):
                 await self.download_video(
                     **params,
                     type_=_("视频"),
                     skipped=count.skipped_video,
+                    downloaded=item["id"] in downloaded,
                 )
             elif t == _("实况"):
                 await self.download_image(
@@ -335,6 +390,7 @@ class Downloader:
                     type_=_("实况"),
                     **params,
                     skipped=count.skipped_live,
+                    downloaded=item["id"] in downloaded,
                 )
             else:
                 raise DownloaderError
@@ -343,10 +399,11 @@ class Downloader:
                 type=_("音乐"),
             )
             self.download_cover(**params)
-        await self.downloader_chart(
+        success = await self.downloader_chart(
             tasks, count, self.general_progress_object(), **kwargs
         )
         self.statistics_count(count)
+        return success
 
     async def downloader_chart(
         self,
@@ -355,7 +412,7 @@ class Downloader:
         progress: Progress,
         semaphore: Semaphore = None,
         **kwargs,
-    ):
+    ) -> bool:
         with progress:
             tasks = [
                 self.request_file(
@@ -367,7 +424,7 @@ class Downloader:
                 )
                 for task in tasks
             ]
-            await gather(*tasks)
+            return False not in await gather(*tasks)
 
     def deal_folder_path(
         self,
@@ -389,9 +446,6 @@ class Downloader:
     def is_exists(path: Path) -> bool:
         return path.exists()
 
-    async def is_skip(self, id_: str, path: Path) -> bool:
-        return await self.is_downloaded(id_) or self.is_exists(path)
-
     async def download_image(
         self,
         tasks: list,
@@ -403,6 +457,7 @@ class Downloader:
         actual_root: Path,
         suffix: str = "jpeg",
         type_: str = _("图集"),
+        downloaded: bool = False,
     ) -> None:
         if not item["downloads"]:
             self.log.error(
@@ -415,7 +470,7 @@ class Downloader:
             item["downloads"],
             start=1,
         ):
-            if await self.is_downloaded(id_):
+            if downloaded:
                 skipped.add(id_)
                 self.log.info(
                     _("【{type}】{name} 存在下载记录，跳过下载").format(
@@ -454,6 +509,7 @@ class Downloader:
         actual_root: Path,
         suffix: str = "mp4",
         type_: str = _("视频"),
+        downloaded: bool = False,
     ) -> None:
         if not item["downloads"]:
             self.log.error(
@@ -462,12 +518,10 @@ class Downloader:
                 )
             )
             return
-        if await self.is_skip(
-            id_,
-            p := actual_root.with_name(
-                f"{name}.{suffix}",
-            ),
-        ):
+        p = actual_root.with_name(
+            f"{name}.{suffix}",
+        )
+        if downloaded or self.is_exists(p):
             self.log.info(
                 _("【{type}】{name} 存在下载记录或文件已存在，跳过下载").format(
                     type=type_, name=name
@@ -580,7 +634,7 @@ class Downloader:
         """未传入 switch 参数则判断音乐下载开关设置"""
         return all((switch or self.music, url, not self.is_exists(path)))
 
-    @Retry.retry
+    @Retry.retry_host
     async def request_file(
         self,
         url: str,
@@ -625,41 +679,60 @@ class Downloader:
                         response.headers,
                         suffix,
                     )
-                    length += position
-                    self._record_response(
-                        response,
-                        show,
-                        length,
-                    )
-                    match self._download_initial_check(
-                        length,
-                        unknown_size,
-                        show,
-                    ):
-                        case 1:
-                            return await self.download_file(
-                                temp,
-                                actual.with_suffix(
-                                    f".{suffix}",
-                                ),
-                                show,
-                                id_,
-                                response,
-                                length,
-                                position,
-                                count,
-                                progress,
-                            )
-                        case 0:
-                            return True
-                        case -1:
-                            return False
-                        case _:
-                            raise DownloaderError
+                    if position or not self.__segment_available(response, length):
+                        length += position
+                        self._record_response(
+                            response,
+                            show,
+                            length,
+                        )
+                        match self._download_initial_check(
+                            length,
+                            unknown_size,
+                            show,
+                        ):
+                            case 1:
+                                return await self.download_file(
+                                    temp,
+                                    actual.with_suffix(
+                                        f".{suffix}",
+                                    ),
+                                    show,
+                                    id_,
+                                    response,
+                                    length,
+                                    position,
+                                    count,
+                                    progress,
+                                )
+                            case 0:
+                                return True
+                            case -1:
+                                return False
+                            case _:
+                                raise DownloaderError
+                # 文件较大且服务器支持分段请求，关闭首个响应后改为分段下载
+                self.log.info(f"{show} 文件大小 {format_size(length)}", False)
+                return await self.download_segments(
+                    client,
+                    str(response.url),
+                    headers,
+                    temp,
+                    actual.with_suffix(
+                        f".{suffix}",
+                    ),
+                    show,
+                    id_,
+                    length,
+                    count,
+                    progress,
+                )
             except RequestError as e:
+                last_error.set(e)
                 self.log.warning(_("网络异常: {error_repr}").format(error_repr=repr(e)))
                 return False
             except HTTPStatusError as e:
+                last_error.set(e)
                 self.log.warning(
                     _("响应码异常: {error_repr}").format(error_repr=repr(e))
                 )
@@ -670,10 +743,12 @@ class Downloader:
                 )
                 return False
             except CacheError as e:
+                last_error.set(e)
                 self.delete(temp)
                 self.log.error(str(e))
                 return False
             except Exception as e:
+                last_error.set(e)
                 self.log.error(
                     _(
                         "下载文件时发生预期之外的错误，请向作者反馈，错误信息: {error}"
@@ -724,6 +799,108 @@ class Downloader:
         self.add_count(show, id_, count)
         return True
 
+    def __segment_available(self, response, length: int) -> bool:
+        """文件大小超过分段阈值且服务器支持分段请求时使用分段下载"""
+        return (
+            self.segment_count > 1
+            and 0 < self.segment_threshold <= length
+            and (not self.max_size or length <= self.max_size)
+            and (
+                response.status_code == 206
+                or response.headers.get("Accept-Ranges") == "bytes"
+            )
+        )
+
+    def _split_segments(self, length: int) -> list[tuple[int, int]]:
+        """将文件划分为多个字节范围，返回每个分段的起止位置(包含结束位置)"""
+        size = -(-length // self.segment_count)
+        return [
+            (start, min(start + size, length) - 1) for start in range(0, length, size)
+        ]
+
+    async def download_segments(
+        self,
+        client: "AsyncClient",
+        url: str,
+        headers: dict,
+        cache: Path,
+        actual: Path,
+        show: str,
+        id_: str,
+        length: int,
+        count: SimpleNamespace,
+        progress: Progress,
+    ) -> bool:
+        """多个连接并行下载文件分段，写入预分配缓存文件的对应位置"""
+        task_id = progress.add_task(
+            beautify_string(show, self.truncate),
+            total=length,
+        )
+        with cache.open("wb") as f:
+            f.truncate(length)
+        results = await gather(
+            *(
+                self.__download_segment(
+                    client,
+                    url,
+                    headers,
+                    cache,
+                    start,
+                    end,
+                    progress,
+                    task_id,
+                )
+                for start, end in self._split_segments(length)
+            ),
+            return_exceptions=True,
+        )
+        progress.remove_task(task_id)
+        if not all(i is True for i in results) or cache.stat().st_size != length:
+            self.log.warning(
+                _("{show} 分段下载失败，错误信息：{error}").format(
+                    show=show,
+                    error=[i for i in results if i is not True],
+                )
+            )
+            self.delete(cache)
+            await self.recorder.delete_id(id_)
+            return False
+        self.save_file(cache, actual)
+        self.log.info(_("{show} 文件下载成功").format(show=show))
+        self.log.info(f"文件路径 {actual.resolve()}", False)
+        await self.recorder.update_id(id_)
+        self.add_count(show, id_, count)
+        return True
+
+    async def __download_segment(
+        self,
+        client: "AsyncClient",
+        url: str,
+        headers: dict,
+        cache: Path,
+        start: int,
+        end: int,
+        progress: Progress,
+        task_id,
+    ) -> bool:
+        async with client.stream(
+            "GET",
+            url,
+            headers=headers | {"Range": f"bytes={start}-{end}"},
+        ) as response:
+            if response.status_code != 206:
+                return False
+            position = start
+            async with open(cache, "r+b") as f:
+                await f.seek(start)
+                async for chunk in response.aiter_bytes(self.chunk):
+                    if position + len(chunk) > end + 1:
+                        return False
+                    await f.write(chunk)
+                    position += len(chunk)
+                    progress.update(task_id, advance=len(chunk))
+        return position == end + 1
+
     def __record_request_messages(
         self,
         show: str,
@@ -1,3 +1,5 @@
+from hashlib import algorithms_available, new
+from operator import xor
 from random import choice, randint, random
 from re import compile
 from time import time
@@ -7,11 +9,26 @@ from gmssl import func, sm3
 
 from src.custom import USERAGENT
 
+from .rc4 import keystream
+
 __all__ = [
     "ABogus",
+    "sm3_digest",
 ]
 
 
+def sm3_digest_openssl(data: bytes) -> bytes:
+    return new("sm3", data).digest()
+
+
+def sm3_digest_gmssl(data: bytes) -> bytes:
+    return bytes.fromhex(sm3.sm3_hash(func.bytes_to_list(data)))
+
+
+# 优先使用 OpenSSL 提供的 SM3 实现，不可用时使用 gmssl 纯 Python 实现
+sm3_digest = sm3_digest_openssl if "sm3" in algorithms_available else sm3_digest_gmssl
+
+
 class ABogus:
     __filter = compile(r"%([0-9A-F]{2})")
     __arguments = [0, 1, 14]
@@ -36,6 +53,8 @@ class ABogus:
         "s3": "ckdp1h4ZKsUB80/Mfvw36XIgR25+WQAlEi7NLboqYTOPuzmFjJnryx9HVGDaStCe",
         "s4": "Dkdpgh2ZmsQB80/MfvV36XI1R45-WUAlEixNLwoqYTOPuzKFjJnry79HbGcaStCe",
     }
+    __ua_codes = {}  # 缓存 user_agent 对应的 UA 编码
+    __method_codes = {}  # 缓存请求方法对应的编码
 
     def __init__(
         self,
@@ -45,7 +64,9 @@ class ABogus:
         self.chunk = []
         self.size = 0
         self.reg = self.__reg[:]
-        self.ua_code = self.generate_ua_code(user_agent)
+        if user_agent not in self.__ua_codes:
+            self.__ua_codes[user_agent] = self.generate_ua_code(user_agent)
+        self.ua_code = self.__ua_codes[user_agent]
         self.browser = (
             self.generate_browser_info(platform) if platform else self.__browser
         )
@@ -498,7 +519,11 @@ class ABogus:
         return [int(i) & 255 for i in a]
 
     def generate_method_code(self, method: str = "GET") -> list[int]:
-        return self.sm3_to_array(self.sm3_to_array(method + self.__end_string))
+        if method not in self.__method_codes:
+            self.__method_codes[method] = self.sm3_to_array(
+                self.sm3_to_array(method + self.__end_string)
+            )
+        return self.__method_codes[method]
         # return self.sum(self.sum(method + self.__end_string))
 
     def generate_params_code(self, params: str) -> list[int]:
@@ -525,11 +550,7 @@ class ABogus:
         else:
             b = bytes(data)  # 将 List[int] 转换为字节数组
 
-        # 将字节数组转换为适合 sm3.sm3_hash 函数处理的列表格式
-        h = sm3.sm3_hash(func.bytes_to_list(b))
-
-        # 将十六进制字符串结果转换为十进制整数列表
-        return [int(h[i : i + 2], 16) for i in range(0, len(h), 2)]
+        return list(sm3_digest(b))
 
     @classmethod
     def generate_browser_info(cls, platform: str = "Win32") -> str:
@@ -561,26 +582,10 @@ class ABogus:
         return "|".join(str(i) for i in value_list)
 
     @staticmethod
-    def rc4_encrypt(plaintext, key):
-        s = list(range(256))
-        j = 0
-
-        for i in range(256):
-            j = (j + s[i] + ord(key[i % len(key)])) % 256
-            s[i], s[j] = s[j], s[i]
-
-        i = 0
-        j = 0
-        cipher = []
-
-        for k in range(len(plaintext)):
-            i = (i + 1) % 256
-            j = (j + s[i]) % 256
-            s[i], s[j] = s[j], s[i]
-            t = (s[i] + s[j]) % 256
-            cipher.append(chr(s[t] ^ ord(plaintext[k])))
-
-        return "".join(cipher)
+    def rc4_encrypt(plaintext: str, key: str) -> str:
+        # 明文可能包含大于 255 的字符，逐字符异或以保留高位
+        stream = keystream(key.encode("latin-1"), len(plaintext))
+        return "".join(map(chr, map(xor, map(ord, plaintext), stream)))
 
     def get_value(
         self,
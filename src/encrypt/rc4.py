@@ -0,0 +1,36 @@
+from functools import lru_cache
+
+__all__ = ["key_schedule", "keystream", "rc4_xor"]
+
+
+@lru_cache(maxsize=64)
+def key_schedule(key: bytes) -> bytes:
+    """计算 RC4 密钥调度后的 S 盒，相同密钥只计算一次"""
+    s = list(range(256))
+    j = 0
+    for i in range(256):
+        j = (j + s[i] + key[i % len(key)]) & 255
+        s[i], s[j] = s[j], s[i]
+    return bytes(s)
+
+
+@lru_cache(maxsize=256)
+def keystream(key: bytes, length: int) -> bytes:
+    """生成指定长度的 RC4 密钥流，固定密钥与长度的密钥流会被缓存"""
+    s = bytearray(key_schedule(key))
+    result = bytearray(length)
+    i = j = 0
+    for k in range(length):
+        i = (i + 1) & 255
+        j = (j + s[i]) & 255
+        s[i], s[j] = s[j], s[i]
+        result[k] = s[(s[i] + s[j]) & 255]
+    return bytes(result)
+
+
+def rc4_xor(key: bytes, data: bytes) -> bytes:
+    """使用 RC4 密钥流加密或解密数据"""
+    length = len(data)
+    return (
+        int.from_bytes(data, "big") ^ int.from_bytes(keystream(key, length), "big")
+    ).to_bytes(length, "big")
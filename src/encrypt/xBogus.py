@@ -4,6 +4,7 @@ from time import time
 from urllib.parse import quote, urlencode
 
 from ..custom import USERAGENT
+from .rc4 import rc4_xor
 
 __all__ = ["XBogus", "XBogusTikTok"]
 
@@ -17,6 +18,7 @@ class XBogus:
         + list(range(10, 16))
     )
     __canvas = 3873194319
+    __ua_arrays = {}  # 缓存 (user_agent, params) 对应的 UA 数组
 
     @staticmethod
     def disturb_array(a, b, e, d, c, f, t, n, o, i, r, _, x, u, s, l, v, h, g):
@@ -78,27 +80,8 @@ class XBogus:
         return chr(a) + chr(b) + c
 
     @staticmethod
-    def generate_garbled_3(a, b):
-        d = list(range(256))
-        c = 0
-        f = ""
-        for a_idx in range(256):
-            d[a_idx] = a_idx
-        for b_idx in range(256):
-            c = (c + d[b_idx] + ord(a[b_idx % len(a)])) % 256
-            e = d[b_idx]
-            d[b_idx] = d[c]
-            d[c] = e
-        t = 0
-        c = 0
-        for b_idx in range(len(b)):
-            t = (t + 1) % 256
-            c = (c + d[t]) % 256
-            e = d[t]
-            d[t] = d[c]
-            d[c] = e
-            f += chr(ord(b[b_idx]) ^ d[(d[t] + d[c]) % 256])
-        return f
+    def generate_garbled_3(a: str, b: str) -> str:
+        return rc4_xor(a.encode("latin-1"), b.encode("latin-1")).decode("latin-1")
 
     def calculate_md5(self, input_string):
         if isinstance(input_string, str):
@@ -133,31 +116,16 @@ class XBogus:
         return "".join([self.__string[i] for i in string])
 
     @staticmethod
-    def handle_ua(a, b):
-        d = list(range(256))
-        c = 0
-        result = bytearray(len(b))
-
-        for i in range(256):
-            c = (c + d[i] + ord(a[i % len(a)])) % 256
-            d[i], d[c] = d[c], d[i]
-
-        t = 0
-        c = 0
-
-        for i in range(len(b)):
-            t = (t + 1) % 256
-            c = (c + d[t]) % 256
-            d[t], d[c] = d[c], d[t]
-            result[i] = b[i] ^ d[(d[t] + d[c]) % 256]
-
-        return result
+    def handle_ua(a: list[str], b: bytes) -> bytes:
+        return rc4_xor("".join(a).encode("latin-1"), b)
 
     def generate_ua_array(self, user_agent: str, params: int) -> list:
-        ua_key = ["\u0000", "\u0001", chr(params)]
-        value = self.handle_ua(ua_key, user_agent.encode("utf-8"))
-        value = b64encode(value)
-        return list(md5(value).digest())
+        if (key := (user_agent, params)) not in self.__ua_arrays:
+            ua_key = ["\u0000", "\u0001", chr(params)]
+            value = self.handle_ua(ua_key, user_agent.encode("utf-8"))
+            value = b64encode(value)
+            self.__ua_arrays[key] = list(md5(value).digest())
+        return self.__ua_arrays[key]
 
     def generate_x_bogus(
         self, query: list, params: int, user_agent: str, timestamp: int
@@ -0,0 +1,31 @@
+from functools import lru_cache
+
+__all__ = ["compile_path", "extract_path"]
+
+
+@lru_cache(maxsize=None)
+def compile_path(path: str) -> tuple[str | int, ...] | None:
+    """将 video.bit_rate[0].play_addr 形式的路径解析为键与索引组成的元组并缓存，索引无效时返回 None"""
+    steps = []
+    for attribute in path.split("."):
+        if "[" in attribute:
+            key, index = attribute.split("[", 1)
+            try:
+                steps.extend((key, int(index.split("]", 1)[0])))
+            except ValueError:
+                return None
+        else:
+            steps.append(attribute)
+    return tuple(steps)
+
+
+def extract_path(data: dict | list, path: str, default=""):
+    """按路径直接读取嵌套的字典与列表数据，路径不存在或值为空时返回默认值"""
+    if (steps := compile_path(path)) is None:
+        return default
+    try:
+        for step in steps:
+            data = data[step]
+    except (KeyError, IndexError, TypeError):
+        return default
+    return data or default
@@ -1,5 +1,10 @@
+from asyncio import gather, get_running_loop
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from json import dumps
+from math import ceil
+from multiprocessing import get_context
 from time import localtime, strftime
 from types import SimpleNamespace
 from typing import TYPE_CHECKING
@@ -14,6 +19,8 @@ from ..custom import (
     COMMENT_IMAGE_LIST_INDEX,
     COMMENT_STICKER_INDEX,
     DYNAMIC_COVER_INDEX,
+    EXTRACT_PROCESS_THRESHOLD,
+    EXTRACT_PROCESS_WORKERS,
     HOT_WORD_COVER_INDEX,
     IMAGE_INDEX,
     IMAGE_TIKTOK_INDEX,
@@ -30,7 +37,8 @@ from ..custom import (
     condition_filter,
 )
 from ..tools import DownloaderError
-from ..translation import _
+from ..translation import _, get_language, switch_language
+from .accessor import extract_path
 
 if TYPE_CHECKING:
     from datetime import date
@@ -40,6 +48,22 @@ if TYPE_CHECKING:
 __all__ = ["Extractor"]
 
 
+class _ShardLogger:
+    """子进程使用的日志记录器，暂存日志内容，由主进程统一输出"""
+
+    def __init__(self):
+        self.records = []
+
+    def info(self, *args, **kwargs):
+        self.records.append(("info", args, kwargs))
+
+    def warning(self, *args, **kwargs):
+        self.records.append(("warning", args, kwargs))
+
+    def error(self, *args, **kwargs):
+        self.records.append(("error", args, kwargs))
+
+
 class Extractor:
     statistics_keys = (
         "digg_count",
@@ -72,6 +96,7 @@ class Extractor:
         "nickname": "author.nickname",
         "mix_title": "mix_info.mix_name",
     }
+    pool: ProcessPoolExecutor | None = None
 
     def __init__(self, params: "Parameter"):
         self.log = params.logger
@@ -126,28 +151,7 @@ class Extractor:
 
         return depth_conversion(data)
 
-    @staticmethod
-    def safe_extract(
-        data: SimpleNamespace | list[SimpleNamespace],
-        attribute_chain: str,
-        default: str | int | list | dict | SimpleNamespace = "",
-    ):
-        attributes = attribute_chain.split(".")
-        for attribute in attributes:
-            if "[" in attribute:
-                parts = attribute.split("[", 1)
-                attribute = parts[0]
-                index = parts[1].split("]", 1)[0]
-                try:
-                    index = int(index)
-                    data = getattr(data, attribute, None)[index]
-                except (IndexError, TypeError, ValueError):
-                    return default
-            else:
-                data = getattr(data, attribute, None)
-                if not data:
-                    return default
-        return data or default
+    safe_extract = staticmethod(extract_path)
 
     async def run(
         self,
@@ -185,7 +189,7 @@ class Extractor:
             earliest=earliest,
             latest=latest,
         )
-        self.__platform_classify_detail(
+        await self.__classify_detail(
             data,
             container,
             tiktok,
@@ -219,7 +223,7 @@ class Extractor:
     def __extract_batch(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         """批量提取作品信息"""
         container.cache = container.template.copy()
@@ -235,7 +239,7 @@ class Extractor:
     def __extract_batch_tiktok(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         """批量提取作品信息"""
         container.cache = container.template.copy()
@@ -251,10 +255,10 @@ class Extractor:
     def __extract_extra_info(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ):
         if e := self.safe_extract(data, "anchor_info"):
-            extra = dumps(e, ensure_ascii=False, indent=2, default=lambda x: vars(x))
+            extra = dumps(e, ensure_ascii=False, indent=2)
         else:
             extra = ""
         item["extra"] = extra
@@ -262,7 +266,7 @@ class Extractor:
     def __extract_extra_info_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ):
         # TODO: 尚未适配 TikTok 额外信息
         item["extra"] = ""
@@ -270,18 +274,18 @@ class Extractor:
     def __extract_commodity_data(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ):
         pass
 
     def __extract_game_data(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ):
         pass
 
-    def __extract_description(self, data: SimpleNamespace) -> str:
+    def __extract_description(self, data: dict) -> str:
         # 2023/11/11: 抖音不再折叠过长的作品描述
         return self.safe_extract(data, "desc")
         # if len(desc := self.safe_extract(data, "desc")) < 107:
@@ -305,7 +309,7 @@ class Extractor:
     def __extract_detail_info(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         item["id"] = self.safe_extract(data, "aweme_id")
         item["desc"] = (
@@ -322,7 +326,7 @@ class Extractor:
     def __extract_detail_info_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         item["id"] = self.safe_extract(data, "id")
         item["desc"] = (
@@ -339,7 +343,7 @@ class Extractor:
     def __classifying_detail(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         # 作品分类
         if images := self.safe_extract(data, "images"):
@@ -354,7 +358,7 @@ class Extractor:
     def __classifying_detail_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         if images := self.safe_extract(data, "imagePost.images"):
             self.__extract_image_info_tiktok(item, data, images)
@@ -368,7 +372,7 @@ class Extractor:
     def __extract_additional_info(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
         tiktok=False,
     ):
         # item["ratio"] = self.safe_extract(data, "video.ratio")
@@ -406,8 +410,8 @@ class Extractor:
     def __extract_image_info(
         self,
         item: dict,
-        data: SimpleNamespace,
-        images: list[SimpleNamespace],
+        data: dict,
+        images: list[dict],
     ) -> None:
         if any(
             self.safe_extract(
@@ -444,7 +448,7 @@ class Extractor:
     def __extract_image_info_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
         images: list,
     ) -> None:
         self.__set_blank_data(
@@ -463,7 +467,7 @@ class Extractor:
     def __set_blank_data(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
         type_=_("图集"),
     ):
         item["type"] = type_
@@ -476,7 +480,7 @@ class Extractor:
     def __extract_video_info(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
         type_=_("视频"),
     ) -> None:
         item["type"] = type_
@@ -493,7 +497,7 @@ class Extractor:
 
     def __classify_slides_item(
         self,
-        item: SimpleNamespace,
+        item: dict,
     ) -> str:
         if self.safe_extract(item, "video"):
             return self.__extract_video_download(
@@ -503,9 +507,9 @@ class Extractor:
 
     def __extract_video_download(
         self,
-        data: SimpleNamespace,
+        data: dict,
     ) -> tuple[int, int, str]:
-        bit_rate: list[SimpleNamespace] = self.safe_extract(
+        bit_rate: list[dict] = self.safe_extract(
             data,
             "video.bit_rate",
             [],
@@ -513,12 +517,12 @@ class Extractor:
         try:
             bit_rate: list[tuple[int, int, int, int, int, list[str]]] = [
                 (
-                    i.FPS,
-                    i.bit_rate,
-                    i.play_addr.data_size,
-                    i.play_addr.height,
-                    i.play_addr.width,
-                    i.play_addr.url_list,
+                    i["FPS"],
+                    i["bit_rate"],
+                    i["play_addr"]["data_size"],
+                    i["play_addr"]["height"],
+                    i["play_addr"]["width"],
+                    i["play_addr"]["url_list"],
                 )
                 for i in bit_rate
             ]
@@ -542,7 +546,7 @@ class Extractor:
                 if bit_rate
                 else (-1, -1, "")
             )
-        except AttributeError:
+        except (KeyError, TypeError):
             self.log.error(
                 f"视频下载地址解析失败: {data}",
                 False,
@@ -566,7 +570,7 @@ class Extractor:
     def __extract_video_info_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
         type_=_("视频"),
     ) -> None:
         item["type"] = type_
@@ -594,9 +598,9 @@ class Extractor:
 
     def __extract_video_download_tiktok(
         self,
-        data: SimpleNamespace,
+        data: dict,
     ) -> tuple[int, int, str]:
-        bitrate_info: list[SimpleNamespace] = self.safe_extract(
+        bitrate_info: list[dict] = self.safe_extract(
             data,
             "video.bitrateInfo",
             [],
@@ -604,11 +608,11 @@ class Extractor:
         try:
             bitrate_info: list[tuple[int, str, int, int, list[str]]] = [
                 (
-                    i.Bitrate,
-                    i.PlayAddr.DataSize,
-                    i.PlayAddr.Height,
-                    i.PlayAddr.Width,
-                    i.PlayAddr.UrlList,
+                    i["Bitrate"],
+                    i["PlayAddr"]["DataSize"],
+                    i["PlayAddr"]["Height"],
+                    i["PlayAddr"]["Width"],
+                    i["PlayAddr"]["UrlList"],
                 )
                 for i in bitrate_info
             ]
@@ -631,7 +635,7 @@ class Extractor:
                 if bitrate_info
                 else (-1, -1, "")
             )
-        except AttributeError:
+        except (KeyError, TypeError):
             self.log.error(
                 f"视频下载地址解析失败: {data}",
                 False,
@@ -666,7 +670,7 @@ class Extractor:
     def __extract_text_extra(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ):
         """作品标签"""
         text = [
@@ -678,7 +682,7 @@ class Extractor:
     def __extract_text_extra_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ):
         """作品标签"""
         text = [
@@ -690,7 +694,7 @@ class Extractor:
     def __extract_cover(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
         has=False,
     ) -> None:
         if has:
@@ -708,7 +712,7 @@ class Extractor:
     def __extract_cover_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
         has=False,
     ) -> None:
         if has:
@@ -722,7 +726,7 @@ class Extractor:
     def __extract_music(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
         tiktok=False,
     ) -> None:
         if music_data := self.safe_extract(data, "music"):
@@ -744,7 +748,7 @@ class Extractor:
         item["music_title"] = title
         item["music_url"] = url
 
-    def __extract_statistics(self, item: dict, data: SimpleNamespace) -> None:
+    def __extract_statistics(self, item: dict, data: dict) -> None:
         data = self.safe_extract(data, "statistics")
         for i in self.statistics_keys:
             item[i] = self.safe_extract(
@@ -756,7 +760,7 @@ class Extractor:
     def __extract_statistics_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         data = self.safe_extract(data, "stats")
         for i, j in enumerate(self.statistics_keys_tiktok):
@@ -769,7 +773,7 @@ class Extractor:
     def __extract_tags(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         if not (t := self.safe_extract(data, "video_tag")):
             item["tag"] = []
@@ -779,7 +783,7 @@ class Extractor:
     def __extract_tags_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         if not (t := self.safe_extract(data, "textExtra")):
             item["tag"] = []
@@ -789,7 +793,7 @@ class Extractor:
     def __extract_account_info(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
         key="author",
     ) -> None:
         data = self.safe_extract(data, key)
@@ -807,7 +811,7 @@ class Extractor:
     def __extract_account_info_tiktok(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
         key="author",
     ) -> None:
         data = self.safe_extract(data, key)
@@ -821,7 +825,7 @@ class Extractor:
     def __extract_nickname_info(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         if container.same:
             container.cache["nickname"] = container.name
@@ -934,14 +938,13 @@ class Extractor:
     ):
         """从多个数据返回对象"""
         for item in data:
-            item = self.generate_data_object(item)
             if id_ == self.safe_extract(item, key):
                 return item
         raise DownloaderError(_("提取账号信息或合集信息失败，请向作者反馈！"))
 
     def __extract_pretreatment_data(
         self,
-        item: SimpleNamespace,
+        item: dict,
         id_: str,
         name: str,
         mark: str,
@@ -962,6 +965,83 @@ class Extractor:
         )
         return id_, name.strip(), mark.strip()
 
+    async def __classify_detail(
+        self,
+        data: list[dict],
+        container: SimpleNamespace,
+        tiktok: bool,
+    ) -> None:
+        """作品数量较多时，将作品数据分片交由子进程提取"""
+        if not EXTRACT_PROCESS_THRESHOLD or len(data) < EXTRACT_PROCESS_THRESHOLD:
+            self.__platform_classify_detail(data, container, tiktok)
+            return
+        size = ceil(len(data) / EXTRACT_PROCESS_WORKERS)
+        fields = {
+            k: v for k, v in vars(container).items() if k not in {"all_data", "cache"}
+        }
+        loop = get_running_loop()
+        try:
+            results = await gather(
+                *[
+                    loop.run_in_executor(
+                        self.get_pool(),
+                        self.extract_shard,
+                        self.date_format,
+                        self.cleaner,
+                        get_language(),
+                        data[i : i + size],
+                        fields,
+                        tiktok,
+                    )
+                    for i in range(0, len(data), size)
+                ]
+            )
+        except BrokenProcessPool:
+            self.shutdown_pool()
+            self.__platform_classify_detail(data, container, tiktok)
+            return
+        for all_data, records in results:
+            container.all_data.extend(all_data)
+            for level, args, kwargs in records:
+                getattr(self.log, level)(*args, **kwargs)
+
+    @classmethod
+    def extract_shard(
+        cls,
+        date_format: str,
+        cleaner,
+        language: str,
+        data: list[dict],
+        fields: dict,
+        tiktok: bool,
+    ) -> tuple[list[dict], list]:
+        """在子进程中提取分片作品数据，返回提取结果与暂存的日志"""
+        if language != get_language():
+            switch_language(language)
+        extractor = cls.__new__(cls)
+        extractor.log = _ShardLogger()
+        extractor.date_format = date_format
+        extractor.cleaner = cleaner
+        container = SimpleNamespace(all_data=[], cache=None, **fields)
+        extractor.__platform_classify_detail(data, container, tiktok)
+        return container.all_data, extractor.log.records
+
+    @classmethod
+    def get_pool(cls) -> ProcessPoolExecutor:
+        if not cls.pool:
+            # 主进程存在事件循环与其他线程，使用 spawn 避免 fork 复制锁状态导致子进程死锁
+            cls.pool = ProcessPoolExecutor(
+                EXTRACT_PROCESS_WORKERS,
+                mp_context=get_context("spawn"),
+            )
+        return cls.pool
+
+    @classmethod
+    def shutdown_pool(cls) -> None:
+        if cls.pool:
+            cls.pool.shutdown(wait=False, cancel_futures=True)
+            cls.pool = None
+
     def __platform_classify_detail(
         self,
         data: list[dict],
@@ -972,7 +1052,7 @@ class Extractor:
             [
                 self.__extract_batch_tiktok(
                     container,
-                    self.generate_data_object(item),
+                    item,
                 )
                 for item in data
             ]
@@ -980,7 +1060,7 @@ class Extractor:
             [
                 self.__extract_batch(
                     container,
-                    self.generate_data_object(item),
+                    item,
                 )
                 for item in data
             ]
@@ -999,7 +1079,7 @@ class Extractor:
             cache=None,
             same=False,
         )
-        self.__platform_classify_detail(
+        await self.__classify_detail(
             data,
             container,
             tiktok,
@@ -1032,10 +1112,7 @@ class Extractor:
         if source:
             container.all_data = data
         else:
-            [
-                self.__extract_comments_data(container, self.generate_data_object(i))
-                for i in data
-            ]
+            [self.__extract_comments_data(container, i) for i in data]
             container.all_data = self.__clean_extract_data(
                 container.all_data, self.comment_necessary_keys
             )
@@ -1045,7 +1122,7 @@ class Extractor:
     def __extract_comments_data(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
     ):
         container.cache = container.template.copy()
         container.cache["create_timestamp"] = self.safe_extract(data, "create_time")
@@ -1080,7 +1157,6 @@ class Extractor:
             cache=None,
         )
         for item in data:
-            item = cls.generate_data_object(item)
             container.cache = {
                 "reply_comment_total": cls.safe_extract(
                     item,
@@ -1106,21 +1182,15 @@ class Extractor:
     ) -> list[dict]:
         container = SimpleNamespace(all_data=[])
         if tiktok:
-            [
-                self.__extract_live_data_tiktok(container, self.generate_data_object(i))
-                for i in data
-            ]
+            [self.__extract_live_data_tiktok(container, i) for i in data]
         else:
-            [
-                self.__extract_live_data(container, self.generate_data_object(i))
-                for i in data
-            ]
+            [self.__extract_live_data(container, i) for i in data]
         return container.all_data
 
     def __extract_live_data(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
     ):
         if data := self.safe_extract(
             data, f"data.data[{LIVE_DATA_INDEX}]"
@@ -1129,19 +1199,15 @@ class Extractor:
                 "status": self.safe_extract(data, "status"),
                 "nickname": self.safe_extract(data, "owner.nickname"),
                 "title": self.safe_extract(data, "title"),
-                "flv_pull_url": vars(
-                    self.safe_extract(
-                        data,
-                        "stream_url.flv_pull_url",
-                        SimpleNamespace(),
-                    )
+                "flv_pull_url": self.safe_extract(
+                    data,
+                    "stream_url.flv_pull_url",
+                    {},
                 ),
-                "hls_pull_url_map": vars(
-                    self.safe_extract(
-                        data,
-                        "stream_url.hls_pull_url_map",
-                        SimpleNamespace(),
-                    )
+                "hls_pull_url_map": self.safe_extract(
+                    data,
+                    "stream_url.hls_pull_url_map",
+                    {},
                 ),
                 "cover": self.safe_extract(data, f"cover.url_list[{LIVE_COVER_INDEX}]"),
                 "total_user_str": self.safe_extract(data, "stats.total_user_str"),
@@ -1152,7 +1218,7 @@ class Extractor:
     def __extract_live_data_tiktok(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
     ):
         data = self.safe_extract(data, "data")
         live_data = {
@@ -1165,7 +1231,7 @@ class Extractor:
             "display_id": self.safe_extract(data, "owner.display_id"),
             "title": self.safe_extract(data, "title"),
             "user_count": self.safe_extract(data, "user_count"),
-            "flv_pull_url": vars(self.safe_extract(data, "stream_url.flv_pull_url")),
+            "flv_pull_url": self.safe_extract(data, "stream_url.flv_pull_url", {}),
             "message": self.safe_extract(data, "message"),
             "prompts": self.safe_extract(data, "prompts"),
         }
@@ -1184,10 +1250,7 @@ class Extractor:
                 "collection_time": datetime.now().strftime(self.date_format),
             },
         )
-        [
-            self.__extract_user_data(container, self.generate_data_object(i))
-            for i in data
-        ]
+        [self.__extract_user_data(container, i) for i in data]
         container.all_data = self.__clean_extract_data(
             container.all_data, self.user_necessary_keys
         )
@@ -1197,7 +1260,7 @@ class Extractor:
     def __extract_user_data(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
     ):
         container.cache = container.template.copy()
         container.cache["avatar"] = self.safe_extract(
@@ -1275,17 +1338,14 @@ class Extractor:
             },
             same=False,
         )
-        [
-            self.__search_result_classify(container, self.generate_data_object(i))
-            for i in data
-        ]
+        [self.__search_result_classify(container, i) for i in data]
         await self.__record_data(recorder, container.all_data)
         return container.all_data
 
     def __search_result_classify(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
     ):
         if d := self.safe_extract(data, "aweme_info"):
             self.__extract_batch(container, d)
@@ -1316,19 +1376,14 @@ class Extractor:
                 "collection_time": datetime.now().strftime(self.date_format),
             },
         )
-        [
-            self.__deal_search_user_live(
-                container, self.generate_data_object(i["user_info"])
-            )
-            for i in data
-        ]
+        [self.__deal_search_user_live(container, i["user_info"]) for i in data]
         await self.__record_data(recorder, container.all_data)
         return container.all_data
 
     def __deal_search_user_live(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
         user=True,
     ):
         if user:
@@ -1370,14 +1425,14 @@ class Extractor:
                 "collection_time": datetime.now().strftime(self.date_format),
             },
         )
-        [self.__deal_search_live(container, self.generate_data_object(i)) for i in data]
+        [self.__deal_search_live(container, i) for i in data]
         await self.__record_data(recorder, container.all_data)
         return container.all_data
 
     def __deal_search_live(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
     ):
         container.cache = container.template.copy()
         self.__deal_search_user_live(
@@ -1393,11 +1448,11 @@ class Extractor:
         tiktok: bool,
     ) -> list[dict]:
         all_data = []
-        [self.__deal_hot_data(all_data, self.generate_data_object(i)) for i in data]
+        [self.__deal_hot_data(all_data, i) for i in data]
         await self.__record_data(recorder, all_data)
         return all_data
 
-    def __deal_hot_data(self, container: list, data: SimpleNamespace):
+    def __deal_hot_data(self, container: list, data: dict):
         cache = {
             "position": str(self.safe_extract(data, "position", -1)),
             "sentence_id": self.safe_extract(data, "sentence_id"),
@@ -1474,7 +1529,6 @@ class Extractor:
 
     @classmethod
     def extract_mix_id(cls, data: dict) -> str:
-        data = cls.generate_data_object(data)
         return cls.safe_extract(data, "mix_info.mix_id")
 
     def __extract_item_records(self, data: list[dict]):
@@ -1484,7 +1538,6 @@ class Extractor:
 
     @classmethod
     def extract_mix_collect_info(cls, data: list[dict]) -> list[dict]:
-        data = cls.generate_data_object(data)
         return [
             {
                 "title": Extractor.safe_extract(i, "mix_name"),
@@ -1495,7 +1548,6 @@ class Extractor:
 
     @classmethod
     def extract_collects_info(cls, data: list[dict]) -> list[dict]:
-        data = cls.generate_data_object(data)
         return [
             {
                 "name": Extractor.safe_extract(i, "collects_name"),
@@ -1527,7 +1579,7 @@ class Extractor:
         [
             self.__extract_collection_music(
                 container,
-                self.generate_data_object(item),
+                item,
             )
             for item in data
         ]
@@ -1536,7 +1588,7 @@ class Extractor:
     def __extract_collection_music(
         self,
         container: SimpleNamespace,
-        data: SimpleNamespace,
+        data: dict,
     ):
         container.cache = container.template.copy()
         container.cache["id"] = self.safe_extract(data, "id_str")
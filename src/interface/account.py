@@ -25,6 +25,7 @@ class Account(API):
         pages: int = None,
         cursor=0,
         count=18,
+        watermark: dict = None,
         *args,
         **kwargs,
     ):
@@ -38,6 +39,9 @@ class Account(API):
         self.earliest: date = self.check_earliest(earliest)
         self.cursor = cursor
         self.count = count
+        self.watermark = watermark  # 上次同步时获取到的最新作品位置
+        self.complete = False  # 是否已获取上次同步位置之后的全部作品
+        self.page: list[dict] = []
         self.text = _("账号喜欢作品") if self.favorite else _("账号发布作品")
 
     async def run(
@@ -152,13 +156,55 @@ class Account(API):
         self.summary_works()
 
     async def early_stop(self):
-        """如果获取数据的发布日期已经早于限制日期，就不需要再获取下一页的数据了"""
-        if (
+        """如果获取数据的发布日期已经早于限制日期，或者已经获取到上次同步的位置，就不需要再获取下一页的数据了"""
+        if self.reach_watermark():
+            self.finished = self.complete = True
+        elif (
             not self.favorite
             and self.earliest
             > datetime.fromtimestamp(max(int(self.cursor) / 1000, 0)).date()
         ):
+            # 已获取最新作品至最早日期之间的全部作品，未限制最晚日期时可以更新同步位置
             self.finished = True
+            self.complete = self.latest >= date.today()
+
+    def reach_watermark(self) -> bool:
+        """发布作品：当前页作品均不晚于上次同步的最新作品；喜欢作品：当前页包含上次同步的最新作品"""
+        if not self.watermark or not self.page:
+            return False
+        if self.favorite:
+            return any(
+                self.get_position(i)[1] == int(self.watermark["aweme_id"])
+                for i in self.page
+            )
+        mark = (self.watermark["create_time"], int(self.watermark["aweme_id"]))
+        return all(self.get_position(i) <= mark for i in self.page)
+
+    @staticmethod
+    def get_position(item: dict) -> tuple[int, int]:
+        """作品发布时间与作品 ID，兼容抖音与 TikTok 数据格式"""
+        return (
+            int(item.get("create_time") or item.get("createTime") or 0),
+            int(item.get("aweme_id") or item.get("id") or 0),
+        )
+
+    @classmethod
+    def generate_watermark(
+        cls,
+        data: list[dict],
+        tab: str = "post",
+    ) -> dict | None:
+        """获取本次同步的最新作品位置，喜欢作品按喜欢顺序取第一个作品"""
+        if not data:
+            return None
+        create_time, aweme_id = cls.get_position(
+            data[0] if tab == "favorite" else max(data, key=cls.get_position)
+        )
+        return {
+            "aweme_id": str(aweme_id),
+            "create_time": create_time,
+            "max_cursor": create_time * 1000,
+        }
 
     def generate_params(
         self,
@@ -254,8 +300,9 @@ class Account(API):
                 self.finished = True
             else:
                 self.cursor = data_dict[cursor]
+                self.page = d
                 self.append_response(d)
-                self.finished = not data_dict[has_more]
+                self.finished = self.complete = not data_dict[has_more]
         except KeyError:
             if data_dict.get("status_code") == 0:
                 self.log.warning(_("配置文件 cookie 参数未登录，数据获取已提前结束"))
@@ -1,8 +1,8 @@
 from time import time
 from typing import TYPE_CHECKING, Callable, Coroutine, Type, Union
-from urllib.parse import quote, urlencode
+from urllib.parse import quote, urlencode, urlparse
 
-from httpx import AsyncClient, get, post
+from httpx import AsyncClient
 from rich.progress import (
     BarColumn,
     Progress,
@@ -10,11 +10,29 @@ from rich.progress import (
     TimeElapsedColumn,
 )
 
-from ..custom import PROGRESS, USERAGENT, wait
-from ..tools import DownloaderError, FakeProgress, Retry, capture_error_request
+from ..custom import (
+    PROGRESS,
+    REQUEST_RATE_INITIAL,
+    REQUEST_RATE_LIMIT,
+    REQUEST_RATE_MINIMUM,
+    USERAGENT,
+)
+from ..tools import (
+    AdaptiveRateLimiter,
+    DownloaderError,
+    FakeProgress,
+    Retry,
+    SharedProgress,
+    Signer,
+    capture_error_request,
+    current_progress,
+    get_proxy_client,
+)
 from ..translation import _
 
 if TYPE_CHECKING:
+    from asyncio import Queue
+
     from ..config import Parameter
     from ..testers import Params
 
@@ -62,6 +80,12 @@ class API:
         "msToken": "",
     }
     progress_object: Callable
+    limiter = AdaptiveRateLimiter(
+        REQUEST_RATE_INITIAL,
+        REQUEST_RATE_MINIMUM,
+        REQUEST_RATE_LIMIT,
+    )  # 自适应请求速率限制，所有接口共享
+    signer = Signer()  # 请求签名服务，所有接口共享
 
     def __init__(
         self,
@@ -85,6 +109,8 @@ class API:
         self.pages = 99999
         self.cursor = 0
         self.response = []
+        self.queue: "Queue | None" = None
+        self.streamed = 0
         self.finished = False
         self.text = ""
         self.set_temp_cookie(cookie)
@@ -93,6 +119,11 @@ class API:
         if cookie:
             self.headers["Cookie"] = cookie
 
+    def stream(self, queue: "Queue"):
+        """批量获取数据时，每获取一页数据就放入队列，不再累积全部数据"""
+        self.queue = queue
+        return self
+
     def generate_params(
         self,
     ) -> dict:
@@ -194,23 +225,31 @@ class API:
                 _("正在获取{text}数据").format(text=self.text),
                 total=None,
             )
-            while not self.finished and self.pages > 0:
-                progress.update(task_id)
-                await self.run_single(
-                    data_key,
-                    error_text,
-                    cursor,
-                    has_more,
-                    params,
-                    data,
-                    method,
-                    headers,
-                    *args,
-                    **kwargs,
-                )
-                self.pages -= 1
-                if callback:
-                    await callback()
+            try:
+                while not self.finished and self.pages > 0:
+                    progress.update(task_id)
+                    await self.run_single(
+                        data_key,
+                        error_text,
+                        cursor,
+                        has_more,
+                        params,
+                        data,
+                        method,
+                        headers,
+                        *args,
+                        **kwargs,
+                    )
+                    if self.queue is not None and self.response:
+                        self.streamed += len(self.response)
+                        await self.queue.put(self.response)
+                        self.response = []
+                    self.pages -= 1
+                    if callback:
+                        await callback()
+            finally:
+                # 共用进度条时不会随上下文退出而清除，需要移除当前任务
+                progress.remove_task(task_id)
 
     def check_response(
         self,
@@ -251,10 +290,16 @@ class API:
         *args,
         **kwargs,
     ):
-        params = self.deal_url_params(
+        params = await self.deal_url_params(
             params,
             encryption,
         )
+        # 限速键在请求前计算一次，响应后按同一键调整速率
+        key = self.limiter.key(
+            urlparse(url).hostname,
+            (headers or self.headers).get("Cookie", ""),
+        )
+        await self.limiter.acquire(key)
         match (method, bool(self.proxy)):
             case ("GET", False):
                 return await self.request_data_get(
@@ -262,6 +307,7 @@ class API:
                     params,
                     headers or self.headers,
                     finished=finished,
+                    key=key,
                     *args,
                     **kwargs,
                 )
@@ -271,6 +317,7 @@ class API:
                     params,
                     headers or self.headers,
                     finished=finished,
+                    key=key,
                     *args,
                     **kwargs,
                 )
@@ -281,6 +328,7 @@ class API:
                     data,
                     headers or self.headers,
                     finished=finished,
+                    key=key,
                     *args,
                     **kwargs,
                 )
@@ -291,6 +339,7 @@ class API:
                     data,
                     headers or self.headers,
                     finished=finished,
+                    key=key,
                     *args,
                     **kwargs,
                 )
@@ -305,6 +354,7 @@ class API:
         params: str,
         headers: dict,
         finished=False,
+        key: str = None,
         **kwargs,
     ):
         self.__record_request_messages(
@@ -319,7 +369,7 @@ class API:
             headers=headers,
             **kwargs,
         )
-        return await self.__return_response(response)
+        return await self.__return_response(response, key)
 
     @Retry.retry
     @capture_error_request
@@ -329,6 +379,7 @@ class API:
         params: str,
         headers: dict,
         finished=False,
+        key: str = None,
         **kwargs,
     ):
         self.__record_request_messages(
@@ -338,21 +389,27 @@ class API:
             headers,
             **kwargs,
         )
-        response = get(
+        response = await get_proxy_client(
+            self.proxy,
+            self.timeout,
+        ).get(
             f"{url}?{params}",
             headers=headers,
-            proxy=self.proxy,
-            follow_redirects=True,
-            verify=False,
-            timeout=self.timeout,
             **kwargs,
         )
-        return await self.__return_response(response)
+        return await self.__return_response(response, key)
 
     @Retry.retry
     @capture_error_request
     async def request_data_post(
-        self, url: str, params: str, data: dict, headers: dict, finished=False, **kwargs
+        self,
+        url: str,
+        params: str,
+        data: dict,
+        headers: dict,
+        finished=False,
+        key: str = None,
+        **kwargs,
     ):
         self.__record_request_messages(
             url,
@@ -367,12 +424,19 @@ class API:
             headers=headers,
             **kwargs,
         )
-        return await self.__return_response(response)
+        return await self.__return_response(response, key)
 
     @Retry.retry
     @capture_error_request
     async def request_data_post_proxy(
-        self, url: str, params: str, data: dict, headers: dict, finished=False, **kwargs
+        self,
+        url: str,
+        params: str,
+        data: dict,
+        headers: dict,
+        finished=False,
+        key: str = None,
+        **kwargs,
     ):
         self.__record_request_messages(
             url,
@@ -381,31 +445,49 @@ class API:
             headers,
             **kwargs,
         )
-        response = post(
+        response = await get_proxy_client(
+            self.proxy,
+            self.timeout,
+        ).post(
             f"{url}?{params}",
             data=data,
             headers=headers,
-            proxy=self.proxy,
-            follow_redirects=True,
-            verify=False,
-            timeout=self.timeout,
             **kwargs,
         )
-        return await self.__return_response(response)
+        return await self.__return_response(response, key)
 
-    async def __return_response(self, response):
+    async def __return_response(self, response, key: str = None):
         self.log.info(f"Response URL: {response.url}", False)
         self.log.info(f"Response Code: {response.status_code}", False)
         self.log.info(f"Response Headers: {dict(response.headers)}", False)
         # 记录请求体数据会导致日志文件体积过大，仅在必要时记录
         # self.log.info(f"Response Content: {response.content}", False)
+        self.__update_rate(response, key)
         response.raise_for_status()
-        await wait()
         # if response.status_code != 200:
         #     self.log.error(f"请求 {url} 失败，响应码 {response.status_code}")
         #     return
         return response.json()
 
+    def __update_rate(self, response, key: str = None) -> None:
+        """根据响应状态调整请求速率，响应码 429、响应内容为空或触发验证码时降低速率"""
+        if key is None:
+            return
+        if (
+            response.status_code == 429
+            or not response.content
+            or any("bdturing" in i for i in response.headers)
+        ):
+            self.limiter.throttle(key)
+            self.log.warning(
+                _("请求频率过高，已降低请求速率：{rate} 次/秒").format(
+                    rate=self.limiter.rates()[key]
+                ),
+                False,
+            )
+        elif response.is_success:
+            self.limiter.success(key)
+
     def __record_request_messages(
         self,
         url: str,
@@ -422,7 +504,7 @@ class API:
         self.log.info(f"Headers: {desensitize}", False)
         self.log.info(f"Other: {kwargs}", False)
 
-    def deal_url_params(
+    async def deal_url_params(
         self,
         params: dict,
         method="GET",
@@ -433,7 +515,9 @@ class API:
                 params,
                 quote_via=quote,
             )
-            params += f"&a_bogus={self.ab.get_value(params, method)}"
+            params += (
+                f"&a_bogus={await self.signer.sign(self.ab.get_value, params, method)}"
+            )
             return params
         return ""
 
@@ -442,7 +526,7 @@ class API:
     ) -> None:
         self.log.info(
             _("共获取到 {count} 个{text}").format(
-                count=len(self.response), text=self.text
+                count=self.streamed + len(self.response), text=self.text
             )
         )
 
@@ -457,6 +541,8 @@ class API:
             cls.progress_object = cls.__general_progress_object
 
     def __general_progress_object(self):
+        if progress := current_progress.get():
+            return SharedProgress(progress)
         return Progress(
             TextColumn(
                 "[progress.description]{task.description}",
@@ -564,7 +650,7 @@ class APITikTok(API):
             **kwargs,
         )
 
-    def deal_url_params(
+    async def deal_url_params(
         self,
         params: dict,
         number=8,
@@ -576,8 +662,11 @@ class APITikTok(API):
                 quote_via=quote,
             )
             params += f"&X-Bogus={
-                self.xb.get_x_bogus(
-                    params, number, self.headers.get('User-Agent', USERAGENT)
+                await self.signer.sign(
+                    self.xb.get_x_bogus,
+                    params,
+                    number,
+                    self.headers.get('User-Agent', USERAGENT),
                 )
             }"
             return params
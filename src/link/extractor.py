@@ -1,11 +1,12 @@
 from re import compile
 from typing import TYPE_CHECKING, Union
-from urllib.parse import parse_qs, unquote, urlparse
+from urllib.parse import ParseResult, parse_qs, unquote, urlparse
 
 from .requester import Requester
 
 if TYPE_CHECKING:
     from src.config import Parameter
+    from src.manager import Database
 
 __all__ = ["Extractor", "ExtractorTikTok"]
 
@@ -13,61 +14,34 @@ __all__ = ["Extractor", "ExtractorTikTok"]
 class Extractor:
     WEB_RID = compile(r"\\\"webRid\\\":\\\"(\d+?)\\\"")
 
-    account_link = compile(
-        r"\S*?https://www\.douyin\.com/user/([A-Za-z0-9_-]+)(?:\S*?\bmodal_id=(\d{19}))?"
-    )  # 账号主页链接
-    account_share = compile(
-        r"\S*?https://www\.iesdouyin\.com/share/user/(\S*?)\?\S*?"  # 账号主页分享链接
-    )
-
-    detail_id = compile(r"\b(\d{19})\b")  # 作品 ID
-    detail_link = compile(
-        r"\S*?https://www\.douyin\.com/(?:video|note|slides)/([0-9]{19})\S*?"
-    )  # 作品链接
-    detail_share = compile(
-        r"\S*?https://www\.iesdouyin\.com/share/(?:video|note|slides)/([0-9]{19})/\S*?"
-    )  # 作品分享链接
-    detail_short = compile(
-        r"\S*?https://v\.douyin\.com/([A-Za-z0-9_-]+)/?\S*?"
-    )  # 作品短链接
-    detail_search = compile(
-        r"\S*?https://www\.douyin\.com/search/\S+?modal_id=(\d{19})\S*?"
-    )  # 搜索作品链接
-    detail_discover = compile(
-        r"\S*?https://www\.douyin\.com/discover\S*?modal_id=(\d{19})\S*?"
-    )  # 首页作品链接
-
-    mix_link = compile(
-        r"\S*?https://www\.douyin\.com/collection/(\d{19})\S*?"
-    )  # 合集链接
-    mix_share = compile(
-        r"\S*?https://www\.iesdouyin\.com/share/mix/detail/(\d{19})/\S*?"
-    )  # 合集分享链接
-
-    live_link = compile(r"\S*?https://live\.douyin\.com/([0-9]+)\S*?")  # 直播链接
-    live_link_self = compile(r"\S*?https://www\.douyin\.com/follow\?webRid=(\d+)\S*?")
-    live_link_share = compile(
-        r"\S*?https://webcast\.amemv\.com/douyin/webcast/reflow/\S+"
-    )
-    live_short = compile(
-        r"\S*?https://v\.douyin\.com/([A-Za-z0-9_-]+)/?\S*?"
-    )  # 直播间短链接（与作品短链接格式相同）
-
-    channel_link = compile(
-        r"\S*?https://www\.douyin\.com/channel/\d+?\?modal_id=(\d{19})\S*?"
-    )
+    URL = compile(r"https?://[^\s\"<>\\^`{|}，。；！？、【】《》]+")  # 链接分词
+    ID = compile(r"\d{19}")  # 作品 ID 与合集 ID
+    USER = compile(r"[A-Za-z0-9_-]+")  # 账号 sec_user_id 与短链接标识
+    NUMBER = compile(r"\d+")  # 直播间 ID
+
+    link_types = ("detail", "user", "mix", "live", "live_share", "short")
 
     def __init__(
         self,
         params: "Parameter",
         tiktok=False,
+        database: "Database" = None,
     ):
         self.client = params.client_tiktok if tiktok else params.client
         self.log = params.logger
         self.requester = Requester(
             params,
             self.client,
+            database,
+            self.has_id,
         )
+        self.hosts = {
+            "www.douyin.com": self.__classify_web,
+            "www.iesdouyin.com": self.__classify_share,
+            "live.douyin.com": self.__classify_live,
+            "webcast.amemv.com": self.__classify_live_share,
+            "v.douyin.com": self.__classify_short,
+        }
 
     async def run(
         self,
@@ -92,6 +66,81 @@ class Extractor:
                 return text
         raise ValueError
 
+    def has_id(self, url: str) -> bool:
+        """链接是否可以提取作品、账号、合集或直播间 ID"""
+        links = self.classify(url)
+        return any(links[i] for i in ("detail", "user", "mix", "live"))
+
+    def classify(
+        self,
+        text: str,
+    ) -> dict[str, list[str]]:
+        """将文本拆分为链接，按域名与路径分类提取 ID，仅需遍历文本一次"""
+        result = {i: [] for i in self.link_types}
+        for url in self.URL.findall(text):
+            url = urlparse(url)
+            if classify := self.hosts.get(url.hostname):
+                classify(url, result)
+                self.__classify_web_rid(url, result)
+        return result
+
+    def __classify_web(self, url: ParseResult, result: dict[str, list[str]]):
+        match url.path.split("/")[1:3]:
+            case ["video" | "note" | "slides", id_] if self.ID.match(id_):
+                result["detail"].append(id_[:19])
+            case ["user", sec_user_id] if user := self.USER.match(sec_user_id):
+                result["user"].append(user.group())
+                self.__classify_modal(url, result)
+            case ["search" | "channel", _]:
+                self.__classify_modal(url, result)
+            case ["discover", *_]:
+                self.__classify_modal(url, result)
+            case ["collection", id_] if self.ID.match(id_):
+                result["mix"].append(id_[:19])
+
+    def __classify_modal(self, url: ParseResult, result: dict[str, list[str]]):
+        if (id_ := self.__query(url, "modal_id")) and self.ID.match(id_):
+            result["detail"].append(id_[:19])
+
+    def __classify_share(self, url: ParseResult, result: dict[str, list[str]]):
+        match url.path.split("/")[1:5]:
+            case ["share", "video" | "note" | "slides", id_, *_] if self.ID.fullmatch(
+                id_
+            ):
+                result["detail"].append(id_)
+            case ["share", "user", sec_user_id, *_] if sec_user_id:
+                result["user"].append(sec_user_id)
+            case ["share", "mix", "detail", id_] if self.ID.fullmatch(id_):
+                result["mix"].append(id_)
+
+    def __classify_live(self, url: ParseResult, result: dict[str, list[str]]):
+        if room := self.NUMBER.match(url.path[1:]):
+            result["live"].append(room.group())
+
+    def __classify_live_share(self, url: ParseResult, result: dict[str, list[str]]):
+        # 携带 webRid 参数时无需请求分享页面
+        if url.path.startswith("/douyin/webcast/reflow/") and not self.__query(
+            url, "webRid"
+        ):
+            result["live_share"].append(url.geturl())
+
+    def __classify_web_rid(self, url: ParseResult, result: dict[str, list[str]]):
+        """任意已分类域名的链接携带 webRid 参数时提取直播间 ID"""
+        if (
+            (rid := self.__query(url, "webRid"))
+            and self.NUMBER.fullmatch(rid)
+            and rid not in result["live"]
+        ):
+            result["live"].append(rid)
+
+    def __classify_short(self, url: ParseResult, result: dict[str, list[str]]):
+        if self.USER.match(url.path[1:]):
+            result["short"].append(url.geturl())
+
+    @staticmethod
+    def __query(url: ParseResult, key: str) -> str:
+        return parse_qs(url.query).get(key, [""])[0]
+
     async def get_html_data(
         self,
         url: str,
@@ -115,39 +164,29 @@ class Extractor:
         self,
         urls: str,
     ) -> list[str]:
-        link = self.extract_info(self.account_link, urls, 1)
-        share = self.extract_info(self.account_share, urls, 1)
-        return link + share
+        return self.classify(urls)["user"]
 
     def mix(
         self,
         urls: str,
     ) -> tuple[bool, list[str]]:
-        if detail := self.__extract_detail(urls):
+        links = self.classify(urls)
+        if detail := links["detail"]:
             return False, detail
-        link = self.extract_info(self.mix_link, urls, 1)
-        share = self.extract_info(self.mix_share, urls, 1)
-        return (True, m) if (m := link + share) else (None, [])
+        return (True, m) if (m := links["mix"]) else (None, [])
 
     async def __extract_live_with_short(
         self,
         urls: str,
     ) -> list[str]:
-        # 先提取常规直播链接
-        live_link = self.extract_info(self.live_link, urls, 1)
-        live_link_self = self.extract_info(self.live_link_self, urls, 1)
-        live_link_share = self.extract_info(self.live_link_share, urls, 0)
+        links = self.classify(urls)
         live_link_share = [
-            await self.get_html_data(i, self.WEB_RID) for i in live_link_share
+            await self.get_html_data(i, self.WEB_RID) for i in links["live_share"]
         ]
-        
-        # 提取直播间短链接
-        short_matches = self.live_short.finditer(urls)
         short_live_ids = []
-        
+
         # 处理直播间短链接重定向
-        for match in short_matches:
-            short_url = match.group(0)  # 获取完整的匹配URL
+        for short_url in links["short"]:
             try:
                 self.log.info(f"🔗 解析直播间短链接: {short_url}")
                 # 通过重定向获取真实URL
@@ -155,29 +194,23 @@ class Extractor:
                 if real_url:
                     self.log.info(f"📍 重定向到: {real_url}")
                     # 从重定向后的URL中提取直播间ID（支持多种格式）
-                    live_ids = []
-                    live_ids.extend(self.extract_info(self.live_link, real_url, 1))  # live.douyin.com
-                    live_ids.extend(self.extract_info(self.live_link_self, real_url, 1))  # follow?webRid=
-                    
-                    if live_ids:
+                    links_real = self.classify(real_url)
+                    live_ids = links_real["live"] + [
+                        await self.get_html_data(i, self.WEB_RID)
+                        for i in links_real["live_share"]
+                    ]
+                    if live_ids := [i for i in live_ids if i]:
                         short_live_ids.extend(live_ids)
                         self.log.info(f"✅ 提取到直播间ID: {live_ids}")
                     else:
                         self.log.warning(f"❌ 无法从重定向URL提取直播间ID: {real_url}")
-                        # 作为备选方案，尝试从URL中直接提取数字ID
-                        import re
-                        webrid_match = re.search(r'webRid=(\d+)', real_url)
-                        if webrid_match:
-                            backup_id = webrid_match.group(1)
-                            short_live_ids.append(backup_id)
-                            self.log.info(f"🔄 备选方案提取到ID: {backup_id}")
                 else:
                     self.log.warning(f"❌ 短链接重定向失败: {short_url}")
             except Exception as e:
                 self.log.warning(f"❌ 短链接重定向异常: {short_url}, 错误: {e}")
                 continue
-        
-        return live_link + live_link_self + live_link_share + short_live_ids
+
+        return [i for i in links["live"] + live_link_share + short_live_ids if i]
 
     async def live(
         self,
@@ -185,44 +218,26 @@ class Extractor:
     ) -> list[str]:
         return await self.__extract_live_with_short(urls)
 
-    def __extract_detail(
-        self,
-        urls: str,
-    ) -> list[str]:
-        link = self.extract_info(self.detail_link, urls, 1)
-        share = self.extract_info(self.detail_share, urls, 1)
-        account = self.extract_info(self.account_link, urls, 2)
-        search = self.extract_info(self.detail_search, urls, 1)
-        discover = self.extract_info(self.detail_discover, urls, 1)
-        channel = self.extract_info(self.channel_link, urls, 1)
-        return link + share + account + search + discover + channel
-
     async def __extract_detail_with_short(
         self,
         urls: str,
     ) -> list[str]:
-        # 先提取常规链接
-        regular_ids = self.__extract_detail(urls)
-        
-        # 提取短链接
-        short_matches = self.detail_short.finditer(urls)
+        links = self.classify(urls)
         short_ids = []
-        
+
         # 处理短链接重定向
-        for match in short_matches:
-            short_url = match.group(0)  # 获取完整的匹配URL
+        for short_url in links["short"]:
             try:
                 # 通过重定向获取真实URL
                 real_url = await self.requester.request_url(short_url)
                 if real_url:
                     # 从重定向后的URL中提取作品ID
-                    real_ids = self.__extract_detail(real_url)
-                    short_ids.extend(real_ids)
+                    short_ids.extend(self.classify(real_url)["detail"])
             except Exception as e:
                 self.log.warning(f"短链接重定向失败: {short_url}, 错误: {e}")
                 continue
-        
-        return regular_ids + short_ids
+
+        return links["detail"] + short_ids
 
     @staticmethod
     def extract_sec_user_id(urls: list[str]) -> list[list]:
@@ -246,23 +261,20 @@ class ExtractorTikTok(Extractor):
     ROOD_ID = compile(r'"roomId":"(\d+)"')
     MIX_ID = compile(r'"canonical":"\S+?(\d{19})"')
 
-    account_link = compile(r"\S*?(https://www\.tiktok\.com/@[^\s/]+)\S*?")
+    ACCOUNT = compile(r"@[^\s/]+")  # 账号标识
+    MIX = compile(r"(.+?)-(\d{19})")  # 合集标题与合集 ID
 
-    detail_link = compile(
-        r"\S*?https://www\.tiktok\.com/@[^\s/]+/(?!playlist)(?:(?:video|photo)/(\d{19}))?\S*?"
-    )  # 作品链接
+    link_types = ("detail", "detail_link", "user", "mix", "mix_title", "live")
 
-    mix_link = compile(
-        r"\S*?https://www\.tiktok\.com/@\S+/(?:playlist|collection)/(.+?)-(\d{19})\S*?"
-    )  # 合集链接
-
-    live_link = compile(r"\S*?https://www\.tiktok\.com/@[^\s/]+/live\S*?")  # 直播链接
-
-    def __init__(self, params: "Parameter"):
+    def __init__(self, params: "Parameter", database: "Database" = None):
         super().__init__(
             params,
             True,
+            database,
         )
+        self.hosts = {
+            "www.tiktok.com": self.__classify_web,
+        }
 
     async def run(
         self,
@@ -291,43 +303,53 @@ class ExtractorTikTok(Extractor):
                 return text
         raise ValueError
 
+    def __classify_web(self, url: ParseResult, result: dict[str, list[str]]):
+        account, *path = url.path.split("/")[1:]
+        if not self.ACCOUNT.fullmatch(account):
+            return
+        home = f"https://www.tiktok.com/{account}"
+        result["user"].append(home)
+        match path:
+            case ["video" | "photo" as type_, id_, *_] if self.ID.match(id_):
+                result["detail"].append(id_[:19])
+                result["detail_link"].append(f"{home}/{type_}/{id_[:19]}")
+            case ["playlist" | "collection", *rest] if mix := self.MIX.match(
+                "/".join(rest)
+            ):
+                result["mix_title"].append(unquote(mix.group(1)))
+                result["mix"].append(mix.group(2))
+            case ["live", *_]:
+                result["live"].append(f"{home}/live")
+
     async def detail(
         self,
         urls: str,
     ) -> list[str]:
-        return self.__extract_detail(urls)
+        return self.classify(urls)["detail"]
 
     async def user(
         self,
         urls: str,
     ) -> list[str]:
-        link = self.extract_info(self.account_link, urls, 1)
+        link = self.classify(urls)["user"]
         link = [await self.get_html_data(i, self.SEC_UID) for i in link]
         return [i for i in link if i]
 
-    def __extract_detail(
-        self,
-        urls: str,
-        index=1,
-    ) -> list[str]:
-        link = self.extract_info(self.detail_link, urls, index)
-        return link
-
     async def mix(
         self,
         urls: str,
     ) -> tuple[bool, list[str], list[str | None]]:
-        detail = self.__extract_detail(urls, index=0)
-        detail = [await self.get_html_data(i, self.MIX_ID) for i in detail]
+        links = self.classify(urls)
+        detail = [
+            await self.get_html_data(i, self.MIX_ID) for i in links["detail_link"]
+        ]
         detail = [i for i in detail if i]
-        mix = self.extract_info(self.mix_link, urls, 2)
-        title = [unquote(i) for i in self.extract_info(self.mix_link, urls, 1)]
-        return True, detail + mix, [None for _ in detail] + title
+        return True, detail + links["mix"], [None for _ in detail] + links["mix_title"]
 
     async def live(
         self,
         urls: str,
     ) -> list[str]:
-        link = self.extract_info(self.live_link, urls, 0)
+        link = self.classify(urls)["live"]
         link = [await self.get_html_data(i, self.ROOD_ID) for i in link]
         return [i for i in link if i]
@@ -1,14 +1,15 @@
+from asyncio import Semaphore, gather
 from re import compile
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
-from ..custom import BLANK_HEADERS
-from ..custom import wait
-from ..tools import Retry, DownloaderError, capture_error_request
+from ..custom import BLANK_HEADERS, LINK_RESOLVE_CONCURRENCY
+from ..tools import Retry, DownloaderError, capture_error_request, get_proxy_client
 
 if TYPE_CHECKING:
-    from httpx import AsyncClient, get, head
+    from httpx import AsyncClient
 
     from ..config import Parameter
+    from ..manager import Database
 
 __all__ = ["Requester"]
 
@@ -21,32 +22,56 @@ class Requester:
         self,
         params: "Parameter",
         client: "AsyncClient",
+        database: "Database" = None,
+        cacheable: Callable[[str], bool] = None,
     ):
         self.client = client
         self.log = params.logger
         self.max_retry = params.max_retry
         self.timeout = params.timeout
+        self.database = database
+        self.cacheable = cacheable or (lambda url: True)  # 最终链接是否可以缓存
+        self.semaphore = Semaphore(LINK_RESOLVE_CONCURRENCY)
 
     async def run(
         self,
         text: str,
         proxy: str = None,
     ) -> str:
-        urls = self.URL.finditer(text)
+        urls = [i.group() for i in self.URL.finditer(text)]
         if not urls:
             return ""
-        result = []
-        for i in urls:
-            result.append(
-                await self.request_url(
-                    u := i.group(),
-                    proxy=proxy,
-                )
-                or u
-            )
-            await wait()
+        result = await gather(*[self.resolve_url(i, proxy) for i in urls])
         return " ".join(i for i in result if i)
 
+    async def resolve_url(
+        self,
+        url: str,
+        proxy: str = None,
+    ) -> str:
+        """获取链接重定向后的最终链接，优先读取缓存
+        仅缓存响应成功且可以提取 ID 的最终链接，避免长期缓存风控或登录页面的重定向结果"""
+        if self.database and (final := await self.database.read_short_url_data(url)):
+            self.log.info(f"URL: {url} -> {final}", False)
+            return final
+        async with self.semaphore:
+            response = await self.request_url(
+                url,
+                "response",
+                proxy=proxy,
+            )
+        if not response:
+            return url
+        final = str(response.url)
+        if (
+            self.database
+            and final != url
+            and response.is_success
+            and self.cacheable(final)
+        ):
+            await self.database.update_short_url_data(url, final)
+        return final
+
     @Retry.retry
     @capture_error_request
     async def request_url(
@@ -56,16 +81,16 @@ class Requester:
         proxy: str = None,
     ):
         self.log.info(f"URL: {url}", False)
-        match (content in {"url", "headers"}, bool(proxy)):
+        match (content in {"url", "headers", "response"}, bool(proxy)):
             case True, True:
-                response = self.request_url_head_proxy(
+                response = await self.request_url_head_proxy(
                     url,
                     proxy,
                 )
             case True, False:
                 response = await self.request_url_head(url)
             case False, True:
-                response = self.request_url_get_proxy(
+                response = await self.request_url_get_proxy(
                     url,
                     proxy,
                 )
@@ -89,6 +114,8 @@ class Requester:
                 return response.headers
             case "url":
                 return str(response.url)
+            case "response":
+                return response
             case _:
                 raise DownloaderError
 
@@ -100,18 +127,18 @@ class Requester:
             url,
         )
 
-    def request_url_head_proxy(
+    async def request_url_head_proxy(
         self,
         url: str,
         proxy: str,
     ):
-        return head(
+        # HEAD 请求跟随重定向时仅处理 Location 响应头，不下载响应体
+        return await get_proxy_client(
+            proxy,
+            self.timeout,
+        ).head(
             url,
             headers=self.HEADERS,
-            proxy=proxy,
-            follow_redirects=True,
-            verify=False,
-            timeout=self.timeout,
         )
 
     async def request_url_get(
@@ -124,18 +151,17 @@ class Requester:
         response.raise_for_status()
         return response
 
-    def request_url_get_proxy(
+    async def request_url_get_proxy(
         self,
         url: str,
         proxy: str,
     ):
-        response = get(
+        response = await get_proxy_client(
+            proxy,
+            self.timeout,
+        ).get(
             url,
             headers=self.HEADERS,
-            proxy=proxy,
-            follow_redirects=True,
-            verify=False,
-            timeout=self.timeout,
         )
         response.raise_for_status()
         return response
@@ -1,9 +1,13 @@
 from .cache import Cache
 from .database import Database
+from .job import Job, JobManager, current_job
 from .recorder import DownloadRecorder
 
 __all__ = [
     "Cache",
     "DownloadRecorder",
     "Database",
+    "Job",
+    "JobManager",
+    "current_job",
 ]
@@ -1,23 +1,36 @@
-from asyncio import CancelledError
+from asyncio import CancelledError, Lock, Task, create_task, shield, sleep
 from contextlib import suppress
+from itertools import groupby
+from json import dumps, loads
 from shutil import move
+from time import time
 
 from aiosqlite import Row, connect
 
-from ..custom import PROJECT_ROOT
+from ..custom import LIVE_RECORD_RETENTION, PROJECT_ROOT, SHORT_URL_CACHE_TTL
 
 __all__ = ["Database"]
 
 
 class Database:
     __FILE = "DouK-Downloader.db"
+    INSERT_DOWNLOAD_DATA = "INSERT OR IGNORE INTO download_data (ID) VALUES (?);"
+    DELETE_DOWNLOAD_DATA = "DELETE FROM download_data WHERE ID=?;"
 
     def __init__(
         self,
+        batch_size: int = 64,
+        interval: float = 0.5,
     ):
         self.file = PROJECT_ROOT.joinpath(self.__FILE)
         self.database = None
         self.cursor = None
+        self.batch_size = batch_size  # 下载记录累计达到该数量时提交
+        self.interval = interval  # 下载记录最长延迟提交时间，单位：秒
+        self.pending: list[tuple[str, str]] = []  # 待提交的下载记录写入与删除操作
+        self.flush_lock = Lock()
+        self.flush_task: Task | None = None
+        self.history_total: dict[str | None, int] = {}  # 下载历史记录数量缓存
 
     async def __connect_database(self):
         # 确保数据库文件的父目录存在
@@ -47,6 +60,8 @@ class Database:
         await self.__create_table()
         await self.__write_default_config()
         await self.__write_default_option()
+        await self.__clean_short_url_data()
+        await self.__clean_live_recording_data()
         await self.database.commit()
 
     async def __create_table(self):
@@ -81,6 +96,33 @@ class Database:
         tags TEXT,
         download_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );""")
+        await self.database.execute("""CREATE TABLE IF NOT EXISTS sync_data (
+        SEC_USER_ID TEXT NOT NULL,
+        TAB TEXT NOT NULL,
+        AWEME_ID TEXT NOT NULL,
+        CREATE_TIME INTEGER NOT NULL,
+        MAX_CURSOR INTEGER NOT NULL,
+        PRIMARY KEY (SEC_USER_ID, TAB)
+        );""")
+        await self.database.execute("""CREATE TABLE IF NOT EXISTS short_url_data (
+        URL TEXT PRIMARY KEY,
+        FINAL_URL TEXT NOT NULL,
+        TIME INTEGER NOT NULL
+        );""")
+        await self.database.execute("""CREATE TABLE IF NOT EXISTS live_recording_data (
+        ID TEXT PRIMARY KEY,
+        STATUS TEXT NOT NULL,
+        DATA TEXT NOT NULL,
+        TIME INTEGER NOT NULL DEFAULT 0
+        );""")
+        await self.database.execute(
+            """CREATE INDEX IF NOT EXISTS download_history_time
+            ON download_history (download_time DESC, id DESC);"""
+        )
+        await self.database.execute(
+            """CREATE INDEX IF NOT EXISTS download_history_platform_time
+            ON download_history (platform, download_time DESC, id DESC);"""
+        )
 
     async def __write_default_config(self):
         await self.database.execute("""INSERT OR IGNORE INTO config_data (NAME, VALUE)
@@ -133,37 +175,236 @@ class Database:
         )
         return await self.cursor.fetchone()
 
+    async def update_sync_data(
+        self,
+        sec_user_id: str,
+        tab: str,
+        aweme_id: str,
+        create_time: int,
+        max_cursor: int,
+    ):
+        await self.database.execute(
+            "REPLACE INTO sync_data (SEC_USER_ID, TAB, AWEME_ID, CREATE_TIME, "
+            "MAX_CURSOR) VALUES (?,?,?,?,?)",
+            (sec_user_id, tab, aweme_id, create_time, max_cursor),
+        )
+        await self.database.commit()
+
+    async def read_sync_data(self, sec_user_id: str, tab: str):
+        await self.cursor.execute(
+            "SELECT AWEME_ID, CREATE_TIME, MAX_CURSOR FROM sync_data "
+            "WHERE SEC_USER_ID=? AND TAB=?",
+            (sec_user_id, tab),
+        )
+        return await self.cursor.fetchone()
+
+    async def read_short_url_data(self, url: str) -> str | None:
+        """读取未过期的分享链接解析结果"""
+        async with self.database.execute(
+            "SELECT FINAL_URL FROM short_url_data WHERE URL=? AND TIME>?",
+            (url, int(time()) - SHORT_URL_CACHE_TTL),
+        ) as cursor:
+            row = await cursor.fetchone()
+        return row["FINAL_URL"] if row else None
+
+    async def update_short_url_data(self, url: str, final_url: str):
+        await self.database.execute(
+            "REPLACE INTO short_url_data (URL, FINAL_URL, TIME) VALUES (?,?,?)",
+            (url, final_url, int(time())),
+        )
+        await self.database.commit()
+
+    async def __clean_short_url_data(self):
+        await self.database.execute(
+            "DELETE FROM short_url_data WHERE TIME<=?",
+            (int(time()) - SHORT_URL_CACHE_TTL,),
+        )
+
+    async def read_live_recording_data(self) -> list[dict]:
+        async with self.database.execute(
+            "SELECT DATA FROM live_recording_data"
+        ) as cursor:
+            return [loads(i["DATA"]) for i in await cursor.fetchall()]
+
+    async def update_live_recording_data(self, data: dict):
+        await self.database.execute(
+            "REPLACE INTO live_recording_data (ID, STATUS, DATA, TIME) "
+            "VALUES (?,?,?,?)",
+            (
+                data["id"],
+                data["status"],
+                dumps(data, ensure_ascii=False),
+                int(data["finished"] or 0),
+            ),
+        )
+        await self.database.commit()
+
+    async def delete_live_recording_data(self, id_: str):
+        await self.database.execute(
+            "DELETE FROM live_recording_data WHERE ID=?",
+            (id_,),
+        )
+        await self.database.commit()
+
+    async def __clean_live_recording_data(self):
+        """删除超过保留时间的已结束直播录制记录"""
+        await self.database.execute(
+            "DELETE FROM live_recording_data WHERE TIME>0 AND TIME<=?",
+            (int(time()) - LIVE_RECORD_RETENTION,),
+        )
+
+    async def read_download_data(self) -> list[str]:
+        await self.cursor.execute("SELECT ID FROM download_data")
+        return [i["ID"] for i in await self.cursor.fetchall()]
+
     async def has_download_data(self, id_: str) -> bool:
+        await self.flush_download_data()
         await self.cursor.execute("SELECT ID FROM download_data WHERE ID=?", (id_,))
         return bool(await self.cursor.fetchone())
 
     async def write_download_data(self, id_: str):
-        await self.database.execute(
-            "INSERT OR IGNORE INTO download_data (ID) VALUES (?);", (id_,)
-        )
-        await self.database.commit()
+        await self.__queue_download_data(self.INSERT_DOWNLOAD_DATA, (id_,))
 
     async def delete_download_data(self, ids: list | tuple | str):
         if not ids:
             return
         if isinstance(ids, str):
             ids = [ids]
-        [await self.__delete_download_data(i) for i in ids]
-        await self.database.commit()
-
-    async def __delete_download_data(self, id_: str):
-        await self.database.execute("DELETE FROM download_data WHERE ID=?", (id_,))
+        await self.__queue_download_data(self.DELETE_DOWNLOAD_DATA, ids)
 
     async def delete_all_download_data(self):
+        await self.flush_download_data()
         await self.database.execute("DELETE FROM download_data")
         await self.database.commit()
 
+    async def __queue_download_data(self, sql: str, ids: list | tuple):
+        """下载记录写入与删除操作加入队列，累计数量达到上限或等待超时后统一提交"""
+        self.pending.extend((sql, i) for i in ids)
+        if len(self.pending) >= self.batch_size:
+            await self.flush_download_data()
+        elif not self.flush_task or self.flush_task.done():
+            self.flush_task = create_task(self.__delay_flush_download_data())
+            self.flush_task.add_done_callback(self.__consume_flush_error)
+
+    async def __delay_flush_download_data(self):
+        await sleep(self.interval)
+        await shield(self.flush_download_data())
+
+    async def flush_download_data(self):
+        """按队列顺序执行下载记录操作，并在同一事务中提交"""
+        async with self.flush_lock:
+            if not self.pending:
+                return
+            pending, self.pending = self.pending, []
+            savepoint = False
+            try:
+                await self.database.execute("SAVEPOINT download_data;")
+                savepoint = True
+                for sql, group in groupby(pending, key=lambda x: x[0]):
+                    await self.database.executemany(sql, [(i,) for __, i in group])
+                await self.database.execute("RELEASE download_data;")
+                savepoint = False
+                await self.database.commit()
+            except BaseException:
+                # 提交失败时放回队列，下次提交时重试
+                self.pending[:0] = pending
+                if savepoint:
+                    await shield(self.__rollback_download_data())
+                raise
+
+    async def __rollback_download_data(self):
+        """仅回滚本批下载记录操作，保留其他数据表尚未提交的修改"""
+        if self.database.in_transaction:
+            await self.database.execute("ROLLBACK TO download_data;")
+            await self.database.execute("RELEASE download_data;")
+
+    @staticmethod
+    def __consume_flush_error(task: Task) -> None:
+        """后台提交失败的下载记录已放回队列，此处仅取出异常，避免异常未被处理的警告"""
+        if not task.cancelled():
+            task.exception()
+
+    async def write_download_history(
+        self,
+        title: str,
+        author: str,
+        platform: str,
+        download_urls: str,
+        download_type: str = "single",
+        work_id: str = None,
+        thumbnail_url: str = None,
+        duration: str = None,
+        tags: str = None,
+    ) -> int:
+        cursor = await self.database.execute(
+            """INSERT INTO download_history (title, author, platform, download_urls,
+            download_type, work_id, thumbnail_url, duration, tags)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                title,
+                author,
+                platform,
+                download_urls,
+                download_type,
+                work_id,
+                thumbnail_url,
+                duration,
+                tags,
+            ),
+        )
+        await self.database.commit()
+        for key in (None, platform):
+            if key in self.history_total:
+                self.history_total[key] += 1
+        return cursor.lastrowid
+
+    async def read_download_history(
+        self,
+        limit: int,
+        platform: str = None,
+        after: tuple[str, int] = None,
+        offset: int = 0,
+    ) -> list[Row]:
+        """按下载时间倒序读取下载历史，after 为上一页最后一条记录的 (download_time, id)"""
+        conditions, params = [], []
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+        if after:
+            conditions.append("(download_time, id) < (?, ?)")
+            params.extend(after)
+            offset = 0
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        async with self.database.execute(
+            f"""SELECT * FROM download_history {where}
+            ORDER BY download_time DESC, id DESC LIMIT ? OFFSET ?""",
+            (*params, limit, offset),
+        ) as cursor:
+            return list(await cursor.fetchall())
+
+    async def count_download_history(self, platform: str = None) -> int:
+        platform = platform or None
+        if platform not in self.history_total:
+            async with self.database.execute(
+                "SELECT COUNT(*) FROM download_history WHERE platform = ?"
+                if platform
+                else "SELECT COUNT(*) FROM download_history",
+                (platform,) if platform else (),
+            ) as cursor:
+                self.history_total[platform] = (await cursor.fetchone())[0]
+        return self.history_total[platform]
+
     async def __aenter__(self):
         self.compatible()
         await self.__connect_database()
         return self
 
     async def close(self):
+        if self.flush_task and not self.flush_task.done():
+            self.flush_task.cancel()
+            with suppress(CancelledError):
+                await self.flush_task
+        await self.flush_download_data()
         with suppress(CancelledError):
             await self.cursor.close()
         await self.database.close()
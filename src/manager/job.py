@@ -0,0 +1,205 @@
+from asyncio import CancelledError, Queue, Task, create_task, current_task, sleep
+from contextlib import suppress
+from contextvars import ContextVar
+from json import dumps
+from time import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+from uuid import uuid4
+
+__all__ = ["Job", "JobManager", "current_job"]
+
+current_job: ContextVar["Job | None"] = ContextVar("current_job", default=None)
+
+
+class Job:
+    """后台任务，同时实现下载进度条接口，用于统计任务下载的字节数"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable[[], Awaitable[Any]],
+    ):
+        self.id = uuid4().hex
+        self.name = name
+        self.function = function
+        self.status = self.PENDING
+        self.created = time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.result: Any = None
+        self.error = ""
+        self.task: Task | None = None
+        self.files: dict[int, dict] = {}
+        self.__task_id = 0
+
+    @property
+    def done(self) -> bool:
+        return self.status in {self.FINISHED, self.FAILED, self.CANCELLED}
+
+    async def __aenter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def add_task(
+        self,
+        description: str = "",
+        total: int | None = None,
+        completed: int = 0,
+        *args,
+        **kwargs,
+    ) -> int:
+        self.__task_id += 1
+        self.files[self.__task_id] = {
+            "name": description,
+            "total": total or 0,
+            "completed": completed,
+            "finished": False,
+        }
+        return self.__task_id
+
+    def update(
+        self,
+        task_id: int = None,
+        advance: int = 0,
+        *args,
+        **kwargs,
+    ):
+        if file := self.files.get(task_id):
+            file["completed"] += advance
+
+    def remove_task(
+        self,
+        task_id: int = None,
+        *args,
+        **kwargs,
+    ):
+        if file := self.files.get(task_id):
+            file["finished"] = True
+
+    def info(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "total_bytes": sum(i["total"] for i in self.files.values()),
+            "downloaded_bytes": sum(i["completed"] for i in self.files.values()),
+            "files": list(self.files.values()),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """进程内后台任务队列，由固定数量的工作协程执行任务"""
+
+    def __init__(self, max_workers: int = 2, max_history: int = 500):
+        self.max_workers = max_workers
+        self.max_history = max_history  # 保留的已结束任务数量上限
+        self.jobs: dict[str, Job] = {}
+        self.queue: Queue[Job] = Queue()
+        self.workers: list[Task] = []
+
+    def start(self) -> None:
+        if not self.workers:
+            self.workers = [
+                create_task(self.__worker()) for __ in range(self.max_workers)
+            ]
+
+    async def stop(self) -> None:
+        for job in self.jobs.values():
+            self.cancel(job.id)
+        for worker in self.workers:
+            worker.cancel()
+        for worker in self.workers:
+            with suppress(CancelledError):
+                await worker
+        self.workers.clear()
+
+    def submit(
+        self,
+        name: str,
+        function: Callable[[], Awaitable[Any]],
+    ) -> Job:
+        self.__clean_history()
+        job = Job(name, function)
+        self.jobs[job.id] = job
+        self.queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> list[dict]:
+        return [i.info() for i in self.jobs.values()]
+
+    def cancel(self, job_id: str) -> bool:
+        if not (job := self.jobs.get(job_id)) or job.done:
+            return False
+        if job.task:
+            job.task.cancel()
+        else:
+            job.status = Job.CANCELLED
+            job.finished = time()
+        return True
+
+    async def events(
+        self,
+        job_id: str,
+        interval: int | float = 1,
+    ) -> AsyncIterator[str]:
+        """以 Server-Sent Events 格式持续推送任务状态，任务结束后停止推送"""
+        while job := self.jobs.get(job_id):
+            yield f"data: {dumps(job.info(), ensure_ascii=False, default=str)}\n\n"
+            if job.done:
+                return
+            await sleep(interval)
+
+    async def __worker(self) -> None:
+        while True:
+            job = await self.queue.get()
+            if job.status == Job.PENDING:
+                await self.__run(job)
+            self.queue.task_done()
+
+    async def __run(self, job: Job) -> None:
+        job.status = Job.RUNNING
+        job.started = time()
+        token = current_job.set(job)
+        try:
+            job.task = create_task(job.function())
+        finally:
+            current_job.reset(token)
+        try:
+            job.result = await job.task
+            job.status = Job.FINISHED
+        except CancelledError:
+            job.status = Job.CANCELLED
+            if current_task().cancelling():
+                raise
+        except Exception as e:
+            job.status = Job.FAILED
+            job.error = repr(e)
+        finally:
+            job.finished = time()
+
+    def __clean_history(self) -> None:
+        finished = [i for i in self.jobs.values() if i.done]
+        for job in finished[: max(len(finished) - self.max_history, 0)]:
+            del self.jobs[job.id]
@@ -1,3 +1,4 @@
+from asyncio import Lock
 from pathlib import Path
 from platform import system
 from re import compile
@@ -122,26 +123,53 @@ class DownloadRecorder:
         self.switch = switch
         self.console = console
         self.database = database
+        self.index: set[str] | None = None  # 下载记录内存索引
+        self.lock = Lock()
+
+    async def load(self) -> None:
+        """读取全部下载记录并建立内存索引，仅在首次调用时读取数据库"""
+        if not self.switch or self.index is not None:
+            return
+        async with self.lock:
+            if self.index is None:
+                self.index = set(await self.database.read_download_data())
 
     async def has_id(self, id_: str) -> bool:
-        return (
-            await self.database.has_download_data(id_) if self.switch and id_ else False
-        )
+        if not (self.switch and id_):
+            return False
+        await self.load()
+        return id_ in self.index
+
+    async def has_ids(self, ids: list[str]) -> set[str]:
+        """批量判断作品是否存在下载记录，返回存在下载记录的作品 ID"""
+        if not self.switch:
+            return set()
+        await self.load()
+        return self.index.intersection(ids)
 
     async def update_id(self, id_: str):
         if self.switch and id_:
+            await self.load()
             await self.database.write_download_data(id_)
+            self.index.add(id_)
 
     async def delete_id(self, id_: str) -> None:
         if self.switch and id_:
+            await self.load()
             await self.database.delete_download_data(id_)
+            self.index.discard(id_)
 
     async def delete_ids(self, ids: str) -> None:
+        await self.load()
         if ids.upper() == "ALL":
             await self.database.delete_all_download_data()
+            if self.index is not None:
+                self.index.clear()
         else:
             ids = self.__extract_ids(ids)
             await self.database.delete_download_data(ids)
+            if self.index is not None:
+                self.index.difference_update(ids)
 
     def __extract_ids(self, ids: str) -> list[str]:
         ids = ids.split()
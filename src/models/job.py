@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+from .account import Account
+from .base import APIModel
+
+
+class DetailJob(APIModel):
+    detail_ids: list[str]
+    tiktok: bool = False
+
+
+class AccountJob(Account):
+    tiktok: bool = False
+
+
+class FileJob(BaseModel):
+    url: str
+    filename: str | None = None
+    platform: str = "douyin"
+    title: str | None = None
+    author: str | None = None
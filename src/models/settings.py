@@ -90,9 +90,12 @@ class Settings(BaseModel):
     download: bool | None = None
     max_size: int | None = None
     chunk: int | None = None
+    segment_threshold: int | None = None
+    segment_count: int | None = None
     timeout: int | None = None
     max_retry: int | None = None
     max_pages: int | None = None
+    incremental_sync: bool | None = None
     run_command: str | None = None
     ffmpeg: str | None = None
     live_qualities: str | None = None
@@ -1,5 +1,5 @@
 from .cookie import Cookie
-from .ffmpeg import FFMPEG
+from .ffmpeg import FFMPEG, Recording
 from .migrate_folder import MigrateFolder
 
 # from .register import __Register
@@ -12,4 +12,5 @@ __all__ = [
     "DetailTikTokExtractor",
     "DetailTikTokUnofficial",
     "MigrateFolder",
+    "Recording",
 ]
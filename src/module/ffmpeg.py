@@ -1,111 +1,460 @@
+from asyncio import (
+    CancelledError,
+    Event,
+    Semaphore,
+    Task,
+    create_subprocess_exec,
+    create_task,
+    gather,
+    sleep,
+    wait_for,
+)
+from asyncio.subprocess import DEVNULL, PIPE, Process
+from collections import deque
+from contextlib import suppress
+from os import kill, name
 from pathlib import Path
 from shutil import which
-from platform import system
-from subprocess import Popen, run
-from textwrap import dedent
+from signal import SIGTERM
+from time import time
+from typing import Awaitable, Callable
+from uuid import uuid4
 
-__all__ = ["FFMPEG"]
+from ..custom import (
+    LIVE_RECORD_MAX_RESTARTS,
+    LIVE_RECORD_MAX_WORKERS,
+    LIVE_RECORD_RESTART_DELAY,
+    LIVE_RECORD_RETENTION,
+)
+from ..translation import _
 
+__all__ = ["FFMPEG", "Recording"]
 
-class FFMPEG:
-    SYSTEM = system()
-
-    # 常见终端及其执行模板
-    linux_terminal_templates = {
-        # GNOME Terminal (Ubuntu)
-        "gnome-terminal": ["gnome-terminal", "--", "bash", "-c", "{cmd}; exec bash"],
-        # Deepin Terminal
-        "deepin-terminal": ["deepin-terminal", "--", "bash", "-c", "{cmd}; exec bash"],
-        # XFCE4 Terminal (MX Linux 默认)
-        "xfce4-terminal": [
-            "xfce4-terminal",
-            "--hold",
-            "-e",
-            'bash -c "{cmd}; exec bash"',
-        ],
-        # Konsole (KDE)
-        "konsole": ["konsole", "-e", "bash", "-i", "-c", "{cmd}; bash"],
-        # Terminator
-        "terminator": ["terminator", "-x", "bash", "-c", "{cmd}; exec bash"],
-    }
-
-    def __init__(self, path: str):
-        self.path = self.__check_ffmpeg_path(Path(path))
-        self.support = {
-            "Darwin": self.generate_command_darwin,
-            "Linux": self.generate_command_linux,
-            "Windows": self.generate_command_windows,
-        }
-        self.run_command = self.support.get(self.SYSTEM, None)
-        self.state = bool(self.path) if self.run_command else False
 
-    @staticmethod
-    def generate_command_darwin(command: list) -> None:
-        script = dedent(f"""
-                tell application "Terminal"
-                    do script "{" ".join(command).replace('"', '\\"')}"
-                    activate
-                end tell
-                """)
-        Popen(["osascript", "-e", script])
+class Recording:
+    """直播录制任务，记录录制进程状态与 ffmpeg 输出的录制进度"""
 
-    @staticmethod
-    def generate_command_windows(command: list) -> None:
-        Popen(
-            " ".join(
-                [
-                    "start",
-                    "cmd",
-                    "/k",
-                ]
-                + command
-            ),
-            shell=True,
-        )
+    WAITING = "waiting"
+    RECORDING = "recording"
+    RESTARTING = "restarting"
+    FINISHED = "finished"
+    FAILED = "failed"
+    STOPPED = "stopped"
+
+    def __init__(
+        self,
+        url: str,
+        file: str,
+        command: list[str],
+        metadata: dict = None,
+    ):
+        self.id = uuid4().hex
+        self.url = url
+        self.file = file
+        self.files: list[str] = []  # 断线重连后录制的文件分段
+        self.command = command
+        self.metadata = metadata or {}
+        self.status = self.WAITING
+        self.pid: int | None = None
+        self.returncode: int | None = None
+        self.restarts = 0
+        self.created = time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.bitrate = 0.0  # 单位：kbit/s
+        self.duration = 0.0  # 所有分段的录制时长，单位：秒
+        self.size = 0  # 所有分段的文件大小，单位：字节
+        self.speed = ""
+        self.error: deque[str] = deque(maxlen=10)
+        self.process: Process | None = None
+        self.task: Task | None = None
+        self.running = Event()  # 录制进程已启动或录制任务已结束
+        self.stopping = False
+        self.adopted = False  # 程序重启前启动的录制进程
+        self.__segment = {"duration": 0.0, "size": 0}
 
     @classmethod
-    def generate_command_linux(cls, command: list) -> None:
-        # TODO: Linux 系统尚未测试
-        command = " ".join(command)
-        print("ffmpeg command:", command)
-        for term, template in cls.linux_terminal_templates.items():
-            if which(term):
-                # 填充命令并执行
-                filled = [
-                    part.format(cmd=command) if "{cmd}" in part else part
-                    for part in template
-                ]
-                run(
-                    filled,
-                )
+    def restore(cls, data: dict) -> "Recording":
+        recording = cls(
+            data["url"],
+            data["file"],
+            [],
+            data.get("metadata"),
+        )
+        for key in (
+            "id",
+            "files",
+            "status",
+            "pid",
+            "returncode",
+            "restarts",
+            "created",
+            "started",
+            "finished",
+            "bitrate",
+            "duration",
+            "size",
+            "speed",
+        ):
+            setattr(recording, key, data[key])
+        if data["error"]:
+            recording.error.extend(data["error"].splitlines())
+        return recording
+
+    @property
+    def done(self) -> bool:
+        return self.status in {self.FINISHED, self.FAILED, self.STOPPED}
+
+    def next_file(self) -> str:
+        if not self.files:
+            file = self.file
+        else:
+            path = Path(self.file)
+            file = str(path.with_stem(f"{path.stem}_{len(self.files)}"))
+        self.files.append(file)
+        self.duration += self.__segment["duration"]
+        self.size += self.__segment["size"]
+        self.__segment = {"duration": 0.0, "size": 0}
+        return file
+
+    def update(self, line: str) -> None:
+        """解析 ffmpeg -progress 输出的 key=value 进度信息"""
+        key, __, value = line.strip().partition("=")
+        try:
+            match key:
+                case "bitrate":
+                    self.bitrate = float(value.removesuffix("kbits/s"))
+                case "out_time_us":
+                    self.__segment["duration"] = int(value) / 1000000
+                case "total_size":
+                    self.__segment["size"] = int(value)
+                case "speed":
+                    self.speed = value
+        except ValueError:
+            pass
+
+    @property
+    def total_duration(self) -> float:
+        return self.duration + self.__segment["duration"]
+
+    @property
+    def total_size(self) -> int:
+        return self.size + self.__segment["size"]
+
+    def info(self) -> dict:
+        return {
+            "id": self.id,
+            "url": self.url,
+            "file": self.file,
+            "files": self.files,
+            "status": self.status,
+            "pid": self.pid,
+            "returncode": self.returncode,
+            "restarts": self.restarts,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "bitrate": self.bitrate,
+            "duration": self.total_duration,
+            "size": self.total_size,
+            "speed": self.speed,
+            "error": "\n".join(self.error),
+            "metadata": self.metadata,
+        }
+
+
+class FFMPEG:
+    """调用 ffmpeg 录制直播，在后台管理录制进程
+    录制进程异常退出时自动重新录制到新的分段文件，同时录制的直播数量不超过 max_workers
+    录制任务按任务 ID、进程 ID 与文件路径登记，录制状态变化时依次调用 callbacks
+    已结束的录制任务保留 retention 秒后移出登记表"""
+
+    def __init__(
+        self,
+        path: str,
+        max_workers: int = LIVE_RECORD_MAX_WORKERS,
+        max_restarts: int = LIVE_RECORD_MAX_RESTARTS,
+        restart_delay: int | float = LIVE_RECORD_RESTART_DELAY,
+        retention: int | float = LIVE_RECORD_RETENTION,
+    ):
+        self.path = self.__check_ffmpeg_path(Path(path))
+        self.state = bool(self.path)
+        self.max_workers = max_workers
+        self.max_restarts = max_restarts
+        self.restart_delay = restart_delay
+        self.retention = retention
+        self.semaphore = Semaphore(max_workers)
+        self.recordings: dict[str, Recording] = {}
+        self.unfinished: dict[str, Recording] = {}  # 未结束的录制任务
+        self.pids: dict[int, Recording] = {}
+        self.files: dict[str, Recording] = {}
+        self.callbacks: list[Callable[[Recording], Awaitable[None]]] = []
 
     def __check_ffmpeg_path(self, path: Path):
         return self.__check_system_ffmpeg() or self.__check_system_ffmpeg(path)
 
-    def download(self, data: list[tuple], proxy, user_agent):
-        for u, p in data:
-            command = self.__generate_command(
+    def download(
+        self,
+        data: list[tuple],
+        proxy,
+        user_agent,
+    ) -> list[Recording]:
+        return [
+            self.record(
                 u,
                 p,
                 proxy,
                 user_agent,
             )
-            self.run_command(command)
+            for u, p in data
+        ]
+
+    def record(
+        self,
+        url: str,
+        file: str,
+        proxy: str = None,
+        user_agent: str = None,
+        output: list[str] = None,
+        metadata: dict = None,
+    ) -> Recording:
+        """创建录制任务并立即返回，录制进程在后台运行"""
+        self.__clean_history()
+        recording = Recording(
+            url,
+            file,
+            self.__generate_command(
+                url,
+                proxy,
+                user_agent,
+                output,
+            ),
+            metadata,
+        )
+        self.recordings[recording.id] = recording
+        self.unfinished[recording.id] = recording
+        recording.task = create_task(self.__supervise(recording))
+        return recording
+
+    async def restore(self, data: list[dict]) -> None:
+        """恢复程序重启前的录制任务，仍在写入文件的录制进程由后台任务监视直至退出"""
+        for item in data:
+            recording = Recording.restore(item)
+            self.recordings[recording.id] = recording
+            for file in recording.files:
+                self.files[file] = recording
+            if recording.done:
+                recording.running.set()
+                continue
+            if self.__is_alive(recording.pid, recording.files[-1:]):
+                recording.adopted = True
+                recording.status = Recording.RECORDING
+                self.unfinished[recording.id] = recording
+                self.pids[recording.pid] = recording
+                recording.task = create_task(self.__watch(recording))
+            else:
+                recording.status = Recording.FAILED
+                recording.finished = time()
+                recording.error.append(_("程序退出时录制中断"))
+                await self.__notify(recording)
+
+    def get(self, id_: str) -> Recording | None:
+        return self.recordings.get(id_)
+
+    def get_by_pid(self, pid: int) -> Recording | None:
+        return self.pids.get(pid)
+
+    def get_by_file(self, file: str) -> Recording | None:
+        return self.files.get(file)
+
+    def remove_file(self, file: str) -> Recording | None:
+        """已结束录制的文件被删除后移出登记表，全部分段文件均被删除时同时移除并返回该录制任务"""
+        if not (recording := self.files.get(file)) or not recording.done:
+            return None
+        del self.files[file]
+        if any(self.files.get(i) is recording for i in recording.files):
+            return None
+        self.recordings.pop(recording.id, None)
+        return recording
+
+    def list_recordings(self, active=False) -> list[Recording]:
+        return list((self.unfinished if active else self.recordings).values())
+
+    @property
+    def active(self) -> int:
+        return len(self.unfinished)
+
+    async def wait(self, recordings: list[Recording] = None) -> None:
+        recordings = recordings or self.list_recordings(True)
+        await gather(
+            *(i.task for i in recordings if i.task),
+            return_exceptions=True,
+        )
+
+    async def stop(self, id_: str, timeout: int | float = 10) -> bool:
+        """结束录制，ffmpeg 收到 SIGTERM 后会写入文件尾部再退出"""
+        if not (recording := self.recordings.get(id_)) or recording.done:
+            return False
+        recording.stopping = True
+        if recording.process and recording.process.returncode is None:
+            recording.process.terminate()
+            try:
+                await wait_for(recording.process.wait(), timeout)
+            except TimeoutError:
+                recording.process.kill()
+        elif recording.adopted:
+            with suppress(OSError):
+                kill(recording.pid, SIGTERM)
+        elif recording.task:
+            recording.task.cancel()
+        with suppress(CancelledError):
+            await recording.task
+        return True
+
+    async def close(self) -> None:
+        await gather(*(self.stop(i.id) for i in self.list_recordings(True)))
+
+    async def __supervise(self, recording: Recording) -> None:
+        try:
+            async with self.semaphore:
+                await self.__record(recording)
+        except CancelledError:
+            if recording.process and recording.process.returncode is None:
+                recording.process.terminate()
+            recording.status = Recording.STOPPED
+            raise
+        except OSError as e:
+            recording.status = Recording.FAILED
+            recording.error.append(repr(e))
+        finally:
+            recording.process = None
+            recording.finished = time()
+            recording.running.set()
+            self.unfinished.pop(recording.id, None)
+            await self.__notify(recording)
+
+    async def __record(self, recording: Recording) -> None:
+        recording.started = time()
+        while True:
+            recording.status = Recording.RECORDING
+            recording.returncode = await self.__run(recording)
+            if recording.stopping:
+                recording.status = Recording.STOPPED
+                return
+            if not recording.returncode:
+                recording.status = Recording.FINISHED
+                return
+            if recording.restarts >= self.max_restarts:
+                recording.status = Recording.FAILED
+                return
+            recording.restarts += 1
+            recording.status = Recording.RESTARTING
+            await self.__notify(recording)
+            await sleep(self.restart_delay)
+
+    async def __run(self, recording: Recording) -> int:
+        file = recording.next_file()
+        self.files[file] = recording
+        recording.process = process = await create_subprocess_exec(
+            *recording.command,
+            file,
+            stdin=DEVNULL,
+            stdout=PIPE,
+            stderr=PIPE,
+        )
+        recording.pid = process.pid
+        self.pids[process.pid] = recording
+        recording.running.set()
+        await self.__notify(recording)
+        try:
+            await gather(
+                self.__read_progress(process, recording),
+                self.__read_error(process, recording),
+            )
+            return await process.wait()
+        finally:
+            self.pids.pop(process.pid, None)
+
+    async def __watch(self, recording: Recording, interval: int | float = 1) -> None:
+        try:
+            while self.__is_alive(recording.pid):
+                await sleep(interval)
+            recording.status = (
+                Recording.STOPPED if recording.stopping else Recording.FINISHED
+            )
+        except CancelledError:
+            recording.status = Recording.STOPPED
+            raise
+        finally:
+            self.pids.pop(recording.pid, None)
+            recording.finished = time()
+            recording.running.set()
+            self.unfinished.pop(recording.id, None)
+            await self.__notify(recording)
+
+    @staticmethod
+    def __is_alive(pid: int | None, files: list[str] = None) -> bool:
+        """检查进程是否存在，files 不为空时同时要求最近一分钟内写入过文件，避免误判复用的进程 ID"""
+        if not pid or name == "nt":
+            return False
+        try:
+            kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        if files:
+            try:
+                return time() - Path(files[0]).stat().st_mtime < 60
+            except OSError:
+                return False
+        return True
+
+    @staticmethod
+    async def __read_progress(process: Process, recording: Recording) -> None:
+        async for line in process.stdout:
+            recording.update(line.decode(errors="ignore"))
+
+    @staticmethod
+    async def __read_error(process: Process, recording: Recording) -> None:
+        async for line in process.stderr:
+            if line := line.decode(errors="ignore").strip():
+                recording.error.append(line)
+
+    def __clean_history(self) -> None:
+        expired = time() - self.retention
+        for recording in [
+            i
+            for i in self.recordings.values()
+            if i.done and (i.finished or i.created) < expired
+        ]:
+            del self.recordings[recording.id]
+            for file in recording.files:
+                if self.files.get(file) is recording:
+                    del self.files[file]
+
+    async def __notify(self, recording: Recording) -> None:
+        for callback in self.callbacks:
+            await callback(recording)
 
     def __generate_command(
         self,
         url,
-        file,
         proxy,
         user_agent,
+        output: list[str] = None,
     ) -> list:
         command = [
             self.path,
             "-hide_banner",
+            "-nostdin",
+            "-nostats",
+            "-progress",
+            "pipe:1",
             "-rw_timeout",
             f"{30 * 1000 * 1000}",
             "-loglevel",
-            "info",
+            "error",
             "-protocol_whitelist",
             "rtmp,crypto,file,http,https,tcp,tls,udp,rtp,httpproxy",
             "-analyzeduration",
@@ -114,35 +463,39 @@ class FFMPEG:
             f"{10 * 1000 * 1000}",
             "-fflags",
             "+discardcorrupt",
-            "-user_agent",
-            f'"{user_agent}"',
-            "-i",
-            f'"{url}"',
-            "-bufsize",
-            "10240k",
-            "-map",
-            "0",
-            "-c:v",
-            "copy",
-            "-c:a",
-            "copy",
-            "-sn",
-            "-dn",
-            "-reconnect_delay_max",
-            "60",
+            "-reconnect",
+            "1",
             "-reconnect_streamed",
-            "-reconnect_at_eof",
-            "-max_muxing_queue_size",
-            "128",
-            "-correct_ts_overflow",
             "1",
-            "-f",
-            "mp4",
+            "-reconnect_delay_max",
+            "60",
         ]
+        if user_agent:
+            command.extend(("-user_agent", user_agent))
         if proxy:
-            for insert_index, item in enumerate(("-http_proxy", proxy), start=2):
-                command.insert(insert_index, item)
-        command.append(f'"{file}"')
+            command.extend(("-http_proxy", proxy))
+        command.extend(("-i", url))
+        command.extend(
+            output
+            or (
+                "-bufsize",
+                "10240k",
+                "-map",
+                "0",
+                "-c:v",
+                "copy",
+                "-c:a",
+                "copy",
+                "-sn",
+                "-dn",
+                "-max_muxing_queue_size",
+                "128",
+                "-correct_ts_overflow",
+                "1",
+                "-f",
+                "mp4",
+            )
+        )
         return command
 
     @staticmethod
@@ -16,6 +16,7 @@ from rich.progress import (
 
 from ..custom import ERROR, PROGRESS, QRCODE_HEADERS, WARNING
 from ..encrypt import MsToken
+from ..interface import API
 
 # from ..encrypt import VerifyFp
 from ..tools import Retry, cookie_str_to_str
@@ -124,7 +125,10 @@ class __Register:
         # self.url_params["verifyFp"] = self.verify_fp
         # self.url_params["fp"] = self.verify_fp
         await self.__set_ms_token()
-        self.url_params["a_bogus"] = quote(self.ab.get_value(self.url_params), safe="")
+        self.url_params["a_bogus"] = quote(
+            await API.signer.sign(self.ab.get_value, self.url_params),
+            safe="",
+        )
         # self.url_params["X-Bogus"] = self.xb.get_x_bogus(self.url_params)
         data, _, _ = await self.request_data(
             url=self.get_url,
@@ -1,5 +1,4 @@
 from time import strftime, localtime
-from types import SimpleNamespace
 from typing import TYPE_CHECKING
 from typing import Union
 
@@ -93,7 +92,6 @@ class DetailTikTokExtractor:
 
     def run(self, data: dict) -> dict:
         item = {}
-        data = Extractor.generate_data_object(data)
         self.extract_detail_tiktok(item, data)
         self.extract_music_tiktok(item, data)
         self.extract_author_tiktok(item, data)
@@ -103,7 +101,7 @@ class DetailTikTokExtractor:
     def extract_detail_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         item["id"] = Extractor.safe_extract(data, "id")
         item["desc"] = (
@@ -121,7 +119,7 @@ class DetailTikTokExtractor:
     def extract_author_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         item["uid"] = Extractor.safe_extract(data, "author.id")
         item["nickname"] = Extractor.safe_extract(data, "author.nickname")
@@ -130,7 +128,7 @@ class DetailTikTokExtractor:
     def extract_music_tiktok(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         item["music_author"] = Extractor.safe_extract(data, "music_info.author")
         item["music_title"] = Extractor.safe_extract(data, "music_info.title")
@@ -139,7 +137,7 @@ class DetailTikTokExtractor:
     @staticmethod
     def extract_statistics_tiktok(
         item: dict,
-        data: SimpleNamespace,
+        data: dict,
     ) -> None:
         for i in Extractor.statistics_keys:
             item[i] = Extractor.safe_extract(
@@ -7,7 +7,7 @@ from sqlite3 import OperationalError
 from rich.text import Text
 from rich import print
 
-from ..custom import ERROR
+from ..custom import ERROR, SQLITE_BATCH_SIZE, SQLITE_SYNCHRONOUS
 from ..translation import _
 from .sql import BaseSQLLogger
 
@@ -15,7 +15,9 @@ __all__ = ["SQLLogger"]
 
 
 class SQLLogger(BaseSQLLogger):
-    """SQLite 数据库保存数据"""
+    """SQLite 数据库保存数据，数据缓存后批量写入"""
+
+    SYNCHRONOUS = ("OFF", "NORMAL", "FULL", "EXTRA")
 
     def __init__(
         self,
@@ -26,6 +28,8 @@ class SQLLogger(BaseSQLLogger):
         field_keys: tuple,
         old=None,
         name="Download",
+        batch_size: int = SQLITE_BATCH_SIZE,
+        synchronous: str = SQLITE_SYNCHRONOUS,
         *args,
         **kwargs,
     ):
@@ -38,16 +42,27 @@ class SQLLogger(BaseSQLLogger):
         self.title_line = title_line  # 数据表列名
         self.title_type = title_type  # 数据表数据类型
         self.field_keys = field_keys
+        self.batch_size = max(batch_size, 1)  # 单次事务写入的最大数据量
+        self.synchronous = (
+            synchronous.upper() if synchronous.upper() in self.SYNCHRONOUS else "NORMAL"
+        )
+        self.insert_sql = ""
+        self.buffer: list[tuple] = []  # 待写入数据
 
     async def __aenter__(self):
         self.db = await connect(self.path)
+        await self.db.execute("PRAGMA journal_mode=WAL;")
+        await self.db.execute(f"PRAGMA synchronous={self.synchronous};")
         self.cursor = await self.db.cursor()
         await self.update_sheet()
         await self.create()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.db.close()
+        try:
+            await self.flush()
+        finally:
+            await self.db.close()
 
     async def create(self):
         create_sql = f"""CREATE TABLE IF NOT EXISTS {self.name} ({
@@ -55,13 +70,22 @@ class SQLLogger(BaseSQLLogger):
         });"""
         await self.cursor.execute(create_sql)
         await self.db.commit()
-
-    async def _save(self, data, *args, **kwargs):
-        insert_sql = f"""REPLACE INTO {self.name} ({
+        self.insert_sql = f"""REPLACE INTO {self.name} ({
             ", ".join(self.title_line)
         }) VALUES ({", ".join(["?" for _ in self.title_line])});"""
-        await self.cursor.execute(insert_sql, data)
+
+    async def _save(self, data, *args, **kwargs):
+        self.buffer.append(tuple(data))
+        if len(self.buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        """在同一事务中批量写入缓存数据"""
+        if not self.buffer:
+            return
+        await self.cursor.executemany(self.insert_sql, self.buffer)
         await self.db.commit()
+        self.buffer.clear()
 
     async def update_sheet(self):
         old_sheet, new_sheet = self.__clean_sheet_name(self.name)
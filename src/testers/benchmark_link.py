@@ -0,0 +1,42 @@
+from pathlib import Path
+from random import choice, randint, seed
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from types import SimpleNamespace
+
+from src.link import Extractor
+from src.testers.logger import Logger
+
+LINKS = (
+    "https://www.douyin.com/video/{id}",
+    "https://www.iesdouyin.com/share/video/{id}/?region=CN",
+    "https://www.douyin.com/user/MS4wLjABAAAA{id}?modal_id={id}",
+    "https://www.douyin.com/discover?modal_id={id}",
+    "https://www.douyin.com/collection/{id}",
+    "https://live.douyin.com/{id}",
+)
+
+
+def generate_file(path: Path, count: int = 100_000) -> None:
+    seed(0)
+    with path.open("w", encoding="utf-8") as f:
+        for __ in range(count):
+            f.write(
+                f"复制打开抖音 {choice(LINKS).format(id=randint(7 * 10**18, 8 * 10**18))}\n"
+            )
+
+
+if __name__ == "__main__":
+    extractor = Extractor(
+        SimpleNamespace(client=None, logger=Logger(), max_retry=0, timeout=10),
+    )
+    with TemporaryDirectory() as folder:
+        file = Path(folder).joinpath("links.txt")
+        generate_file(file)
+        start = perf_counter()
+        result = extractor.classify(file.read_text(encoding="utf-8"))
+        elapsed = perf_counter() - start
+    print(
+        f"100000 links: {elapsed:.2f}s",
+        {k: len(v) for k, v in result.items()},
+    )
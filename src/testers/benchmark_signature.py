@@ -0,0 +1,31 @@
+from time import perf_counter
+
+from src.custom import USERAGENT
+from src.encrypt import ABogus, XBogus
+
+PARAMS = (
+    "device_platform=webapp&aid=6383&channel=channel_pc_web&sec_user_id="
+    "MS4wLjABAAAA&max_cursor=0&locate_query=false&show_live_replay_strategy=1"
+    "&need_time_list=1&time_list_query=0&whale_cut_token=&cut_version=1"
+    "&count=18&publish_video_strategy_type=2&from_user_page=1"
+)
+
+
+def benchmark(name: str, function, seconds: float = 2, unit="signatures") -> None:
+    count = 0
+    start = perf_counter()
+    while (elapsed := perf_counter() - start) < seconds:
+        function()
+        count += 1
+    print(f"{name}: {count / elapsed:.0f} {unit}/sec")
+
+
+if __name__ == "__main__":
+    ab = ABogus(USERAGENT, "Win32")
+    xb = XBogus()
+    benchmark("a_bogus", lambda: ab.get_value(PARAMS))
+    benchmark("X-Bogus", lambda: xb.get_x_bogus(PARAMS, 8, USERAGENT))
+    string = ab.from_char_code(*range(44)) + ab.browser
+    benchmark("a_bogus rc4", lambda: ab.rc4_encrypt(string, "y"), unit="calls")
+    garbled = "".join(map(chr, range(0, 190, 10)))
+    benchmark("X-Bogus rc4", lambda: xb.generate_garbled_3("ÿ", garbled), unit="calls")
@@ -0,0 +1,43 @@
+from pytest import mark
+
+from src.extract.accessor import compile_path, extract_path
+
+DATA = {
+    "video": {
+        "duration": 0,
+        "bit_rate": [
+            {"play_addr": {"url_list": ["a", "b"]}},
+        ],
+    },
+    "desc": "text",
+}
+
+
+@mark.parametrize(
+    "x, y",
+    [
+        ("desc", ("desc",)),
+        ("video.bit_rate[0].play_addr", ("video", "bit_rate", 0, "play_addr")),
+        ("url_list[-1]", ("url_list", -1)),
+        ("url_list[x]", None),
+    ],
+)
+def test_compile_path(x, y):
+    assert compile_path(x) == y
+
+
+@mark.parametrize(
+    "x, y, z",
+    [
+        ("desc", "", "text"),
+        ("video.bit_rate[0].play_addr.url_list[-1]", "", "b"),
+        ("video.bit_rate[1].play_addr", "", ""),
+        ("video.duration", -1, -1),
+        ("video.missing.key", [], []),
+        ("desc.key", None, None),
+        ("video[0]", "", ""),
+        ("video.bit_rate[x]", "", ""),
+    ],
+)
+def test_extract_path(x, y, z):
+    assert extract_path(DATA, x, y) == z
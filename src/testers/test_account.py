@@ -0,0 +1,83 @@
+from asyncio import run
+from types import SimpleNamespace
+
+from rich.console import Console
+
+from src.interface import API, Account
+from src.testers.logger import Logger
+
+PARAMS = SimpleNamespace(
+    headers={},
+    logger=Logger(),
+    ab=None,
+    xb=None,
+    console=Console(quiet=True),
+    max_retry=0,
+    timeout=10,
+    client=None,
+    max_pages=99999,
+)
+MARK = {"aweme_id": "105", "create_time": 1700000105, "max_cursor": 1700000105000}
+
+
+def page(*ids: int, has_more=True) -> dict:
+    return {
+        "aweme_list": [
+            {"aweme_id": str(i), "create_time": 1700000000 + i} for i in ids
+        ],
+        "max_cursor": (1700000000 + min(ids)) * 1000,
+        "has_more": has_more,
+    }
+
+
+def crawl(responses: list, **kwargs) -> Account:
+    API.init_progress_object(True)
+    account = Account(PARAMS, sec_user_id="MS4wLjABAAAA", **kwargs)
+    responses = iter(responses)
+
+    async def request_data(*args, **kwargs):
+        return next(responses, None)
+
+    async def deal_url_params(*args, **kwargs):
+        return {}
+
+    account.request_data = request_data
+    account.deal_url_params = deal_url_params
+    run(account.run_batch())
+    return account
+
+
+def test_account_complete_at_watermark():
+    assert crawl([page(110, 109), page(105, 104)], watermark=MARK).complete
+    assert crawl([page(110, 105), page(104)], tab="favorite", watermark=MARK).complete
+
+
+def test_account_complete_without_more_pages():
+    assert crawl([page(110, 109), page(108, has_more=False)]).complete
+
+
+def test_account_interrupted():
+    account = crawl([page(110, 109)], tab="favorite", watermark=MARK, pages=2)
+    assert account.finished is False
+    assert account.complete is False
+
+
+def test_account_limited():
+    assert not crawl(
+        [page(110, 109), page(108, 107)], tab="favorite", watermark=MARK, pages=2
+    ).complete
+    assert not crawl(
+        [page(110, 109), page(108, 107)],
+        watermark=MARK,
+        earliest="2023/11/16",
+        latest="2023/11/30",
+    ).complete
+
+
+def test_account_complete_at_earliest():
+    account = crawl(
+        [page(110, 109), page(108, 107)], watermark=MARK, earliest="2023/11/16"
+    )
+    assert account.finished
+    assert account.complete
+    assert len(account.response) == 2
@@ -0,0 +1,82 @@
+from asyncio import run, sleep
+from time import time
+
+from pytest import raises
+
+from src.manager import Database
+
+
+def test_flush_download_data_retry(tmp_path):
+    async def main():
+        database = Database(batch_size=64, interval=0.01)
+        database.file = tmp_path.joinpath("test.db")
+        async with database:
+            executemany = database.database.executemany
+
+            async def fail(*args, **kwargs):
+                database.database.executemany = executemany
+                raise OSError("disk I/O error")
+
+            database.database.executemany = fail
+            await database.write_download_data("1")
+            await database.write_download_data("2")
+            await sleep(0.1)
+            assert database.flush_task.done()
+            assert [i for __, i in database.pending] == ["1", "2"]
+            assert await database.has_download_data("2")
+            return await database.read_download_data()
+
+    assert run(main()) == ["1", "2"]
+
+
+def test_flush_download_data_rollback(tmp_path):
+    async def main():
+        database = Database()
+        database.file = tmp_path.joinpath("test.db")
+        async with database:
+            await database.database.execute(
+                "INSERT INTO mapping_data (ID, NAME, MARK) VALUES (?, ?, ?);",
+                ("id", "name", "mark"),
+            )
+            executemany = database.database.executemany
+
+            async def fail(sql, parameters):
+                await executemany(sql, parameters)
+                raise OSError("disk I/O error")
+
+            database.database.executemany = fail
+            await database.write_download_data("1")
+            with raises(OSError):
+                await database.flush_download_data()
+            database.database.executemany = executemany
+            assert not await database.read_download_data()
+            await database.database.commit()
+            mapping = await database.read_mapping_data("id")
+            await database.flush_download_data()
+            return dict(mapping), await database.read_download_data()
+
+    mapping, data = run(main())
+    assert mapping == {"NAME": "name", "MARK": "mark"}
+    assert data == ["1"]
+
+
+def test_live_recording_data_retention(tmp_path):
+    def connect() -> Database:
+        database = Database()
+        database.file = tmp_path.joinpath("test.db")
+        return database
+
+    async def main():
+        async with connect() as database:
+            for id_, finished in (("old", 1), ("recent", time()), ("active", None)):
+                await database.update_live_recording_data(
+                    {"id": id_, "status": "finished", "finished": finished}
+                )
+        async with connect() as database:
+            data = await database.read_live_recording_data()
+            await database.delete_live_recording_data("recent")
+            return data, await database.read_live_recording_data()
+
+    data, deleted = run(main())
+    assert [i["id"] for i in data] == ["recent", "active"]
+    assert [i["id"] for i in deleted] == ["active"]
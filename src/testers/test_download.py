@@ -0,0 +1,215 @@
+from asyncio import run
+from types import SimpleNamespace
+
+from httpx import AsyncClient, MockTransport, Response
+
+from src.downloader import Downloader
+from src.manager import Database, DownloadRecorder
+from src.module import Recording
+from src.testers.logger import Logger
+from src.testers.test_ffmpeg import fake_ffmpeg
+from src.tools import Cleaner, ColorfulConsole, FakeProgress
+from src.translation import _
+
+
+def downloader(
+    recorder: DownloadRecorder = None,
+    server_mode=True,
+    **kwargs,
+) -> tuple[Downloader, list]:
+    tasks = []
+
+    async def chart(items, *args, **kwargs):
+        tasks.extend(items)
+        return True
+
+    downloader = Downloader(
+        SimpleNamespace(
+            **dict(
+                CLEANER=Cleaner(),
+                client=None,
+                client_tiktok=None,
+                headers_download={},
+                headers_download_tiktok={},
+                logger=Logger(),
+                xb=None,
+                console=None,
+                root=None,
+                folder_name="Download",
+                name_format=["id"],
+                desc_length=64,
+                name_length=128,
+                split="-",
+                folder_mode=False,
+                music=False,
+                dynamic_cover=False,
+                static_cover=False,
+                proxy=None,
+                proxy_tiktok=None,
+                download=True,
+                max_size=0,
+                chunk=1024,
+                segment_threshold=0,
+                segment_count=0,
+                max_retry=0,
+                recorder=recorder,
+                timeout=10,
+                ffmpeg=None,
+                cache=None,
+                truncate=64,
+            )
+            | kwargs
+        ),
+        server_mode=server_mode,
+    )
+    downloader.downloader_chart = chart
+    return downloader, tasks
+
+
+def item(id_: str, type_: str) -> dict:
+    return {
+        "id": id_,
+        "desc": id_,
+        "type": type_,
+        "downloads": f"https://example.com/{id_}",
+        "music_url": "",
+        "static_cover": "",
+        "dynamic_cover": "",
+    }
+
+
+def test_batch_processing_download_record(tmp_path):
+    async def main():
+        database = Database()
+        database.file = tmp_path.joinpath("test.db")
+        async with database:
+            recorder = DownloadRecorder(database, True, None)
+            await recorder.update_id("1")
+            assert await recorder.has_ids(["1", "2", "3"]) == {"1"}
+            queries = []
+            has_ids = recorder.has_ids
+
+            async def record(ids):
+                queries.append(ids)
+                return await has_ids(ids)
+
+            recorder.has_ids = record
+            instance, tasks = downloader(recorder)
+            instance.cache = tmp_path.joinpath("cache")
+            await instance.batch_processing(
+                [item("1", _("视频")), item("2", _("视频"))],
+                tmp_path,
+            )
+            return queries, [i[-2] for i in tasks]
+
+    assert run(main()) == ([["1", "2"]], ["2"])
+
+
+def test_live_recording_background(tmp_path):
+    data = [({"title": "title", "nickname": "nickname"}, None, "https://example.com")]
+
+    async def main(mode: str) -> Recording:
+        ffmpeg = fake_ffmpeg(tmp_path, mode=mode)
+        instance, __ = downloader(
+            server_mode=False,
+            root=tmp_path,
+            console=ColorfulConsole(quiet=True),
+            headers_download={"User-Agent": ""},
+            ffmpeg=ffmpeg,
+        )
+        await instance.run_live(data)
+        recording = ffmpeg.list_recordings()[0]
+        assert not recording.done
+        if mode == "wait":
+            await ffmpeg.close()
+        else:
+            await instance.wait_live()
+        return recording
+
+    assert run(main("wait")).status == Recording.STOPPED
+    assert run(main("")).status == Recording.FINISHED
+
+
+CONTENT = bytes(range(100))
+
+
+def range_handler(requests: list, ranges=True, short=False):
+    async def handler(request):
+        requests.append(request.headers.get("Range"))
+        value = request.headers.get("Range", "").removeprefix("bytes=")
+        if not (ranges and value):
+            return Response(200, content=CONTENT)
+        start, __, end = value.partition("-")
+        start, end = int(start), int(end or len(CONTENT) - 1)
+        content = CONTENT[start : end + 1]
+        if short and start:
+            content = content[:-1]
+        return Response(
+            206,
+            content=content,
+            headers={
+                "Content-Range": f"bytes {start}-{end}/{len(CONTENT)}",
+                "Accept-Ranges": "bytes",
+            },
+        )
+
+    return handler
+
+
+def request_file(tmp_path, handler, threshold=50) -> bool:
+    instance, __ = downloader(
+        DownloadRecorder(None, False, None),
+        client=AsyncClient(transport=MockTransport(handler)),
+        segment_threshold=threshold,
+        segment_count=4,
+    )
+    count = SimpleNamespace(downloaded_video=set())
+    return run(
+        instance.request_file(
+            "https://example.com/video",
+            tmp_path.joinpath("cache.mp4"),
+            tmp_path.joinpath("video.mp4"),
+            f"【{_('视频')}】video",
+            "1",
+            "mp4",
+            count,
+            FakeProgress(),
+        )
+    )
+
+
+def test_split_segments():
+    instance, __ = downloader(segment_count=4)
+    assert instance._split_segments(10) == [(0, 2), (3, 5), (6, 8), (9, 9)]
+    assert instance._split_segments(3) == [(0, 0), (1, 1), (2, 2)]
+
+
+def test_request_file_segments(tmp_path):
+    requests = []
+    assert request_file(tmp_path, range_handler(requests))
+    assert tmp_path.joinpath("video.mp4").read_bytes() == CONTENT
+    assert requests == [
+        "bytes=0-",
+        "bytes=0-24",
+        "bytes=25-49",
+        "bytes=50-74",
+        "bytes=75-99",
+    ]
+
+
+def test_request_file_without_segments(tmp_path):
+    requests = []
+    assert request_file(tmp_path, range_handler(requests, ranges=False))
+    assert tmp_path.joinpath("video.mp4").read_bytes() == CONTENT
+    assert requests == ["bytes=0-"]
+    requests.clear()
+    tmp_path.joinpath("video.mp4").unlink()
+    assert request_file(tmp_path, range_handler(requests), threshold=1000)
+    assert tmp_path.joinpath("video.mp4").read_bytes() == CONTENT
+    assert requests == ["bytes=0-"]
+
+
+def test_request_file_segment_size(tmp_path):
+    assert not request_file(tmp_path, range_handler([], short=True))
+    assert not tmp_path.joinpath("cache.mp4").exists()
+    assert not tmp_path.joinpath("video.mp4").exists()
@@ -0,0 +1,80 @@
+from asyncio import run
+from types import SimpleNamespace
+
+from src.extract import Extractor
+from src.tools import Cleaner
+
+
+class Logger:
+    def __init__(self):
+        self.records = []
+
+    def info(self, *args, **kwargs):
+        self.records.append(("info", args))
+
+    def warning(self, *args, **kwargs):
+        self.records.append(("warning", args))
+
+    def error(self, *args, **kwargs):
+        self.records.append(("error", args))
+
+
+def item(index: int) -> dict:
+    data = {
+        "aweme_id": str(7300000000000000000 + index),
+        "desc": f"desc #tag{index % 3}",
+        "create_time": 1700000000 + index,
+        "author": {
+            "nickname": "nickname",
+            "sec_uid": "MS4wLjABAAAA",
+            "uid": "1",
+        },
+        "statistics": {"digg_count": index, "comment_count": index * 2},
+        "text_extra": [{"hashtag_name": f"tag{index % 3}"}],
+    }
+    if index % 2:
+        data["images"] = [{"url_list": [f"https://example.com/{index}.jpeg"]}]
+    else:
+        data["video"] = {
+            "play_addr": {"uri": str(index), "url_list": []},
+            "duration": index * 1000,
+            "bit_rate": [{"play_addr": {"height": 720, "width": 1280}}],
+        }
+    return data
+
+
+def classify(monkeypatch, data: list[dict], threshold: int) -> tuple[list, list]:
+    monkeypatch.setattr("src.extract.extractor.EXTRACT_PROCESS_THRESHOLD", threshold)
+    logger = Logger()
+    extractor = Extractor(
+        SimpleNamespace(
+            logger=logger,
+            date_format="%Y-%m-%d %H:%M:%S",
+            CLEANER=Cleaner(),
+        )
+    )
+    container = SimpleNamespace(
+        all_data=[],
+        template={"collection_time": "2024-01-01 00:00:00"},
+        cache=None,
+        name="name",
+        mark="mark",
+        same=True,
+        earliest=None,
+        latest=None,
+    )
+    run(extractor._Extractor__classify_detail(data, container, False))
+    return container.all_data, logger.records
+
+
+def test_classify_detail_shard(monkeypatch):
+    data = [item(i) for i in range(10)]
+    try:
+        shard = classify(monkeypatch, data, 4)
+        assert Extractor.pool
+    finally:
+        Extractor.shutdown_pool()
+    single = classify(monkeypatch, data, 0)
+    assert shard == single
+    assert len(shard[0]) == len(data)
+    assert [i[0] for i in shard[1]] == ["error"] * 5
@@ -0,0 +1,136 @@
+from asyncio import run, sleep
+from sys import executable
+
+from src.module import FFMPEG, Recording
+
+FAKE_FFMPEG = """#!{executable}
+import sys
+print("bitrate=1500.5kbits/s\\ntotal_size=4096\\nout_time_us=2000000\\nprogress=end")
+sys.stdout.flush()
+if "{mode}" == "wait":
+    import time
+    time.sleep(60)
+sys.exit({code})
+"""
+
+
+def fake_ffmpeg(tmp_path, mode="", code=0, restarts=0) -> FFMPEG:
+    script = tmp_path.joinpath("ffmpeg")
+    script.write_text(FAKE_FFMPEG.format(executable=executable, mode=mode, code=code))
+    script.chmod(0o755)
+    ffmpeg = FFMPEG("", max_workers=1, max_restarts=restarts, restart_delay=0)
+    ffmpeg.path = str(script)
+    return ffmpeg
+
+
+def record(ffmpeg: FFMPEG, file: str) -> Recording:
+    return ffmpeg.record("https://example.com/live.flv", file)
+
+
+def test_recording_progress(tmp_path):
+    async def main():
+        ffmpeg = fake_ffmpeg(tmp_path)
+        recording = record(ffmpeg, str(tmp_path.joinpath("live.mp4")))
+        await ffmpeg.wait()
+        return recording
+
+    recording = run(main())
+    assert recording.status == Recording.FINISHED
+    assert recording.bitrate == 1500.5
+    assert recording.total_duration == 2
+    assert recording.total_size == 4096
+
+
+def test_recording_restart(tmp_path):
+    async def main():
+        ffmpeg = fake_ffmpeg(tmp_path, code=1, restarts=2)
+        recording = record(ffmpeg, str(tmp_path.joinpath("live.mp4")))
+        await ffmpeg.wait()
+        return recording
+
+    recording = run(main())
+    assert recording.status == Recording.FAILED
+    assert recording.restarts == 2
+    assert [i.rsplit("/", 1)[-1] for i in recording.files] == [
+        "live.mp4",
+        "live_1.mp4",
+        "live_2.mp4",
+    ]
+    assert recording.total_duration == 6
+    assert recording.total_size == 3 * 4096
+
+
+def test_recording_stop(tmp_path):
+    async def main():
+        ffmpeg = fake_ffmpeg(tmp_path, mode="wait")
+        first = record(ffmpeg, str(tmp_path.joinpath("first.mp4")))
+        second = record(ffmpeg, str(tmp_path.joinpath("second.mp4")))
+        await sleep(0.5)
+        assert first.status == Recording.RECORDING
+        assert second.status == Recording.WAITING
+        assert ffmpeg.active == 2
+        assert ffmpeg.get_by_pid(first.pid) is first
+        assert ffmpeg.get_by_file(first.file) is first
+        await ffmpeg.stop(second.id)
+        await ffmpeg.close()
+        return first, second
+
+    first, second = run(main())
+    assert first.status == Recording.STOPPED
+    assert second.status == Recording.STOPPED
+    assert second.pid is None
+
+
+def test_recording_restore(tmp_path):
+    saved = []
+
+    async def save(recording: Recording):
+        saved.append(recording.info())
+
+    async def main():
+        ffmpeg = fake_ffmpeg(tmp_path)
+        ffmpeg.callbacks.append(save)
+        record(ffmpeg, str(tmp_path.joinpath("finished.mp4")))
+        await ffmpeg.wait()
+        file = str(tmp_path.joinpath("interrupted.mp4"))
+        interrupted = saved[0] | {
+            "id": "interrupted",
+            "file": file,
+            "files": [file],
+            "status": Recording.RECORDING,
+        }
+        restored = fake_ffmpeg(tmp_path)
+        restored.callbacks.append(save)
+        await restored.restore([saved[-1], interrupted])
+        return restored
+
+    restored = run(main())
+    finished = restored.get_by_file(str(tmp_path.joinpath("finished.mp4")))
+    assert finished.status == Recording.FINISHED
+    assert finished.total_size == 4096
+    assert restored.get("interrupted").status == Recording.FAILED
+    assert saved[-1]["id"] == "interrupted"
+    assert restored.active == 0
+
+
+def test_recording_registry(tmp_path):
+    async def main():
+        ffmpeg = fake_ffmpeg(tmp_path)
+        first = record(ffmpeg, str(tmp_path.joinpath("first.mp4")))
+        assert ffmpeg.list_recordings(True) == [first]
+        await ffmpeg.wait()
+        assert ffmpeg.active == 0
+        assert ffmpeg.list_recordings(True) == []
+        assert ffmpeg.remove_file(first.file) is first
+        assert ffmpeg.get(first.id) is None
+        ffmpeg.retention = 0
+        second = record(ffmpeg, str(tmp_path.joinpath("second.mp4")))
+        await ffmpeg.wait()
+        record(ffmpeg, str(tmp_path.joinpath("third.mp4")))
+        await ffmpeg.wait()
+        return ffmpeg, second
+
+    ffmpeg, second = run(main())
+    assert ffmpeg.get(second.id) is None
+    assert ffmpeg.get_by_file(second.file) is None
+    assert len(ffmpeg.recordings) == 1
@@ -0,0 +1,95 @@
+from asyncio import Event, run, sleep
+from json import loads
+
+from src.manager import Job, JobManager, current_job
+
+
+async def drain(manager: JobManager) -> None:
+    await manager.queue.join()
+
+
+def test_job_finished_and_failed():
+    async def success():
+        current_job.get().update(current_job.get().add_task("a", 10), 10)
+        return 1
+
+    async def failure():
+        raise ValueError("error")
+
+    async def main():
+        manager = JobManager(2)
+        manager.start()
+        jobs = manager.submit("success", success), manager.submit("failure", failure)
+        await drain(manager)
+        await manager.stop()
+        return jobs
+
+    success_job, failure_job = run(main())
+    assert success_job.status == Job.FINISHED
+    assert success_job.result == 1
+    assert success_job.info()["downloaded_bytes"] == 10
+    assert failure_job.status == Job.FAILED
+    assert "ValueError" in failure_job.error
+
+
+def test_job_cancel():
+    async def main():
+        started = Event()
+
+        async def block():
+            started.set()
+            await sleep(60)
+
+        manager = JobManager(1)
+        manager.start()
+        running = manager.submit("running", block)
+        pending = manager.submit("pending", block)
+        await started.wait()
+        assert manager.cancel(pending.id)
+        assert manager.cancel(running.id)
+        await drain(manager)
+        assert not manager.cancel(running.id)
+        await manager.stop()
+        return running, pending
+
+    running, pending = run(main())
+    assert running.status == Job.CANCELLED
+    assert pending.status == Job.CANCELLED
+    assert pending.started is None
+
+
+def test_job_events():
+    async def task():
+        await sleep(0.05)
+
+    async def main():
+        manager = JobManager(1)
+        manager.start()
+        job = manager.submit("events", task)
+        events = [i async for i in manager.events(job.id, 0.01)]
+        await manager.stop()
+        return events
+
+    events = run(main())
+    assert all(i.startswith("data: ") and i.endswith("\n\n") for i in events)
+    assert loads(events[-1][6:])["status"] == Job.FINISHED
+    assert len(events) > 1
+
+
+def test_job_history():
+    async def task():
+        pass
+
+    async def main():
+        manager = JobManager(1, max_history=2)
+        manager.start()
+        for i in range(5):
+            manager.submit(str(i), task)
+            await drain(manager)
+        manager.submit("last", task)
+        await drain(manager)
+        await manager.stop()
+        return manager
+
+    manager = run(main())
+    assert [i["name"] for i in manager.list_jobs()] == ["3", "4", "last"]
@@ -0,0 +1,55 @@
+from asyncio import run
+from types import SimpleNamespace
+
+from httpx import AsyncClient, MockTransport, Response
+
+from src.interface import API
+from src.testers.logger import Logger
+from src.tools import AdaptiveRateLimiter
+
+
+def test_adaptive_rate_limiter():
+    limiter = AdaptiveRateLimiter(1, 0.2, 2, 0.5, 0.5)
+    key = limiter.key("www.douyin.com", "cookie")
+    assert "cookie" not in key
+    for __ in range(5):
+        limiter.success(key)
+    assert limiter.rates() == {key: 2}
+    for __ in range(5):
+        limiter.throttle(key)
+    assert limiter.rates() == {key: 0.2}
+    limiter.success(limiter.key("www.tiktok.com"))
+    assert limiter.rates()["www.tiktok.com"] == 1.5
+
+
+def test_request_rate_key():
+    async def handler(request):
+        if request.url.host == "www.douyin.com":
+            return Response(302, headers={"Location": "https://www.iesdouyin.com/"})
+        return Response(429)
+
+    async def deal_url_params(*args, **kwargs):
+        return ""
+
+    api = API(
+        SimpleNamespace(
+            headers={"Cookie": "cookie"},
+            logger=Logger(),
+            ab=None,
+            xb=None,
+            console=None,
+            max_retry=0,
+            timeout=10,
+            client=AsyncClient(
+                transport=MockTransport(handler),
+                follow_redirects=True,
+            ),
+            max_pages=99999,
+        )
+    )
+    api.limiter = AdaptiveRateLimiter(1, 0.2, 2, 0.5, 0.5)
+    api.deal_url_params = deal_url_params
+    run(api.request_data("https://www.douyin.com/aweme/v1/web/aweme/detail/"))
+    assert api.limiter.rates() == {
+        api.limiter.key("www.douyin.com", "cookie"): 0.5,
+    }
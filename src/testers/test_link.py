@@ -0,0 +1,89 @@
+from asyncio import run
+from types import SimpleNamespace
+
+from httpx import AsyncClient, MockTransport, Response
+
+from src.link import Extractor, ExtractorTikTok
+from src.testers.logger import Logger
+
+PARAMS = SimpleNamespace(
+    client=None, client_tiktok=None, logger=None, max_retry=0, timeout=10
+)
+
+
+def test_classify():
+    result = Extractor(PARAMS).classify(
+        "看看https://www.douyin.com/video/7300000000000000001，复制 "
+        "https://www.iesdouyin.com/share/video/7300000000000000002/?region=CN "
+        "https://www.douyin.com/user/MS4wLjABAAAA_a-b?modal_id=7300000000000000003 "
+        "https://www.douyin.com/discover?modal_id=7300000000000000004 "
+        "https://www.douyin.com/collection/7300000000000000005 "
+        "https://www.iesdouyin.com/share/mix/detail/7300000000000000006/ "
+        "https://live.douyin.com/123456 https://www.douyin.com/follow?webRid=654321 "
+        "https://v.douyin.com/iAbCdEf/ https://example.com/video/7300000000000000007"
+    )
+    assert result == {
+        "detail": [
+            "7300000000000000001",
+            "7300000000000000002",
+            "7300000000000000003",
+            "7300000000000000004",
+        ],
+        "user": ["MS4wLjABAAAA_a-b"],
+        "mix": ["7300000000000000005", "7300000000000000006"],
+        "live": ["123456", "654321"],
+        "live_share": [],
+        "short": ["https://v.douyin.com/iAbCdEf/"],
+    }
+
+
+def test_classify_tiktok():
+    result = ExtractorTikTok(PARAMS).classify(
+        "https://www.tiktok.com/@user/video/7300000000000000001?lang=en "
+        "https://www.tiktok.com/@user/playlist/My%20List-7300000000000000002 "
+        "https://www.tiktok.com/@user/live"
+    )
+    assert result["detail"] == ["7300000000000000001"]
+    assert result["mix"] == ["7300000000000000002"]
+    assert result["mix_title"] == ["My List"]
+    assert result["live"] == ["https://www.tiktok.com/@user/live"]
+    assert result["user"] == ["https://www.tiktok.com/@user"] * 3
+
+
+def test_classify_web_rid():
+    result = Extractor(PARAMS).classify(
+        "https://www.douyin.com/root/live/123?webRid=777 "
+        "https://webcast.amemv.com/douyin/webcast/reflow/123?webRid=888 "
+        "https://live.douyin.com/999?webRid=999"
+    )
+    assert result["live"] == ["777", "888", "999"]
+    assert result["live_share"] == []
+
+
+def test_live_share():
+    reflow = "https://webcast.amemv.com/douyin/webcast/reflow/7300000000000000001"
+
+    async def handler(request):
+        match request.url.host:
+            case "v.douyin.com" if request.url.path == "/share/":
+                return Response(302, headers={"Location": reflow})
+            case "v.douyin.com":
+                return Response(404)
+            case "webcast.amemv.com" if request.method == "GET":
+                return Response(200, text=r"{\"webRid\":\"654321\"}")
+        return Response(200)
+
+    extractor = Extractor(
+        SimpleNamespace(
+            client=AsyncClient(
+                transport=MockTransport(handler),
+                follow_redirects=True,
+            ),
+            logger=Logger(),
+            max_retry=0,
+            timeout=10,
+        )
+    )
+    assert run(extractor.run("https://v.douyin.com/share/", "live")) == ["654321"]
+    assert run(extractor.live("https://v.douyin.com/share/")) == ["654321"]
+    assert run(extractor.run("https://v.douyin.com/gone/", "live")) == []
@@ -0,0 +1,43 @@
+from pytest import mark
+
+from src.encrypt import ABogus, XBogus
+from src.encrypt.rc4 import keystream, rc4_xor
+
+
+@mark.parametrize(
+    "x, y, z",
+    [
+        ("hello\x00\xff", "y", "2de1c82eebe7b6"),
+        ("Mozilla/5.0", "\u0000\u0001\u000e", "958694fdafe410a7311ed9"),
+    ],
+)
+def test_rc4_encrypt(x, y, z):
+    assert ABogus.rc4_encrypt(x, y).encode("latin-1").hex() == z
+
+
+def test_rc4_encrypt_wide_char():
+    value = ABogus.rc4_encrypt("Ƌ", "y")
+    assert ord(value) >> 8 == 1
+    assert ABogus.rc4_encrypt(value, "y") == "Ƌ"
+
+
+def test_handle_ua():
+    assert (
+        XBogus.handle_ua(["\u0000", "\u0001", chr(8)], b"Mozilla/5.0").hex()
+        == "778fa94caa0d8c915be6d3"
+    )
+
+
+def test_generate_garbled_3():
+    assert (
+        XBogus.generate_garbled_3("ÿ", "".join(map(chr, range(0, 190, 10))))
+        .encode("latin-1")
+        .hex()
+        == "6d2f3b3a586127f66911f7dabced510a481644"
+    )
+
+
+def test_rc4_xor():
+    assert rc4_xor(b"key", rc4_xor(b"key", b"plaintext")) == b"plaintext"
+    assert rc4_xor(b"key", b"") == b""
+    assert keystream(b"key", 4) == keystream(b"key", 8)[:4]
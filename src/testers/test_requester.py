@@ -0,0 +1,112 @@
+from asyncio import run, sleep
+from time import time
+from types import SimpleNamespace
+
+from httpx import AsyncClient, MockTransport, Response
+
+from src.custom import LINK_RESOLVE_CONCURRENCY, SHORT_URL_CACHE_TTL
+from src.link import Extractor
+from src.link.requester import Requester
+from src.manager import Database
+from src.testers.logger import Logger
+
+PARAMS = SimpleNamespace(
+    client=None, client_tiktok=None, logger=Logger(), max_retry=0, timeout=10
+)
+DETAIL = "https://www.douyin.com/video/7300000000000000001"
+SHORT = "https://v.douyin.com/iAbCdEf/"
+
+
+def connect(tmp_path) -> Database:
+    database = Database()
+    database.file = tmp_path.joinpath("test.db")
+    return database
+
+
+def requester(handler, database=None) -> tuple[Requester, list[str]]:
+    requests = []
+
+    async def transport(request):
+        requests.append(str(request.url))
+        return await handler(request)
+
+    client = AsyncClient(transport=MockTransport(transport), follow_redirects=True)
+    return (
+        Requester(PARAMS, client, database, Extractor(PARAMS).has_id),
+        requests,
+    )
+
+
+async def redirect(request):
+    if request.url.host == "v.douyin.com":
+        return Response(302, headers={"Location": DETAIL})
+    return Response(200)
+
+
+def test_resolve_url_cache(tmp_path):
+    async def main():
+        async with connect(tmp_path) as database:
+            link, requests = requester(redirect, database)
+            assert await link.resolve_url(SHORT) == DETAIL
+            assert await link.resolve_url(SHORT) == DETAIL
+            assert requests == [SHORT, DETAIL]
+            await database.update_short_url_data(SHORT, "https://expired.com/")
+            await database.database.execute(
+                "UPDATE short_url_data SET TIME=? WHERE URL=?",
+                (int(time()) - SHORT_URL_CACHE_TTL - 1, SHORT),
+            )
+            assert await link.resolve_url(SHORT) == DETAIL
+            assert len(requests) == 4
+            return await database.read_short_url_data(SHORT)
+
+    assert run(main()) == DETAIL
+
+
+def test_resolve_url_not_cached(tmp_path):
+    async def handler(request):
+        match request.url.path:
+            case "/blocked/":
+                return Response(302, headers={"Location": DETAIL})
+            case "/video/7300000000000000001":
+                return Response(403)
+        if request.url.host == "www.douyin.com":
+            return Response(200)
+        return Response(
+            302, headers={"Location": f"https://www.douyin.com{request.url.path}"}
+        )
+
+    async def main():
+        async with connect(tmp_path) as database:
+            link, __ = requester(handler, database)
+            login = "https://v.douyin.com/login/"
+            blocked = "https://v.douyin.com/blocked/"
+            assert await link.resolve_url(login) == "https://www.douyin.com/login/"
+            assert await link.resolve_url(blocked) == DETAIL
+            return [await database.read_short_url_data(i) for i in (login, blocked)]
+
+    assert run(main()) == [None, None]
+
+
+def test_resolve_url_concurrency():
+    running = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal running, peak
+        if request.url.host != "v.douyin.com":
+            return Response(200)
+        running += 1
+        peak = max(peak, running)
+        await sleep(0.01)
+        running -= 1
+        return Response(302, headers={"Location": DETAIL})
+
+    async def main():
+        link, __ = requester(handler)
+        text = " ".join(
+            f"https://v.douyin.com/{i}/" for i in range(LINK_RESOLVE_CONCURRENCY * 3)
+        )
+        return await link.run(text)
+
+    assert run(main()).split() == [DETAIL] * LINK_RESOLVE_CONCURRENCY * 3
+    assert peak == LINK_RESOLVE_CONCURRENCY
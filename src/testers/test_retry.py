@@ -0,0 +1,86 @@
+from asyncio import run
+from types import SimpleNamespace
+
+from httpx import ConnectError, HTTPStatusError, Request, Response
+
+from src.tools import Retry
+from src.tools.retry import CircuitBreaker, RetryPolicy, last_error
+
+URL = "https://www.douyin.com/aweme/v1/web/aweme/post/"
+
+
+def status_error(code: int) -> HTTPStatusError:
+    request = Request("GET", URL)
+    return HTTPStatusError(
+        "", request=request, response=Response(code, request=request)
+    )
+
+
+class Client:
+    max_retry = 3
+    finished = False
+    log = SimpleNamespace(warning=lambda *args, **kwargs: None)
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def fetch(self, url: str):
+        self.calls += 1
+        if self.errors:
+            last_error.set(self.errors.pop(0))
+            return None
+        return {"url": url}
+
+    @Retry.retry
+    async def request(self, url: str):
+        return await self.fetch(url)
+
+    @Retry.retry_host
+    async def download(self, url: str):
+        return await self.fetch(url)
+
+
+def test_classify():
+    assert RetryPolicy.classify(None) == RetryPolicy.RETRYABLE
+    assert RetryPolicy.classify(ConnectError("")) == RetryPolicy.RETRYABLE
+    assert RetryPolicy.classify(status_error(503)) == RetryPolicy.RETRYABLE
+    assert RetryPolicy.classify(status_error(429)) == RetryPolicy.THROTTLED
+    assert RetryPolicy.classify(status_error(404)) == RetryPolicy.PERMANENT
+
+
+def test_retry(monkeypatch):
+    monkeypatch.setattr(Retry, "policy", RetryPolicy(0, 0, 10, 2, 60))
+    client = Client(ConnectError(""), status_error(429))
+    assert run(client.request(URL)) == {"url": URL}
+    assert client.calls == 3
+    client = Client(status_error(404))
+    assert run(client.request(URL, finished=True)) is None
+    assert client.calls == 1
+    assert client.finished
+    client = Client(status_error(404))
+    run(client.request(URL))
+    client = Client()
+    assert run(client.request(URL)) is None
+    assert client.calls == 0
+
+
+def test_circuit_breaker_capacity():
+    breaker = CircuitBreaker(1, 60, 2)
+    for key in "abc":
+        breaker.failure(key)
+    assert list(breaker.failures) == ["b", "c"]
+    assert list(breaker.opened) == ["b", "c"]
+    assert breaker.allow("a")
+    assert not breaker.allow("c")
+
+
+def test_retry_host(monkeypatch):
+    monkeypatch.setattr(Retry, "policy", RetryPolicy(0, 0, 10, 2, 60))
+    client = Client(*[status_error(404)] * 2)
+    for i in range(2):
+        run(client.download(f"https://cdn.example.com/{i}.mp4"))
+    assert run(client.download("https://cdn.example.com/2.mp4")) is None
+    assert client.calls == 2
+    assert run(client.download("https://cdn.example.org/0.mp4"))
+    assert list(Retry.policy.breaker.failures) == ["cdn.example.com"]
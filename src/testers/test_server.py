@@ -0,0 +1,85 @@
+from asyncio import gather, run, sleep
+from hashlib import md5
+from types import SimpleNamespace
+from weakref import WeakValueDictionary
+
+from fastapi import HTTPException
+from httpx import AsyncClient, MockTransport, Response
+from pytest import raises
+
+from src.application.main_server import APIServer
+
+URL = "https://example.com/video.mp4"
+CONTENT = b"0123456789"
+ETAG = '"v1"'
+
+
+def server(handler) -> APIServer:
+    instance = APIServer.__new__(APIServer)
+    instance.parameter = SimpleNamespace(chunk=4)
+    instance.download_client = AsyncClient(transport=MockTransport(handler))
+    instance.download_locks = WeakValueDictionary()
+    return instance
+
+
+async def handler(request):
+    await sleep(0.01)
+    if request.headers.get("If-Range") == ETAG and (
+        value := request.headers.get("Range")
+    ):
+        start = int(value.removeprefix("bytes=").removesuffix("-"))
+        return Response(206, content=CONTENT[start:], headers={"ETag": ETAG})
+    return Response(200, content=CONTENT, headers={"ETag": ETAG})
+
+
+def partial(tmp_path, validator: str):
+    temp = tmp_path.joinpath(f".{md5(URL.encode()).hexdigest()}.part")
+    temp.write_bytes(b"xxxx")
+    temp.with_name(f"{temp.name}.validator").write_text(validator)
+    return temp
+
+
+def test_stream_download_resume(tmp_path):
+    file = tmp_path.joinpath("video.mp4")
+    partial(tmp_path, ETAG)
+    assert run(server(handler).stream_download(URL, {}, file)) == 206
+    assert file.read_bytes() == b"xxxx456789"
+    assert [i.name for i in tmp_path.iterdir()] == ["video.mp4"]
+
+
+def test_stream_download_changed(tmp_path):
+    file = tmp_path.joinpath("video.mp4")
+    partial(tmp_path, '"v0"')
+    assert run(server(handler).stream_download(URL, {}, file)) == 200
+    assert file.read_bytes() == CONTENT
+
+
+def test_stream_download_concurrent(tmp_path):
+    files = [tmp_path.joinpath(f"{i}.mp4") for i in range(3)]
+
+    running = []
+
+    async def serial(request):
+        assert not running
+        running.append(request)
+        response = await handler(request)
+        running.pop()
+        return response
+
+    async def main():
+        instance = server(serial)
+        return await gather(*(instance.stream_download(URL, {}, i) for i in files))
+
+    assert run(main()) == [200] * 3
+    assert all(i.read_bytes() == CONTENT for i in files)
+
+
+def test_parse_cursor():
+    assert APIServer.parse_cursor("2024-01-01 00:00:00|12") == (
+        "2024-01-01 00:00:00",
+        12,
+    )
+    for cursor in ("12", "2024-01-01 00:00:00|", "2024-01-01|x", "|12"):
+        with raises(HTTPException) as error:
+            APIServer.parse_cursor(cursor)
+        assert error.value.status_code == 400
@@ -0,0 +1,34 @@
+from asyncio import run
+
+from httpx import MockTransport, Response
+
+from src.tools import close_proxy_clients, get_proxy_client, session
+
+PROXY = "http://127.0.0.1:8080"
+
+
+def test_proxy_client(monkeypatch):
+    async def handler(request):
+        return Response(
+            200,
+            headers={"Set-Cookie": "session=1; Domain=example.com; Path=/"},
+            text=request.headers.get("Cookie", ""),
+        )
+
+    monkeypatch.setattr(
+        session,
+        "AsyncHTTPTransport",
+        lambda *args, **kwargs: MockTransport(handler),
+    )
+
+    async def main():
+        client = get_proxy_client(PROXY, 10)
+        assert get_proxy_client(PROXY, 10) is client
+        assert get_proxy_client(PROXY, 30) is not client
+        assert get_proxy_client(PROXY, 30).timeout.read == 30
+        await client.get("https://example.com/")
+        response = await client.get("https://example.com/")
+        await close_proxy_clients()
+        return response.text, len(client.cookies)
+
+    assert run(main()) == ("", 0)
@@ -0,0 +1,38 @@
+from asyncio import gather, run
+
+from pytest import raises
+
+from src.tools import Signer
+
+
+def test_signer_batch():
+    calls = []
+
+    def sign(value: str) -> str:
+        calls.append(value)
+        return value.upper()
+
+    async def main():
+        signer = Signer()
+        try:
+            return await gather(*[signer.sign(sign, str(i)) for i in "abc"])
+        finally:
+            signer.shutdown()
+
+    assert run(main()) == ["A", "B", "C"]
+    assert calls == ["a", "b", "c"]
+
+
+def test_signer_error():
+    def sign(value: str) -> str:
+        raise ValueError(value)
+
+    async def main():
+        signer = Signer()
+        try:
+            await signer.sign(sign, "a")
+        finally:
+            signer.shutdown()
+
+    with raises(ValueError):
+        run(main())
@@ -0,0 +1,65 @@
+from hashlib import algorithms_available
+
+from pytest import mark
+
+from src.encrypt import ABogus
+from src.encrypt.aBogus import sm3_digest, sm3_digest_gmssl, sm3_digest_openssl
+
+PARAMS = (
+    "device_platform=webapp&aid=6383&sec_user_id=MS4wLjABAAAA&max_cursor=0&count=18"
+)
+
+
+@mark.parametrize(
+    "x",
+    [
+        b"",
+        b"abc",
+        b"GETcus",
+        bytes(range(256)),
+        PARAMS.encode() * 20,
+    ],
+)
+def test_sm3_digest(x):
+    assert sm3_digest(x) == sm3_digest_gmssl(x)
+    if "sm3" in algorithms_available:
+        assert sm3_digest_openssl(x) == sm3_digest_gmssl(x)
+
+
+def test_sm3_to_array():
+    assert ABogus.sm3_to_array("GETcus") == [
+        23, 214, 191, 130, 11, 74, 28, 84, 16, 64, 10, 13, 245, 205, 127, 147,
+        243, 187, 213, 65, 145, 53, 36, 111, 110, 97, 105, 42, 225, 225, 182, 133,
+    ]  # fmt: skip
+
+
+@mark.parametrize(
+    "x, y",
+    [
+        (
+            PARAMS,
+            "E7mhBdLkdD2kDDyh56KLfY3q6-bVYM9I0SVkMD2fRap1qL39HMYh9exoIBGvXY8jwG/-"
+            "Ieujy4hbT3ohrQ2y0Hwf9W0L/25ksDSkKl5Q5xSSs1X9eghgJ04qmkt5SMx2RvB-rOXm"
+            "qhZHKRbp09oHmhK4bIOwu3GMmj==",
+        ),
+        (
+            "a=1",
+            "E7mhBdLkdD2kDDyh56KLfY3q6fmVYM9I0SVkMD2fYBp1qL39HMYh9exoIBGvXY8jwG/-"
+            "Ieujy4hbT3ohrQ2y0Hwf9W0L/25ksDSkKl5Q5xSSs1X9eghgJ04qmkt5SMx2RvB-rOXm"
+            "qhZHKRbp09oHmhK4bIOwu3GM1D==",
+        ),
+    ],
+)
+def test_a_bogus(x, y):
+    assert (
+        ABogus().get_value(
+            x,
+            "GET",
+            1700000000000,
+            1700000000005,
+            1234.5,
+            2345.6,
+            3456.7,
+        )
+        == y
+    )
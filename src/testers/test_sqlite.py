@@ -0,0 +1,54 @@
+from asyncio import run
+from contextlib import closing
+from sqlite3 import connect
+
+from src.storage.sqlite import SQLLogger
+
+TITLE = ("ID", "DESC")
+TYPE = ("TEXT PRIMARY KEY", "TEXT")
+
+
+def logger(tmp_path, **kwargs) -> SQLLogger:
+    return SQLLogger(tmp_path, "test.db", TITLE, TYPE, TITLE, **kwargs)
+
+
+def read(tmp_path) -> list[tuple]:
+    with closing(connect(tmp_path.joinpath("test.db"))) as database:
+        return database.execute("SELECT ID, DESC FROM Download ORDER BY ID").fetchall()
+
+
+def test_flush_on_exit(tmp_path):
+    async def main():
+        async with logger(tmp_path, batch_size=5) as storage:
+            for i in range(3):
+                await storage.save([i, f"desc {i}"])
+            assert len(storage.buffer) == 3
+            assert not read(tmp_path)
+
+    run(main())
+    assert read(tmp_path) == [(str(i), f"desc {i}") for i in range(3)]
+
+
+def test_flush_batch(tmp_path):
+    async def main():
+        async with logger(tmp_path, batch_size=2) as storage:
+            for i in range(3):
+                await storage.save([i, f"desc {i}"])
+            assert len(storage.buffer) == 1
+            return read(tmp_path)
+
+    assert run(main()) == [("0", "desc 0"), ("1", "desc 1")]
+    assert len(read(tmp_path)) == 3
+
+
+def test_pragma(tmp_path):
+    async def main(synchronous: str):
+        async with logger(tmp_path, synchronous=synchronous) as storage:
+            await storage.cursor.execute("PRAGMA journal_mode;")
+            journal = await storage.cursor.fetchone()
+            await storage.cursor.execute("PRAGMA synchronous;")
+            return journal[0], (await storage.cursor.fetchone())[0]
+
+    assert run(main("normal")) == ("wal", 1)
+    assert run(main("full")) == ("wal", 2)
+    assert run(main("invalid")) == ("wal", 1)
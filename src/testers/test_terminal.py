@@ -0,0 +1,163 @@
+from asyncio import CancelledError, Event, Semaphore, run, sleep
+from types import SimpleNamespace
+
+from pytest import raises
+
+from src.application.main_terminal import TikTok
+from src.custom import DETAIL_MAX_WORKERS
+from src.interface import API
+from src.testers.logger import Logger
+from src.testers.test_account import PARAMS
+from src.testers.test_download import downloader
+from src.tools import ColorfulConsole, FakeProgress, current_progress
+
+
+def terminal() -> TikTok:
+    instance = TikTok.__new__(TikTok)
+    instance.logger = Logger()
+    instance.console = None
+    instance.downloader = SimpleNamespace(
+        server_mode=False,
+        general_progress_object=FakeProgress,
+    )
+    return instance
+
+
+def test_account_detail_batch_worker_error():
+    processed = []
+    progress = set()
+    counts = []
+
+    async def single(index, data, params_name, tiktok):
+        await sleep(0.01)
+        progress.add(current_progress.get())
+        if index == 1:
+            raise RuntimeError(index)
+        processed.append(index)
+        return index != 4
+
+    instance = terminal()
+    instance._TikTok__account_detail_batch_single = single
+    instance._TikTok__summarize_results = lambda count, name: counts.append(
+        (count.success, count.failed)
+    )
+    accounts = [SimpleNamespace(url=str(i)) for i in range(5)]
+    run(instance._TikTok__account_detail_batch(accounts, "accounts_urls", False))
+    assert sorted(processed) == [2, 3, 4, 5]
+    assert counts == [(3, 2)]
+    assert len(progress) == 1
+    assert isinstance(progress.pop(), FakeProgress)
+    assert current_progress.get() is None
+
+
+def test_handle_detail_order():
+    running = 0
+    peak = 0
+
+    class Processor:
+        def __init__(self, parameter, cookie, proxy, detail_id):
+            self.detail_id = detail_id
+
+        async def run(self):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await sleep(0.001 * (10 - int(self.detail_id)))
+            running -= 1
+            return {"id": self.detail_id}
+
+    async def main():
+        instance = terminal()
+        instance.parameter = None
+        instance.detail_semaphore = Semaphore(DETAIL_MAX_WORKERS)
+        return await instance._TikTok__handle_detail(
+            False,
+            Processor,
+            [str(i) for i in range(10)],
+            None,
+            source=True,
+        )
+
+    assert run(main()) == [{"id": str(i)} for i in range(10)]
+    assert peak == DETAIL_MAX_WORKERS
+
+
+def test_shared_progress():
+    instance, __ = downloader(server_mode=False, console=ColorfulConsole(quiet=True))
+    API.init_progress_object(False)
+    api = API(PARAMS)
+    with instance.general_progress_object() as progress:
+        token = current_progress.set(progress)
+        try:
+            with (
+                api.progress_object() as inner,
+                instance.general_progress_object() as download,
+            ):
+                assert inner is download is progress
+        finally:
+            current_progress.reset(token)
+        assert progress.live.is_started
+    assert api.progress_object() is not progress
+    API.init_progress_object(True)
+
+
+class Producer:
+    def __init__(self, pages: list, error: Exception = None, wait=False):
+        self.pages = pages
+        self.error = error
+        self.wait = wait
+        self.cancelled = False
+        self.queue = None
+
+    def stream(self, queue):
+        self.queue = queue
+        return self
+
+    async def run(self):
+        self.progress = current_progress.get()
+        for page in self.pages:
+            await self.queue.put(page)
+        if self.error:
+            raise self.error
+        if self.wait:
+            try:
+                await Event().wait()
+            except CancelledError:
+                self.cancelled = True
+                raise
+
+
+def test_iter_pages_order():
+    producer = Producer([[1], [2], [3]])
+
+    async def main():
+        with terminal().shared_progress():
+            return [i async for i in TikTok._iter_pages(producer)]
+
+    assert run(main()) == [[1], [2], [3]]
+    assert isinstance(producer.progress, FakeProgress)
+
+
+def test_iter_pages_cancel():
+    producer = Producer([[1], [2]], wait=True)
+
+    async def main():
+        pages = TikTok._iter_pages(producer)
+        first = await anext(pages)
+        await pages.aclose()
+        return first
+
+    assert run(main()) == [1]
+    assert producer.cancelled
+
+
+def test_iter_pages_error():
+    received = []
+
+    async def main():
+        async for page in TikTok._iter_pages(Producer([[1]], RuntimeError())):
+            received.append(page)
+
+    with raises(RuntimeError):
+        run(main())
+    assert received == [[1]]
@@ -15,11 +15,15 @@ from .format import (
     cookie_str_to_str,
     format_size,
 )
+from .limiter import AdaptiveRateLimiter
 from .list_pop import safe_pop
-from .retry import Retry
+from .retry import Retry, last_error
+from .signer import Signer
 from .session import (
     request_params,
     create_client,
+    get_proxy_client,
+    close_proxy_clients,
 )
 from .temporary import random_string
 from .temporary import timestamp
@@ -28,4 +32,4 @@ from .truncate import beautify_string
 from .truncate import trim_string
 from .truncate import truncate_string
 from .rename_compatible import RenameCompatible
-from .progress import FakeProgress
+from .progress import FakeProgress, SharedProgress, current_progress
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, Union
 from httpx import HTTPStatusError, NetworkError, RequestError, TimeoutException
 
 from ..translation import _
+from .retry import last_error
 
 if TYPE_CHECKING:
     from ..record import BaseLogger, LoggerManager
@@ -44,18 +45,23 @@ def capture_error_request(function):
     async def inner(self, *args, **kwargs):
         try:
             return await function(self, *args, **kwargs)
-        except (JSONDecodeError, UnicodeDecodeError):
+        except (JSONDecodeError, UnicodeDecodeError) as e:
+            last_error.set(e)
             self.log.error(_("响应内容不是有效的 JSON 数据，请尝试更新 Cookie！"))
         except HTTPStatusError as e:
+            last_error.set(e)
             self.log.error(_("响应码异常：{error}").format(error=e))
         except NetworkError as e:
+            last_error.set(e)
             self.log.error(_("网络异常：{error}").format(error=e))
         except TimeoutException as e:
+            last_error.set(e)
             self.log.error(_("请求超时：{error}").format(error=e))
         except (
             RequestError,
             SSLError,
         ) as e:
+            last_error.set(e)
             self.log.error(_("网络异常：{error}").format(error=e))
         return None
 
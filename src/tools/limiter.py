@@ -0,0 +1,77 @@
+from asyncio import Lock, sleep
+from hashlib import md5
+from time import monotonic
+
+__all__ = ["AdaptiveRateLimiter"]
+
+
+class TokenBucket:
+    """令牌桶，rate 为每秒补充的令牌数量"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = monotonic()
+        self.lock = Lock()
+
+    def refill(self) -> None:
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+
+class AdaptiveRateLimiter:
+    """自适应请求速率限制器，按域名与 Cookie 分别维护令牌桶
+    响应正常时按 increase 逐步提高速率，触发风控时按 decrease 成倍降低速率
+    maximum 为 0 代表不限制速率上限"""
+
+    def __init__(
+        self,
+        initial: float = 1,
+        minimum: float = 0.2,
+        maximum: float = 0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+    ):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum or float("inf")
+        self.increase = increase
+        self.decrease = decrease
+        self.buckets: dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def key(host: str, cookie: str = "") -> str:
+        """生成令牌桶标识，Cookie 仅保留摘要，避免泄露"""
+        if cookie:
+            return f"{host}|{md5(cookie.encode()).hexdigest()[:8]}"
+        return host
+
+    def bucket(self, key: str) -> TokenBucket:
+        if not (bucket := self.buckets.get(key)):
+            bucket = self.buckets[key] = TokenBucket(self.initial)
+        return bucket
+
+    async def acquire(self, key: str) -> None:
+        bucket = self.bucket(key)
+        async with bucket.lock:
+            bucket.refill()
+            while bucket.tokens < 1:
+                await sleep((1 - bucket.tokens) / bucket.rate)
+                bucket.refill()
+            bucket.tokens -= 1
+
+    def success(self, key: str) -> None:
+        bucket = self.bucket(key)
+        bucket.rate = min(bucket.rate + self.increase, self.maximum)
+
+    def throttle(self, key: str) -> None:
+        bucket = self.bucket(key)
+        bucket.refill()
+        bucket.rate = max(bucket.rate * self.decrease, self.minimum)
+        bucket.tokens = min(bucket.tokens, 0)
+
+    def rates(self) -> dict[str, float]:
+        """返回各令牌桶当前的速率，单位：次/秒"""
+        return {k: round(v.rate, 2) for k, v in self.buckets.items()}
@@ -1,3 +1,18 @@
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
+__all__ = ["FakeProgress", "SharedProgress", "current_progress"]
+
+# 同时运行的多个采集与下载协程共用的进度条，由调用方负责启动与停止显示
+current_progress: ContextVar["Progress | None"] = ContextVar(
+    "current_progress",
+    default=None,
+)
+
+
 class FakeProgress:
     def __init__(
         self,
@@ -38,3 +53,16 @@ class FakeProgress:
         **kwargs,
     ):
         pass
+
+
+class SharedProgress:
+    """共用已启动的进度条，进入与退出时不启动或停止显示，避免同时存在多个实时显示"""
+
+    def __init__(self, progress: "Progress"):
+        self.progress = progress
+
+    def __enter__(self) -> "Progress":
+        return self.progress
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
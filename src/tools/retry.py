@@ -1,24 +1,168 @@
-from ..custom import RETRY, wait
+from asyncio import sleep
+from contextvars import ContextVar
+from json.decoder import JSONDecodeError
+from random import uniform
+from time import monotonic
+from urllib.parse import urlparse
+
+from httpx import HTTPStatusError, RequestError
+
+from ..custom import (
+    CIRCUIT_BREAKER_CAPACITY,
+    CIRCUIT_BREAKER_COOLDOWN,
+    CIRCUIT_BREAKER_THRESHOLD,
+    RETRY,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_DEADLINE,
+    wait,
+)
 from ..translation import _
+from .error import CacheError
+
+__all__ = ["Retry", "RetryPolicy", "CircuitBreaker", "last_error"]
+
+# 被装饰函数最近一次捕获的异常，用于判断是否需要重试
+last_error: ContextVar[BaseException | None] = ContextVar("last_error", default=None)
+
+
+class CircuitBreaker:
+    """熔断器，接口连续失败达到阈值后，在冷却时间内不再发起请求"""
+
+    def __init__(
+        self,
+        threshold: int,
+        cooldown: int | float,
+        capacity: int = CIRCUIT_BREAKER_CAPACITY,
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.capacity = capacity
+        self.failures: dict[str, int] = {}
+        self.opened: dict[str, float] = {}
+
+    def allow(self, key: str) -> bool:
+        if not (opened := self.opened.get(key)):
+            return True
+        if monotonic() - opened < self.cooldown:
+            return False
+        del self.opened[key]  # 冷却结束后允许请求，再次失败则立即熔断
+        self.failures[key] = self.threshold - 1
+        return True
+
+    def success(self, key: str) -> None:
+        self.failures.pop(key, None)
+        self.opened.pop(key, None)
+
+    def failure(self, key: str) -> None:
+        self.failures[key] = self.failures.pop(key, 0) + 1
+        if self.threshold and self.failures[key] >= self.threshold:
+            self.opened[key] = monotonic()
+        while len(self.failures) > self.capacity:
+            key = next(iter(self.failures))
+            del self.failures[key]
+            self.opened.pop(key, None)
+
+
+class RetryPolicy:
+    """重试策略，根据异常类型判断是否重试，重试间隔按指数退避并添加随机抖动"""
+
+    RETRYABLE = "retryable"
+    THROTTLED = "throttled"
+    PERMANENT = "permanent"
 
-__all__ = ["Retry"]
+    def __init__(
+        self,
+        base: int | float = RETRY_BACKOFF_BASE,
+        maximum: int | float = RETRY_BACKOFF_MAX,
+        deadline: int | float = RETRY_DEADLINE,
+        threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+        cooldown: int | float = CIRCUIT_BREAKER_COOLDOWN,
+        capacity: int = CIRCUIT_BREAKER_CAPACITY,
+    ):
+        self.base = base
+        self.maximum = maximum
+        self.deadline = deadline
+        self.breaker = CircuitBreaker(threshold, cooldown, capacity)
+
+    @classmethod
+    def classify(cls, error: BaseException | None) -> str:
+        match error:
+            case None | CacheError() | RequestError():
+                return cls.RETRYABLE
+            case HTTPStatusError(response=response) if response.status_code == 429:
+                return cls.THROTTLED
+            case HTTPStatusError(response=response) if (
+                response.status_code == 408 or response.status_code >= 500
+            ):
+                return cls.RETRYABLE
+            case JSONDecodeError() | UnicodeDecodeError():
+                return cls.THROTTLED  # 触发风控时通常返回空响应
+            case _:
+                return cls.PERMANENT
+
+    def backoff(self, attempt: int, kind: str) -> float:
+        base = self.base * 2 if kind == self.THROTTLED else self.base
+        return uniform(0, min(self.maximum, base * 2**attempt))
+
+    @staticmethod
+    def endpoint(function, args: tuple) -> str:
+        if args and isinstance(url := args[0], str) and url.startswith("http"):
+            url = urlparse(url)
+            return f"{url.netloc}{url.path}"
+        return function.__qualname__
+
+    @staticmethod
+    def host(function, args: tuple) -> str:
+        if args and isinstance(url := args[0], str) and url.startswith("http"):
+            return urlparse(url).netloc
+        return function.__qualname__
 
 
 class Retry:
     """重试器，仅适用于本项目！"""
 
+    policy = RetryPolicy()
+
     @staticmethod
     def retry(function):
-        """发生错误时尝试重新执行，装饰的函数需要返回布尔值"""
+        """发生错误时根据重试策略重新执行，装饰的函数需要返回布尔值"""
+        return Retry.__retry(function, RetryPolicy.endpoint)
+
+    @staticmethod
+    def retry_host(function):
+        """与 retry 相同，但按域名熔断，适用于下载文件等链接各不相同的请求"""
+        return Retry.__retry(function, RetryPolicy.host)
 
+    @staticmethod
+    def __retry(function, key):
         async def inner(self, *args, **kwargs):
             finished = kwargs.pop("finished", False)
-            for i in range(self.max_retry):
-                if result := await function(self, *args, **kwargs):
-                    return result
-                self.log.warning(_("正在进行第 {index} 次重试").format(index=i + 1))
-                await wait()
-            if not (result := await function(self, *args, **kwargs)) and finished:
+            policy = Retry.policy
+            endpoint = key(function, args)
+            result = None
+            if policy.breaker.allow(endpoint):
+                deadline = monotonic() + policy.deadline
+                for i in range(self.max_retry + 1):
+                    last_error.set(None)
+                    if result := await function(self, *args, **kwargs):
+                        policy.breaker.success(endpoint)
+                        return result
+                    kind = policy.classify(last_error.get())
+                    if kind == policy.PERMANENT or i == self.max_retry:
+                        break
+                    if monotonic() + (delay := policy.backoff(i, kind)) > deadline:
+                        break
+                    self.log.warning(_("正在进行第 {index} 次重试").format(index=i + 1))
+                    await sleep(delay)
+                policy.breaker.failure(endpoint)
+            else:
+                self.log.warning(
+                    _("{endpoint} 连续请求失败，暂停请求该接口").format(
+                        endpoint=endpoint
+                    )
+                )
+            if finished:
                 self.finished = True
             return result
 
@@ -1,3 +1,5 @@
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from importlib.util import find_spec
 from typing import TYPE_CHECKING, Union
 
 from httpx import AsyncClient, AsyncHTTPTransport, Client, HTTPTransport
@@ -11,7 +13,15 @@ if TYPE_CHECKING:
     from ..record import BaseLogger, LoggerManager
     from ..testers import Logger
 
-__all__ = ["request_params", "create_client"]
+__all__ = [
+    "request_params",
+    "create_client",
+    "get_proxy_client",
+    "close_proxy_clients",
+]
+
+HTTP2 = bool(find_spec("h2"))  # 安装 h2 后启用 HTTP/2
+_PROXY_CLIENTS: dict[tuple[str, float], AsyncClient] = {}
 
 
 def create_client(
@@ -19,6 +29,7 @@ def create_client(
     timeout=TIMEOUT,
     headers: dict = None,
     proxy: str = None,
+    http2=False,
     *args,
     **kwargs,
 ) -> AsyncClient:
@@ -31,14 +42,37 @@ def create_client(
         follow_redirects=True,
         verify=False,
         mounts={
-            "http://": AsyncHTTPTransport(proxy=proxy),
-            "https://": AsyncHTTPTransport(proxy=proxy),
+            "http://": AsyncHTTPTransport(proxy=proxy, http2=http2),
+            "https://": AsyncHTTPTransport(proxy=proxy, http2=http2),
         },
         *args,
         **kwargs,
     )
 
 
+def get_proxy_client(
+    proxy: str,
+    timeout=TIMEOUT,
+) -> AsyncClient:
+    """按代理地址与超时时间复用 AsyncClient，首次使用时创建
+    客户端由不同账号共用，不保存响应设置的 Cookie，请求 Cookie 由请求头提供"""
+    key = (proxy, timeout)
+    if not (client := _PROXY_CLIENTS.get(key)) or client.is_closed:
+        client = _PROXY_CLIENTS[key] = create_client(
+            timeout=timeout,
+            proxy=proxy,
+            http2=HTTP2,
+            cookies=CookieJar(DefaultCookiePolicy(allowed_domains=[])),
+        )
+    return client
+
+
+async def close_proxy_clients() -> None:
+    for client in _PROXY_CLIENTS.values():
+        await client.aclose()
+    _PROXY_CLIENTS.clear()
+
+
 async def request_params(
     logger: Union[
         "BaseLogger",
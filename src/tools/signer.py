@@ -0,0 +1,75 @@
+from asyncio import AbstractEventLoop, Future, get_running_loop
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+__all__ = ["Signer"]
+
+
+class Signer:
+    """请求签名服务，在执行器中计算签名，同一轮事件循环内提交的签名合并为一批计算"""
+
+    def __init__(self, executor: Executor = None):
+        self.executor = executor
+        self.pending: list[tuple[Callable[..., str], tuple, Future]] = []
+        self.scheduled = False
+
+    async def sign(self, function: Callable[..., str], *args) -> str:
+        loop = get_running_loop()
+        future = loop.create_future()
+        self.pending.append((function, args, future))
+        if not self.scheduled:
+            self.scheduled = True
+            loop.call_soon(self.__submit, loop)
+        return await future
+
+    def get_executor(self) -> Executor:
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(1, thread_name_prefix="Signer")
+        return self.executor
+
+    def shutdown(self) -> None:
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def __submit(self, loop: AbstractEventLoop) -> None:
+        batch, self.pending = self.pending, []
+        self.scheduled = False
+        tasks = [(function, args) for function, args, __ in batch]
+        loop.run_in_executor(
+            self.get_executor(),
+            self.run_batch,
+            tasks,
+        ).add_done_callback(partial(self.__set_results, batch))
+
+    @staticmethod
+    def run_batch(
+        tasks: list[tuple[Callable[..., str], tuple]],
+    ) -> list[tuple[bool, Any]]:
+        results = []
+        for function, args in tasks:
+            try:
+                results.append((True, function(*args)))
+            except Exception as e:
+                results.append((False, e))
+        return results
+
+    @staticmethod
+    def __set_results(batch: list, result: Future) -> None:
+        if result.cancelled():
+            for *__, future in batch:
+                future.cancel()
+            return
+        if error := result.exception():
+            for *__, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (*__, future), (success, value) in zip(batch, result.result()):
+            if future.done():
+                continue
+            if success:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
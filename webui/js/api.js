@@ -267,7 +267,7 @@ class API {
     /**
      * 获取下载历史
      */
-    async getDownloadHistory(limit = 50, offset = 0, platform = null) {
+    async getDownloadHistory(limit = 50, offset = 0, platform = null, cursor = null) {
         const params = new URLSearchParams({
             limit: limit.toString(),
             offset: offset.toString()
@@ -277,6 +277,10 @@ class API {
             params.append('platform', platform);
         }
 
+        if (cursor) {
+            params.append('cursor', cursor);
+        }
+
         return await this.request(`/database/download_history?${params}`);
     }
 